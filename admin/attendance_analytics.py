@@ -0,0 +1,258 @@
+"""
+Attendance Analytics Module
+Columnar snapshot of the attendance table (employee index, day ordinal,
+status code, minutes late, fee) held as NumPy arrays, so the admin reports
+can filter and group by department, day and month without going back to
+MySQL. The snapshot refreshes incrementally: rows past the highest id seen
+are appended and rows created since the previous refresh's day (the ones
+clock outs and late fees still change, across midnight too) are patched in
+place. Writes that rewrite older rows (leave approval, late fee
+recalculation) call invalidate_attendance_analytics() instead.
+
+NumPy is optional; without it get_attendance_analytics() returns None and
+callers keep using their SQL aggregates.
+"""
+import time
+from datetime import date, datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ANALYTICS_MAX_AGE = 30        # seconds before a report re-reads new/changed rows
+ANALYTICS_FULL_RELOAD = 3600  # seconds before a full reload (picks up edits and deletes)
+FETCH_SIZE = 50000            # rows per fetchmany() while loading
+
+STATUS_CODES = {'present': 0, 'late': 1, 'absent': 2}
+OTHER_STATUS = 3
+
+_snapshot = None
+
+
+class AttendanceAnalytics:
+    def __init__(self):
+        self.loaded_at = 0.0
+        self.full_loaded_at = 0.0
+        self.max_id = 0
+        self.watermark = None  # created_at from which rows are re-read on refresh
+
+        # Employees (position = employee index used by the attendance columns)
+        self.emp_index = {}    # employee id -> index
+        self.emp_names = []
+        self.dept_names = []   # department code -> name (None for no department)
+        self.dept_index = {}   # name -> code
+        self.emp_dept = np.zeros(0, np.int16)
+        self.emp_active = np.zeros(0, bool)
+
+        self._reset_rows()
+
+    def _reset_rows(self):
+        self.row_ids = np.zeros(0, np.int64)
+        self.emp = np.zeros(0, np.int32)
+        self.day = np.zeros(0, np.int32)
+        self.status = np.zeros(0, np.int8)
+        self.minutes_late = np.zeros(0, np.int32)
+        self.fee = np.zeros(0, np.float32)
+        self.max_id = 0
+        self.watermark = None
+        self.refreshed_on = None  # day of the last refresh
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    # ---- loading ----------------------------------------------------------
+
+    def refresh(self, db, full=False):
+        """Bring the snapshot up to date (everything when `full`)"""
+        started = datetime.now()
+        self._load_employees(db)
+
+        if full or self.watermark is None:
+            self._reset_rows()
+            query = """SELECT id, employee_id, date, status,
+                              COALESCE(minutes_late, 0), COALESCE(late_fee_amount, 0)
+                       FROM attendance ORDER BY id"""
+            params = ()
+            self.full_loaded_at = time.monotonic()
+        else:
+            query = """SELECT id, employee_id, date, status,
+                              COALESCE(minutes_late, 0), COALESCE(late_fee_amount, 0)
+                       FROM attendance
+                       WHERE id > %s OR created_at >= %s
+                       ORDER BY id"""
+            params = (self.max_id, self.watermark)
+
+        # Plain tuple cursor: no per-row dict while streaming the table
+        cursor = db.connection.cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                self._apply(rows)
+        finally:
+            cursor.close()
+
+        # Rows created since the previous refresh's day can still change (a clock
+        # out after midnight, a late fee), so keep re-reading them until the next day's refresh
+        since = self.refreshed_on or started.date()
+        self.watermark = datetime.combine(since, datetime.min.time())
+        self.refreshed_on = started.date()
+        self.loaded_at = time.monotonic()
+
+    def _load_employees(self, db):
+        rows = db.execute_query(
+            "SELECT id, first_name, last_name, department FROM employees", fetch=True) or []
+        depts = list(self.emp_dept)
+        active = [False] * len(self.emp_names)
+        for row in rows:
+            dept = row['department'] or None
+            code = self.dept_index.get(dept)
+            if code is None:
+                code = self.dept_index[dept] = len(self.dept_names)
+                self.dept_names.append(dept)
+
+            idx = self.emp_index.get(row['id'])
+            name = f"{row['first_name']} {row['last_name']}"
+            if idx is None:
+                idx = self.emp_index[row['id']] = len(self.emp_names)
+                self.emp_names.append(name)
+                depts.append(code)
+                active.append(True)
+            else:
+                self.emp_names[idx] = name
+                depts[idx] = code
+                active[idx] = True
+
+        self.emp_dept = np.array(depts, np.int16)
+        self.emp_active = np.array(active, bool)
+
+    def _apply(self, rows):
+        """Append new rows and patch the ones already in the snapshot"""
+        rows = [r for r in rows if r[1] in self.emp_index]
+        if not rows:
+            return
+        count = len(rows)
+        ids = np.fromiter((r[0] for r in rows), np.int64, count)
+        emp = np.fromiter((self.emp_index[r[1]] for r in rows), np.int32, count)
+        day = np.fromiter((r[2].toordinal() for r in rows), np.int32, count)
+        status = np.fromiter((STATUS_CODES.get(r[3], OTHER_STATUS) for r in rows), np.int8, count)
+        minutes = np.fromiter((r[4] for r in rows), np.int32, count)
+        fee = np.fromiter((r[5] for r in rows), np.float32, count)
+
+        known = ids <= self.max_id
+        if known.any():
+            pos = np.searchsorted(self.row_ids, ids[known])
+            pos = np.minimum(pos, len(self.row_ids) - 1)
+            found = self.row_ids[pos] == ids[known]
+            pos = pos[found]
+            for column, values in ((self.emp, emp), (self.day, day), (self.status, status),
+                                   (self.minutes_late, minutes), (self.fee, fee)):
+                column[pos] = values[known][found]
+
+        new = ~known
+        if new.any():
+            self.row_ids = np.concatenate((self.row_ids, ids[new]))
+            self.emp = np.concatenate((self.emp, emp[new]))
+            self.day = np.concatenate((self.day, day[new]))
+            self.status = np.concatenate((self.status, status[new]))
+            self.minutes_late = np.concatenate((self.minutes_late, minutes[new]))
+            self.fee = np.concatenate((self.fee, fee[new]))
+            self.max_id = int(self.row_ids[-1])
+
+    # ---- queries ----------------------------------------------------------
+
+    def departments(self):
+        """Department names that have at least one current employee"""
+        used = np.unique(self.emp_dept[self.emp_active])
+        return sorted(self.dept_names[code] for code in used if self.dept_names[code])
+
+    def employee_mask(self, departments=None):
+        """Boolean mask over employee indexes (current employees, optionally by department)"""
+        mask = self.emp_active.copy()
+        if departments:
+            codes = [self.dept_index[d] for d in departments if d in self.dept_index]
+            mask &= np.isin(self.emp_dept, codes)
+        return mask
+
+    def row_mask(self, departments=None, start_date=None, end_date=None, statuses=None):
+        """Boolean mask over attendance rows"""
+        mask = self.employee_mask(departments)[self.emp]
+        if start_date:
+            mask &= self.day >= start_date.toordinal()
+        if end_date:
+            mask &= self.day <= end_date.toordinal()
+        if statuses:
+            mask &= np.isin(self.status, [STATUS_CODES[s] for s in statuses])
+        return mask
+
+    def employee_count(self, departments=None):
+        return int(self.employee_mask(departments).sum())
+
+    def department_counts(self, departments=None):
+        """[(department, employees), ...] in department code order"""
+        counts = np.bincount(self.emp_dept[self.employee_mask(departments)],
+                             minlength=len(self.dept_names))
+        return [(self.dept_names[code], int(n)) for code, n in enumerate(counts) if n]
+
+    def present_by_day(self, start_date, end_date, departments=None):
+        """Distinct employees present or late on each day of [start_date, end_date]"""
+        span = end_date.toordinal() - start_date.toordinal() + 1
+        mask = self.row_mask(departments, start_date, end_date, ('present', 'late'))
+        width = max(1, len(self.emp_names))
+        keys = np.unique((self.day[mask].astype(np.int64) - start_date.toordinal()) * width + self.emp[mask])
+        return np.bincount(keys // width, minlength=span)[:span].tolist()
+
+    def present_rows(self, start_date, end_date, departments=None):
+        """Present/late attendance rows in [start_date, end_date]"""
+        return int(self.row_mask(departments, start_date, end_date, ('present', 'late')).sum())
+
+    def attendance_days(self, start_date, end_date):
+        """Distinct dates with any attendance in [start_date, end_date]"""
+        mask = (self.day >= start_date.toordinal()) & (self.day <= end_date.toordinal())
+        return int(np.unique(self.day[mask]).size)
+
+    def top_performers(self, limit=5, departments=None):
+        """[(name, department, rate %), ...] by share of present/late rows"""
+        mask = self.row_mask(departments)
+        width = len(self.emp_names)
+        totals = np.bincount(self.emp[mask], minlength=width)
+        present = np.bincount(self.emp[mask & (self.status <= STATUS_CODES['late'])], minlength=width)
+
+        with_rows = np.flatnonzero(totals)
+        rates = np.round(present[with_rows] * 100.0 / totals[with_rows], 1)
+        order = with_rows[np.argsort(-rates, kind='stable')][:limit]
+        return [(self.emp_names[i], self.dept_names[self.emp_dept[i]],
+                 round(float(present[i] * 100.0 / totals[i]), 1)) for i in order]
+
+
+def get_attendance_analytics(db, force=False):
+    """
+    Return the shared snapshot, refreshing it when stale
+
+    Returns None when NumPy is not installed.
+    """
+    global _snapshot
+    if np is None:
+        return None
+    try:
+        if _snapshot is None:
+            _snapshot = AttendanceAnalytics()
+        now = time.monotonic()
+        if force or now - _snapshot.full_loaded_at > ANALYTICS_FULL_RELOAD:
+            _snapshot.refresh(db, full=True)
+        elif now - _snapshot.loaded_at > ANALYTICS_MAX_AGE:
+            _snapshot.refresh(db)
+        return _snapshot
+    except Exception as e:
+        print(f"Error loading attendance analytics: {e}")
+        _snapshot = None
+        return None
+
+
+def invalidate_attendance_analytics():
+    """Drop the snapshot after attendance rows from earlier days are rewritten"""
+    global _snapshot
+    _snapshot = None
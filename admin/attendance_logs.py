@@ -1,7 +1,7 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
-import csv
+from csv_export import ExportDialog
 
 try:
     from tkcalendar import DateEntry
@@ -342,52 +342,57 @@ class AttendanceLogsView:
             print(f"Error getting departments: {e}")
             return []
 
+    def filter_clause(self):
+        """WHERE clause and params for the current search, department and date filters"""
+        where = " WHERE 1=1"
+        params = []
+
+        # Apply search filter
+        search = self.search_entry.get().strip()
+        if search:
+            where += " AND (e.first_name LIKE %s OR e.last_name LIKE %s)"
+            params.extend([f"%{search}%", f"%{search}%"])
+
+        # Apply department filter
+        selected_depts = [dept for dept, var in self.dept_vars.items() if var.get()]
+        if selected_depts and len(selected_depts) < len(self.dept_vars):  # Only filter if not all selected
+            placeholders = ','.join(['%s'] * len(selected_depts))
+            where += f" AND e.department IN ({placeholders})"
+            params.extend(selected_depts)
+
+        # Apply date range filter
+        try:
+            if HAS_CALENDAR:
+                start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d')
+                end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d')
+            else:
+                start_date = self.start_date_entry.get().strip()
+                end_date = self.end_date_entry.get().strip()
+            
+            if start_date:
+                where += " AND a.date >= %s"
+                params.append(start_date)
+            if end_date:
+                where += " AND a.date <= %s"
+                params.append(end_date)
+        except Exception as e:
+            print(f"Date filter error: {e}")
+
+        return where, params
+
     def get_filtered_logs(self):
         """Get logs with filters applied"""
         try:
-            # Build the base query
-            query = """
+            where, params = self.filter_clause()
+            query = f"""
                 SELECT 
                     e.first_name, e.last_name, e.department,
                     a.date, a.clock_in, a.clock_out, a.status
                 FROM attendance a
                 JOIN employees e ON a.employee_id = e.id
-                WHERE 1=1
+                {where}
+                ORDER BY a.date DESC, a.clock_in DESC
             """
-            params = []
-
-            # Apply search filter
-            search = self.search_entry.get().strip()
-            if search:
-                query += " AND (e.first_name LIKE %s OR e.last_name LIKE %s)"
-                params.extend([f"%{search}%", f"%{search}%"])
-
-            # Apply department filter
-            selected_depts = [dept for dept, var in self.dept_vars.items() if var.get()]
-            if selected_depts and len(selected_depts) < len(self.dept_vars):  # Only filter if not all selected
-                placeholders = ','.join(['%s'] * len(selected_depts))
-                query += f" AND e.department IN ({placeholders})"
-                params.extend(selected_depts)
-
-            # Apply date range filter
-            try:
-                if HAS_CALENDAR:
-                    start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d')
-                    end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d')
-                else:
-                    start_date = self.start_date_entry.get().strip()
-                    end_date = self.end_date_entry.get().strip()
-                
-                if start_date:
-                    query += " AND a.date >= %s"
-                    params.append(start_date)
-                if end_date:
-                    query += " AND a.date <= %s"
-                    params.append(end_date)
-            except Exception as e:
-                print(f"Date filter error: {e}")
-
-            query += " ORDER BY a.date DESC, a.clock_in DESC"
 
             # Get total count for pagination
             count_query = f"SELECT COUNT(*) as total FROM ({query}) as filtered"
@@ -408,6 +413,10 @@ class AttendanceLogsView:
             traceback.print_exc()
             return []
 
+    def refresh(self):
+        """Re-run the current filters (keeps the page and filter settings)"""
+        self.load_data()
+
     def load_data(self):
         """Load data into the table"""
         # Clear current data
@@ -543,84 +552,10 @@ class AttendanceLogsView:
         self.load_data()
 
     def export_logs(self):
-        """Export filtered logs to CSV"""
-        try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                initialfile=f"attendance_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            )
-            
-            if filename:
-                # Get all filtered logs without pagination
-                query = """
-                    SELECT 
-                        e.first_name, e.last_name, e.department,
-                        a.date, a.clock_in, a.clock_out, a.status
-                    FROM attendance a
-                    JOIN employees e ON a.employee_id = e.id
-                    WHERE 1=1
-                """
-                params = []
-
-                # Apply same filters
-                search = self.search_entry.get().strip()
-                if search:
-                    query += " AND (e.first_name LIKE %s OR e.last_name LIKE %s)"
-                    params.extend([f"%{search}%", f"%{search}%"])
-
-                selected_depts = [dept for dept, var in self.dept_vars.items() if var.get()]
-                if selected_depts and len(selected_depts) < len(self.dept_vars):
-                    placeholders = ','.join(['%s'] * len(selected_depts))
-                    query += f" AND e.department IN ({placeholders})"
-                    params.extend(selected_depts)
-
-                try:
-                    if HAS_CALENDAR:
-                        start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d')
-                        end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d')
-                    else:
-                        start_date = self.start_date_entry.get().strip()
-                        end_date = self.end_date_entry.get().strip()
-                    
-                    if start_date:
-                        query += " AND a.date >= %s"
-                        params.append(start_date)
-                    if end_date:
-                        query += " AND a.date <= %s"
-                        params.append(end_date)
-                except:
-                    pass
-
-                query += " ORDER BY a.date DESC, a.clock_in DESC"
-                
-                logs = self.db.execute_query(query, tuple(params), fetch=True) or []
-                
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['Employee Name', 'Department', 'Date', 'Clock In', 'Clock Out', 'Status'])
-                    
-                    for log in logs:
-                        full_name = f"{log['first_name']} {log['last_name']}"
-                        clock_in = self.format_time(log.get('clock_in'))
-                        clock_out = self.format_time(log.get('clock_out'))
-                        
-                        writer.writerow([
-                            full_name,
-                            log.get('department', 'N/A'),
-                            str(log.get('date', '')),
-                            clock_in,
-                            clock_out,
-                            str(log.get('status', 'absent')).upper()
-                        ])
-                
-                messagebox.showinfo("Success", f"Exported {len(logs)} records to:\n{filename}")
-                
-        except Exception as e:
-            print(f"Export error: {e}")
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+        """Export the filtered logs to CSV (streamed on a worker thread)"""
+        where, params = self.filter_clause()
+        ExportDialog(self.parent_frame, 'attendance', "Attendance Logs",
+                     where, params, file_prefix="attendance_logs")
 
     def format_time(self, time_obj):
         """Helper to convert Military Time/Objects to Standard AM/PM"""
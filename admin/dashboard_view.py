@@ -1,17 +1,21 @@
 import tkinter as tk
 from tkinter import ttk
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.ticker as ticker
 from config import COLORS
+from canvas_charts import GroupedBarChart
 
 
 class DashboardView:
     def __init__(self, parent_frame, db):
         self.parent_frame = parent_frame
         self.db = db
+        
+        # One canvas chart for the life of the view; series are cached per
+        # view type so toggling only moves the existing bars
+        self.chart = None
+        self.chart_series = {}   # view type -> (labels, present, absent, leave)
+        self.total_employees = 0
+        
         self.render()
 
     def render(self):
@@ -45,6 +49,8 @@ class DashboardView:
                 'late_employees': 0
             }
 
+        self.total_employees = stats.get('total_employees', 0)
+
         for i in range(4):
             stats_container.columnconfigure(i, weight=1)
 
@@ -116,66 +122,39 @@ class DashboardView:
         self.chart_frame = tk.Frame(parent, bg="white")
         self.chart_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
         
+        self.chart = GroupedBarChart(self.chart_frame, width=800, height=400, resize=True)
+        self.chart.canvas.pack(fill=tk.BOTH, expand=True)
+        
         # Initial chart
         self.update_chart(parent)
 
-    def update_chart(self, parent):
-        """Updates the chart based on selected view"""
-        # Clear previous chart
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-        
-        view_type = self.chart_view.get()
-        
-        # Get data based on view type (only daily or monthly)
+    CHART_TITLES = {
+        'daily': "Daily Attendance (Last 7 Days)",
+        'monthly': "Monthly Attendance (Last 6 Months)"
+    }
+
+    def load_series(self, view_type):
+        """Fetch a view's series (only on first use or refresh)"""
         if view_type == "daily":
-            labels, present, absent, leave = self.get_daily_data()
-            title = "Daily Attendance (Last 7 Days)"
-        else:  # monthly
-            labels, present, absent, leave = self.get_monthly_data()
-            title = "Monthly Attendance (Last 6 Months)"
-        
-        # Get total employees to set dynamic Y-axis max
-        try:
-            stats = self.db.get_dashboard_stats()
-            total_employees = stats.get('total_employees', 100)
-        except:
-            total_employees = 100
-        
-        # Set Y-axis max to be 20% higher than total employees for better visualization
-        y_max = int(total_employees * 1.2) if total_employees > 0 else 100
-        
-        # Create figure
-        fig = Figure(figsize=(8, 4), dpi=100, facecolor="white")
-        ax = fig.add_subplot(111)
-        
-        x = range(len(labels))
-        width = 0.25
-        
-        bars1 = ax.bar([i - width for i in x], present, width, label="Present", color="#2ecc71")
-        bars2 = ax.bar(x, absent, width, label="Absent", color="#e74c3c")
-        bars3 = ax.bar([i + width for i in x], leave, width, label="Leave", color="#f39c12")
-        
-        ax.set_xlabel("Date", fontsize=10, fontweight="bold")
-        ax.set_ylabel("Count", fontsize=10, fontweight="bold")
-        ax.set_title(title, fontsize=12, fontweight="bold", color="#2c3e50")
-        ax.set_xticks(x)
-        ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=9)
-        ax.set_ylim(0, y_max)  # Dynamic Y-axis based on total employees
-        
-        # Set Y-axis to show only whole numbers (no decimals)
-        ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
+            return self.get_daily_data()
+        return self.get_monthly_data()
+
+    def update_chart(self, parent=None, refresh=False):
+        """Show the selected view; data is fetched once per view type unless refresh=True"""
+        view_type = self.chart_view.get()
         
-        ax.legend(loc="upper left", fontsize=9)
-        ax.grid(axis="y", alpha=0.3, linestyle="--")
-        ax.set_facecolor("white")
+        if refresh or view_type not in self.chart_series:
+            self.chart_series[view_type] = self.load_series(view_type)
+        labels, present, absent, leave = self.chart_series[view_type]
         
-        fig.tight_layout()
+        # Y-axis max 20% above total employees for better visualization
+        y_max = int(self.total_employees * 1.2) if self.total_employees > 0 else 100
         
-        # Embed chart in tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart.set_data(labels, [
+            ("Present", present, "#2ecc71"),
+            ("Absent", absent, "#e74c3c"),
+            ("Leave", leave, "#f39c12")
+        ], title=self.CHART_TITLES[view_type], y_max=y_max)
 
     def get_daily_data(self):
         """Fetch daily attendance data for last 7 days - REAL DATA ONLY"""
@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel
 from config import COLORS
+from records import Employee
+from csv_export import ExportDialog
 
 class EmployeesView:
     def __init__(self, parent_frame, db):
@@ -58,6 +60,12 @@ class EmployeesView:
                   font=("Segoe UI", 10, "bold"), 
                   relief=tk.FLAT, padx=15, pady=8, cursor="hand2",
                   command=self.reset_filters).pack(side=tk.RIGHT)
+        
+        tk.Button(button_frame, text="📥 Export", 
+                  bg="#16a085", fg="white",
+                  font=("Segoe UI", 10, "bold"), 
+                  relief=tk.FLAT, padx=15, pady=8, cursor="hand2",
+                  command=self.export_employees).pack(side=tk.RIGHT, padx=(0, 5))
 
         # --- 2. Filters Section ---
         filters_container = tk.Frame(main_container, bg="white", relief=tk.RIDGE, bd=1)
@@ -297,34 +305,39 @@ class EmployeesView:
             print(f"Error getting departments: {e}")
             return []
 
+    def filter_clause(self):
+        """WHERE clause and params for the current search and department filters"""
+        where = " WHERE 1=1"
+        params = []
+
+        # Apply search filter
+        search = self.search_entry.get().strip()
+        if search:
+            where += " AND (first_name LIKE %s OR last_name LIKE %s OR email LIKE %s OR phone LIKE %s)"
+            search_param = f"%{search}%"
+            params.extend([search_param, search_param, search_param, search_param])
+
+        # Apply department filter
+        selected_depts = [dept for dept, var in self.dept_vars.items() if var.get()]
+        if selected_depts and len(selected_depts) < len(self.dept_vars):  # Only filter if not all selected
+            placeholders = ','.join(['%s'] * len(selected_depts))
+            where += f" AND department IN ({placeholders})"
+            params.extend(selected_depts)
+
+        return where, params
+
     def get_filtered_employees(self):
         """Get employees with filters applied"""
         try:
-            # Build the base query
-            query = """
+            where, params = self.filter_clause()
+            query = f"""
                 SELECT 
                     id, first_name, last_name, email, phone,
-                    department, position, hire_date, id as real_id
+                    department, position, hire_date, created_at
                 FROM employees
-                WHERE 1=1
+                {where}
+                ORDER BY id ASC
             """
-            params = []
-
-            # Apply search filter
-            search = self.search_entry.get().strip()
-            if search:
-                query += " AND (first_name LIKE %s OR last_name LIKE %s OR email LIKE %s OR phone LIKE %s)"
-                search_param = f"%{search}%"
-                params.extend([search_param, search_param, search_param, search_param])
-
-            # Apply department filter
-            selected_depts = [dept for dept, var in self.dept_vars.items() if var.get()]
-            if selected_depts and len(selected_depts) < len(self.dept_vars):  # Only filter if not all selected
-                placeholders = ','.join(['%s'] * len(selected_depts))
-                query += f" AND department IN ({placeholders})"
-                params.extend(selected_depts)
-
-            query += " ORDER BY id ASC"
 
             # Get total count for pagination
             count_query = f"SELECT COUNT(*) as total FROM ({query}) as filtered"
@@ -337,14 +350,10 @@ class EmployeesView:
             query += f" LIMIT %s OFFSET %s"
             params.extend([self.records_per_page, offset])
 
-            result = self.db.execute_query(query, tuple(params), fetch=True)
+            result = self.db.execute_query(query, tuple(params), fetch=True, row_type=Employee)
             
-            # Convert result to list of tuples matching the tree column structure
-            if result:
-                return [tuple(row[col] for col in ['id', 'first_name', 'last_name', 'email', 
-                                                     'phone', 'department', 'position', 'hire_date', 'real_id']) 
-                        for row in result]
-            return []
+            # Records are already tuples in column order; append the real id for the tree
+            return [(*emp[:8], emp.id) for emp in result or []]
 
         except Exception as e:
             print(f"Error getting filtered employees: {e}")
@@ -352,6 +361,15 @@ class EmployeesView:
             traceback.print_exc()
             return []
 
+    def export_employees(self):
+        """Export the filtered employee list to CSV (streamed on a worker thread)"""
+        where, params = self.filter_clause()
+        ExportDialog(self.parent_frame, 'employees', "Employees", where, params, file_prefix="employees")
+
+    def refresh(self):
+        """Re-run the current filters (keeps the page and filter settings)"""
+        self.load_data()
+
     def load_data(self):
         """Load all employees from database into the table"""
         # Clear current data
@@ -0,0 +1,113 @@
+"""
+Fee Summary Index Module
+Immutable, columnar snapshot of the admin late fee summary with set indexes
+for department, payment status and name prefixes
+"""
+import time
+
+SNAPSHOT_MAX_AGE = 60  # seconds before a tab switch re-queries the summary
+
+_snapshot = None
+
+
+class FeeSummaryIndex:
+    def __init__(self, rows):
+        """
+        Build the columns and indexes once; filtering never touches the rows again
+
+        Args:
+            rows: records from Database.get_admin_fee_summary (ordered by total_fees DESC)
+        """
+        self.created_at = time.monotonic()
+
+        self.ids = []
+        self.names = []
+        self.depts = []
+        self.late_counts = []
+        self.total_fees = []
+        self.paid = []
+        self.unpaid = []
+
+        self.by_dept = {}
+        self.by_status = {'paid': set(), 'pending': set()}
+        self.by_prefix = {}
+
+        for row in rows or []:
+            if isinstance(row, dict):
+                values = (row.get('id'), row.get('name', 'Unknown'), row.get('department', 'N/A'),
+                          row.get('late_count', 0), row.get('total_fees', 0),
+                          row.get('paid', 0), row.get('unpaid', 0))
+            else:
+                # Tuple format: (id, name, dept, late_count, total_fees, paid, unpaid)
+                values = row[:7]
+            self._append(*values)
+
+        self.all_rows = frozenset(range(len(self.ids)))
+
+    def _append(self, emp_id, name, dept, late_count, total_fees, paid, unpaid):
+        idx = len(self.ids)
+        unpaid = float(unpaid or 0)
+
+        self.ids.append(emp_id)
+        self.names.append(name or 'Unknown')
+        self.depts.append(dept)
+        self.late_counts.append(late_count or 0)
+        self.total_fees.append(float(total_fees or 0))
+        self.paid.append(float(paid or 0))
+        self.unpaid.append(unpaid)
+
+        self.by_dept.setdefault(dept, set()).add(idx)
+        self.by_status['pending' if unpaid > 0 else 'paid'].add(idx)
+
+        # Every prefix of the full name and of each word in it
+        lowered = (name or '').lower()
+        for token in {lowered, *lowered.split()}:
+            for end in range(1, len(token) + 1):
+                self.by_prefix.setdefault(token[:end], set()).add(idx)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def filter(self, departments, statuses, search_term=""):
+        """
+        Return matching row positions in summary order
+
+        Args:
+            departments: iterable of department names to include
+            statuses: iterable of 'paid' / 'pending'
+            search_term: name prefix (case-insensitive)
+        """
+        dept_rows = set().union(*(self.by_dept.get(d, ()) for d in departments))
+        status_rows = set().union(*(self.by_status[s] for s in statuses))
+        matches = dept_rows & status_rows
+
+        search_term = search_term.lower().strip()
+        if search_term:
+            matches &= self.by_prefix.get(search_term, set())
+
+        return sorted(matches)
+
+    def row_values(self, idx):
+        """Treeview values for one row"""
+        return (
+            self.names[idx],
+            self.depts[idx],
+            self.late_counts[idx],
+            f"₱{self.total_fees[idx]:.2f}",
+            f"₱{self.paid[idx]:.2f}",
+            f"₱{self.unpaid[idx]:.2f}"
+        )
+
+
+def get_fee_summary_index(db, force=False):
+    """Return the shared snapshot, rebuilding it when stale or when forced"""
+    global _snapshot
+    if force or _snapshot is None or time.monotonic() - _snapshot.created_at > SNAPSHOT_MAX_AGE:
+        _snapshot = FeeSummaryIndex(db.get_admin_fee_summary())
+    return _snapshot
+
+
+def invalidate_fee_summary_index():
+    """Drop the snapshot after fees are charged, paid or recalculated"""
+    global _snapshot
+    _snapshot = None
@@ -5,6 +5,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from database import Database
+from holiday_calendar import get_holiday_calendar, invalidate_holiday_calendar
 
 try:
     from tkcalendar import DateEntry
@@ -13,6 +14,8 @@ except ImportError:
     HAS_CALENDAR = False
     print("Warning: tkcalendar not installed. Using basic date entry.")
 
+PAST_PAGE_SIZE = 30  # past holiday cards rendered per "Show older" click
+
 
 class HolidaysView:
     """Holidays management interface"""
@@ -67,7 +70,7 @@ class HolidaysView:
             padx=20,
             pady=8,
             relief=tk.FLAT,
-            command=self.load_holidays
+            command=self.refresh
         )
         refresh_btn.pack(side='left', padx=5)
         
@@ -88,44 +91,47 @@ class HolidaysView:
         self.past_frame = tk.Frame(self.notebook, bg='white')
         self.notebook.add(self.past_frame, text='📜 Past Holidays')
         
+        # Card lists are built once and then patched per holiday id
+        self.upcoming_list = self.create_holidays_list(self.upcoming_frame, is_upcoming=True)
+        self.past_list = self.create_holidays_list(self.past_frame, is_upcoming=False)
+        self.past_limit = PAST_PAGE_SIZE
+        
         # Load holidays
         self.load_holidays()
         
+    def refresh(self):
+        """Re-read holidays from the database (e.g. after another admin changed them)"""
+        invalidate_holiday_calendar()
+        self.load_holidays()
+    
     def load_holidays(self):
-        """Load and display holidays"""
-        # Clear existing content
-        for widget in self.upcoming_frame.winfo_children():
-            widget.destroy()
-        for widget in self.past_frame.winfo_children():
-            widget.destroy()
-        
+        """Load holidays and bring both lists up to date"""
         try:
-            query = """
-                SELECT id, name, holiday_date, created_at 
-                FROM holidays 
-                ORDER BY holiday_date ASC
-            """
-            holidays = self.db.execute_query(query, fetch=True)
-            
-            if not holidays:
-                holidays = []
+            holiday_calendar = get_holiday_calendar(self.db)
             
             today = datetime.now().date()
-            upcoming = [h for h in holidays if h['holiday_date'] >= today]
-            past = [h for h in holidays if h['holiday_date'] < today]
+            # Recurring holidays are always upcoming, on their next occurrence
+            upcoming = [dict(h._asdict(), next_date=holiday_calendar.next_occurrence(h, today))
+                        for h in holiday_calendar.rows
+                        if h.get('is_recurring') or h['holiday_date'] >= today]
+            upcoming.sort(key=lambda h: h['next_date'])
+            past = [h for h in holiday_calendar.rows
+                    if not h.get('is_recurring') and h['holiday_date'] < today]
             past.reverse()  # Most recent first
             
-            # Display upcoming holidays
-            self.display_holidays_list(self.upcoming_frame, upcoming, is_upcoming=True)
-            
-            # Display past holidays
-            self.display_holidays_list(self.past_frame, past, is_upcoming=False)
+            self.sync_holidays_list(self.upcoming_list, upcoming, today)
+            self.sync_holidays_list(self.past_list, past, today, limit=self.past_limit)
             
         except Exception as e:
             messagebox.showerror("Error", f"Error loading holidays: {str(e)}")
     
-    def display_holidays_list(self, parent_frame, holidays, is_upcoming=True):
-        """Display holidays in a scrollable list"""
+    def show_more_past(self):
+        """Render the next page of past holidays"""
+        self.past_limit += PAST_PAGE_SIZE
+        self.load_holidays()
+    
+    def create_holidays_list(self, parent_frame, is_upcoming=True):
+        """Create an empty scrollable list; cards are added by sync_holidays_list"""
         # Create canvas and scrollbar
         canvas = tk.Canvas(parent_frame, bg='white', highlightthickness=0)
         scrollbar = ttk.Scrollbar(parent_frame, orient='vertical', command=canvas.yview)
@@ -142,31 +148,102 @@ class HolidaysView:
         canvas.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
-        # Mouse wheel scrolling
+        # Mouse wheel scrolls whichever list the pointer is over
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", _on_mousewheel))
+        
+        empty_label = tk.Label(
+            scrollable_frame,
+            text=f"No {'upcoming' if is_upcoming else 'past'} holidays found.",
+            font=('Segoe UI', 12),
+            bg='white',
+            fg='#7f8c8d'
+        )
         
-        if not holidays:
-            no_data_label = tk.Label(
+        more_btn = None
+        if not is_upcoming:
+            more_btn = tk.Button(
                 scrollable_frame,
-                text=f"No {'upcoming' if is_upcoming else 'past'} holidays found.",
-                font=('Segoe UI', 12),
-                bg='white',
-                fg='#7f8c8d'
+                text="Show older holidays",
+                font=('Segoe UI', 10),
+                bg='#ecf0f1',
+                fg='#2c3e50',
+                cursor='hand2',
+                padx=15,
+                pady=5,
+                relief=tk.FLAT,
+                command=self.show_more_past
             )
-            no_data_label.pack(pady=50)
-            return
         
-        # Display each holiday
-        today = datetime.now().date()
-        for holiday in holidays:
-            self.create_holiday_card(scrollable_frame, holiday, today, is_upcoming)
+        return {
+            'frame': scrollable_frame,
+            'is_upcoming': is_upcoming,
+            'cards': {},      # holiday id -> card widgets
+            'order': [],      # holiday ids in display order
+            'empty_label': empty_label,
+            'more_btn': more_btn
+        }
+    
+    def sync_holidays_list(self, holiday_list, holidays, today, limit=None):
+        """Insert, update or remove only the cards that changed"""
+        shown = holidays[:limit] if limit else holidays
+        cards = holiday_list['cards']
+        wanted = {h['id'] for h in shown}
+        
+        for holiday_id in [i for i in cards if i not in wanted]:
+            cards.pop(holiday_id)['card'].destroy()
+        
+        for holiday in shown:
+            if holiday['id'] in cards:
+                self.update_holiday_card(cards[holiday['id']], holiday, today)
+            else:
+                cards[holiday['id']] = self.create_holiday_card(
+                    holiday_list['frame'], holiday, today, holiday_list['is_upcoming'])
+        
+        # Repack only when the order changed
+        order = [h['id'] for h in shown]
+        if order != holiday_list['order']:
+            for holiday_id in order:
+                cards[holiday_id]['card'].pack_forget()
+            for holiday_id in order:
+                cards[holiday_id]['card'].pack(fill='x', padx=15, pady=8)
+            holiday_list['order'] = order
+        
+        if shown:
+            holiday_list['empty_label'].pack_forget()
+        else:
+            holiday_list['empty_label'].pack(pady=50)
+        
+        more_btn = holiday_list['more_btn']
+        if more_btn:
+            more_btn.pack_forget()
+            if limit and len(holidays) > limit:
+                more_btn.config(text=f"Show older holidays ({len(holidays) - limit} more)")
+                more_btn.pack(pady=10)
+    
+    def holiday_card_text(self, holiday, today, is_upcoming):
+        """(name, date text, (days text, days color) or None) shown on a card"""
+        holiday_date = holiday.get('next_date', holiday['holiday_date'])
+        date_str = holiday_date.strftime('%B %d, %Y')
+        if holiday.get('is_recurring'):
+            date_str += "  🔁 Every year"
+        
+        days = None
+        if is_upcoming:
+            days_left = (holiday_date - today).days
+            if days_left == 0:
+                days = ("🎉 Today!", '#e74c3c')
+            elif days_left == 1:
+                days = ("⏰ Tomorrow", '#f39c12')
+            else:
+                days = (f"⏳ In {days_left} days", '#3498db')
+        
+        return holiday['name'], f"📅 {date_str}", days
     
     def create_holiday_card(self, parent, holiday, today, is_upcoming):
-        """Create a card for each holiday"""
+        """Create a card for a holiday; returns its widgets for later updates"""
         card = tk.Frame(parent, bg='white', relief='solid', borderwidth=1, highlightbackground='#e0e0e0', highlightthickness=1)
-        card.pack(fill='x', padx=15, pady=8)
         
         # Content frame with padding
         content_frame = tk.Frame(card, bg='white')
@@ -176,10 +253,12 @@ class HolidaysView:
         info_frame = tk.Frame(content_frame, bg='white')
         info_frame.pack(side='left', fill='x', expand=True)
         
+        name, date_text, days = self.holiday_card_text(holiday, today, is_upcoming)
+        
         # Holiday name
         name_label = tk.Label(
             info_frame,
-            text=holiday['name'],
+            text=name,
             font=('Segoe UI', 14, 'bold'),
             bg='white',
             fg='#2c3e50',
@@ -188,10 +267,9 @@ class HolidaysView:
         name_label.pack(anchor='w')
         
         # Holiday date
-        date_str = holiday['holiday_date'].strftime('%B %d, %Y')
         date_label = tk.Label(
             info_frame,
-            text=f"📅 {date_str}",
+            text=date_text,
             font=('Segoe UI', 11),
             bg='white',
             fg='#34495e',
@@ -200,28 +278,28 @@ class HolidaysView:
         date_label.pack(anchor='w', pady=(5, 0))
         
         # Days info (for upcoming holidays)
-        if is_upcoming:
-            days_left = (holiday['holiday_date'] - today).days
-            if days_left == 0:
-                days_text = "🎉 Today!"
-                days_color = '#e74c3c'
-            elif days_left == 1:
-                days_text = "⏰ Tomorrow"
-                days_color = '#f39c12'
-            else:
-                days_text = f"⏳ In {days_left} days"
-                days_color = '#3498db'
-            
+        days_label = None
+        if days:
             days_label = tk.Label(
                 info_frame,
-                text=days_text,
+                text=days[0],
                 font=('Segoe UI', 10, 'italic'),
                 bg='white',
-                fg=days_color,
+                fg=days[1],
                 anchor='w'
             )
             days_label.pack(anchor='w', pady=(3, 0))
         
+        # The buttons read the current row, so an edited card needs no rebuild
+        entry = {
+            'card': card,
+            'holiday': holiday,
+            'text': (name, date_text, days),
+            'name_label': name_label,
+            'date_label': date_label,
+            'days_label': days_label
+        }
+        
         # Right side - Action buttons
         action_frame = tk.Frame(content_frame, bg='white')
         action_frame.pack(side='right')
@@ -236,7 +314,7 @@ class HolidaysView:
             padx=15,
             pady=5,
             relief=tk.FLAT,
-            command=lambda: self.edit_holiday(holiday)
+            command=lambda: self.edit_holiday(entry['holiday'])
         )
         edit_btn.pack(side='left', padx=3)
         
@@ -250,23 +328,38 @@ class HolidaysView:
             padx=15,
             pady=5,
             relief=tk.FLAT,
-            command=lambda: self.delete_holiday(holiday)
+            command=lambda: self.delete_holiday(entry['holiday'])
         )
         delete_btn.pack(side='left', padx=3)
+        
+        return entry
+    
+    def update_holiday_card(self, entry, holiday, today):
+        """Refresh a card's labels in place if its holiday changed"""
+        entry['holiday'] = holiday
+        name, date_text, days = self.holiday_card_text(holiday, today, entry['days_label'] is not None)
+        if (name, date_text, days) == entry['text']:
+            return
+        
+        entry['name_label'].config(text=name)
+        entry['date_label'].config(text=date_text)
+        if days and entry['days_label']:
+            entry['days_label'].config(text=days[0], fg=days[1])
+        entry['text'] = (name, date_text, days)
     
     def add_holiday(self):
         """Open dialog to add new holiday"""
         dialog = tk.Toplevel(self.parent_frame)
         dialog.title("Add New Holiday")
-        dialog.geometry("500x300")
+        dialog.geometry("500x340")
         dialog.configure(bg='#ecf0f1')
         dialog.grab_set()
         
         # Center the dialog
         dialog.update_idletasks()
         x = (dialog.winfo_screenwidth() // 2) - (250)
-        y = (dialog.winfo_screenheight() // 2) - (150)
-        dialog.geometry(f"500x300+{x}+{y}")
+        y = (dialog.winfo_screenheight() // 2) - (170)
+        dialog.geometry(f"500x340+{x}+{y}")
         
         # Title
         title_frame = tk.Frame(dialog, bg='#3498db', height=60)
@@ -331,6 +424,17 @@ class HolidaysView:
         
         date_entry.grid(row=1, column=1, pady=10, padx=10, sticky='ew')
         
+        recurring_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            form_frame,
+            text="Repeats every year",
+            variable=recurring_var,
+            font=('Segoe UI', 10),
+            bg='#ecf0f1',
+            fg='#2c3e50',
+            activebackground='#ecf0f1'
+        ).grid(row=3, column=1, sticky='w', padx=10)
+        
         form_frame.columnconfigure(1, weight=1)
         
         # Buttons
@@ -365,10 +469,11 @@ class HolidaysView:
                     return
                 
                 insert_query = """
-                    INSERT INTO holidays (name, holiday_date)
-                    VALUES (%s, %s)
+                    INSERT INTO holidays (name, holiday_date, is_recurring)
+                    VALUES (%s, %s, %s)
                 """
-                self.db.execute_query(insert_query, (name, date_value))
+                self.db.execute_query(insert_query, (name, date_value, int(recurring_var.get())))
+                invalidate_holiday_calendar()
                 
                 messagebox.showinfo("Success", f"Holiday '{name}' added successfully!", parent=dialog)
                 dialog.destroy()
@@ -409,15 +514,15 @@ class HolidaysView:
         """Open dialog to edit holiday"""
         dialog = tk.Toplevel(self.parent_frame)
         dialog.title("Edit Holiday")
-        dialog.geometry("500x300")
+        dialog.geometry("500x340")
         dialog.configure(bg='#ecf0f1')
         dialog.grab_set()
         
         # Center the dialog
         dialog.update_idletasks()
         x = (dialog.winfo_screenwidth() // 2) - (250)
-        y = (dialog.winfo_screenheight() // 2) - (150)
-        dialog.geometry(f"500x300+{x}+{y}")
+        y = (dialog.winfo_screenheight() // 2) - (170)
+        dialog.geometry(f"500x340+{x}+{y}")
         
         # Title
         title_frame = tk.Frame(dialog, bg='#f39c12', height=60)
@@ -484,6 +589,17 @@ class HolidaysView:
         
         date_entry.grid(row=1, column=1, pady=10, padx=10, sticky='ew')
         
+        recurring_var = tk.BooleanVar(value=bool(holiday.get('is_recurring')))
+        tk.Checkbutton(
+            form_frame,
+            text="Repeats every year",
+            variable=recurring_var,
+            font=('Segoe UI', 10),
+            bg='#ecf0f1',
+            fg='#2c3e50',
+            activebackground='#ecf0f1'
+        ).grid(row=3, column=1, sticky='w', padx=10)
+        
         form_frame.columnconfigure(1, weight=1)
         
         # Buttons
@@ -510,10 +626,11 @@ class HolidaysView:
             try:
                 update_query = """
                     UPDATE holidays 
-                    SET name = %s, holiday_date = %s
+                    SET name = %s, holiday_date = %s, is_recurring = %s
                     WHERE id = %s
                 """
-                self.db.execute_query(update_query, (name, date_value, holiday['id']))
+                self.db.execute_query(update_query, (name, date_value, int(recurring_var.get()), holiday['id']))
+                invalidate_holiday_calendar()
                 
                 messagebox.showinfo("Success", f"Holiday '{name}' updated successfully!", parent=dialog)
                 dialog.destroy()
@@ -563,6 +680,7 @@ class HolidaysView:
         try:
             delete_query = "DELETE FROM holidays WHERE id = %s"
             self.db.execute_query(delete_query, (holiday['id'],))
+            invalidate_holiday_calendar()
             
             messagebox.showinfo("Success", f"Holiday '{holiday['name']}' deleted successfully!")
             self.load_holidays()
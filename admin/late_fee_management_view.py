@@ -1,12 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from config import COLORS
+from admin.fee_summary_index import get_fee_summary_index
+from csv_export import ExportDialog
 
 class LateFeeManagementView:
     def __init__(self, parent_frame, db):
         self.parent_frame = parent_frame
         self.db = db
-        self.all_data = []  # Store all data for filtering
+        self.index = None  # Columnar snapshot of the fee summary
+        self.shown = {}  # tree iid -> (position, values) currently displayed
         self.department_filters = {}  # Track department filter states
         self.render()
 
@@ -26,7 +29,12 @@ class LateFeeManagementView:
         tk.Button(header, text="↻ Refresh", 
                  bg="#3498db", fg="white", font=("Segoe UI", 10, "bold"),
                  relief=tk.FLAT, padx=15, pady=5, cursor="hand2",
-                 command=self.load_data).pack(side=tk.RIGHT)
+                 command=lambda: self.load_data(force=True)).pack(side=tk.RIGHT)
+        
+        tk.Button(header, text="📥 Export", 
+                 bg="#27ae60", fg="white", font=("Segoe UI", 10, "bold"),
+                 relief=tk.FLAT, padx=15, pady=5, cursor="hand2",
+                 command=self.export_fees).pack(side=tk.RIGHT, padx=(0, 5))
 
         # --- Filter Section ---
         filter_frame = tk.Frame(self.parent_frame, bg="white", padx=20, pady=15)
@@ -140,48 +148,14 @@ class LateFeeManagementView:
         
         self.load_data()
 
-    def load_data(self):
-        """Load late fee summary data from database"""
+    def refresh(self):
+        self.load_data(force=True)
+
+    def load_data(self, force=False):
+        """Load the late fee summary snapshot (re-queried only when stale or forced)"""
         try:
-            print("DEBUG - Fetching admin fee summary...")
-            data = self.db.get_admin_fee_summary()
-            print(f"DEBUG - Got {len(data) if data else 0} records")
-            
-            if data:
-                self.all_data = []
-                for row in data:
-                    print(f"DEBUG - Processing row: {row}, type: {type(row)}")
-                    
-                    # Handle both dictionary and tuple formats
-                    if isinstance(row, dict):
-                        record = {
-                            'name': row.get('name', 'Unknown'),
-                            'dept': row.get('department', 'N/A'),
-                            'late_count': row.get('late_count', 0),
-                            'total_fees': float(row.get('total_fees', 0) or 0),
-                            'paid': float(row.get('paid', 0) or 0),
-                            'unpaid': float(row.get('unpaid', 0) or 0)
-                        }
-                    else:
-                        # Tuple format: (id, name, dept, late_count, total_fees, paid, unpaid)
-                        record = {
-                            'name': row[1],
-                            'dept': row[2],
-                            'late_count': row[3],
-                            'total_fees': float(row[4] or 0),
-                            'paid': float(row[5] or 0),
-                            'unpaid': float(row[6] or 0)
-                        }
-                    
-                    self.all_data.append(record)
-                
-                print("DEBUG - Data loaded successfully!")
-                self.apply_filters()
-            else:
-                print("DEBUG - No late fee data found")
-                self.all_data = []
-                self.display_data([])
-                
+            self.index = get_fee_summary_index(self.db, force=force)
+            self.apply_filters()
         except Exception as e:
             error_msg = f"Failed to load late fee data:\n{e}"
             messagebox.showerror("Error", error_msg)
@@ -190,55 +164,69 @@ class LateFeeManagementView:
             traceback.print_exc()
 
     def apply_filters(self):
-        """Apply search and department filters to the data"""
-        search_term = self.search_var.get().lower().strip()
+        """Apply search, department and payment status filters as set intersections"""
+        if self.index is None:
+            return
         
-        # Get selected departments
         selected_depts = [dept for dept, var in self.department_filters.items() 
                          if var.get()]
-        
-        # Get payment status filters
-        show_paid = self.status_paid.get()
-        show_pending = self.status_pending.get()
-        
-        # Filter data
-        filtered_data = []
-        for record in self.all_data:
-            # Check department filter
-            if record['dept'] not in selected_depts:
-                continue
-            
-            # Check search filter
-            if search_term and search_term not in record['name'].lower():
-                continue
-            
-            # Check payment status filter
-            is_paid = record['unpaid'] == 0
-            is_pending = record['unpaid'] > 0
-            
-            if is_paid and not show_paid:
-                continue
-            if is_pending and not show_pending:
-                continue
-            
-            filtered_data.append(record)
-        
-        self.display_data(filtered_data)
+        statuses = []
+        if self.status_paid.get():
+            statuses.append('paid')
+        if self.status_pending.get():
+            statuses.append('pending')
+        
+        rows = self.index.filter(selected_depts, statuses, self.search_var.get())
+        self.display_data([(str(self.index.ids[idx]), self.index.row_values(idx)) for idx in rows])
+
+    def export_fees(self):
+        """Export the ledger rows matching the current filters to CSV"""
+        where = " WHERE l.late_count > 0"
+        params = []
+        
+        selected_depts = [dept for dept, var in self.department_filters.items() if var.get()]
+        if not selected_depts:
+            messagebox.showinfo("Export", "No departments selected.")
+            return
+        placeholders = ','.join(['%s'] * len(selected_depts))
+        where += f" AND e.department IN ({placeholders})"
+        params.extend(selected_depts)
+        
+        if self.status_paid.get() != self.status_pending.get():
+            where += " AND l.unpaid_amount > 0" if self.status_pending.get() else " AND l.unpaid_amount <= 0"
+        elif not self.status_paid.get():
+            messagebox.showinfo("Export", "No payment status selected.")
+            return
+        
+        # Same prefix match as the on-screen search: full name or any word in it
+        search = self.search_var.get().strip()
+        if search:
+            where += " AND (CONCAT(e.first_name, ' ', e.last_name) LIKE %s OR CONCAT(' ', e.first_name, ' ', e.last_name) LIKE %s)"
+            params.extend([f"{search}%", f"% {search}%"])
+        
+        ExportDialog(self.parent_frame, 'late_fees', "Late Fees", where, params, file_prefix="late_fees")
 
     def display_data(self, data):
-        """Display filtered data in the tree"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Insert filtered data
-        for idx, record in enumerate(data):
-            tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-            self.tree.insert("", tk.END, values=(
-                record['name'],
-                record['dept'],
-                record['late_count'],
-                f"₱{record['total_fees']:.2f}",
-                f"₱{record['paid']:.2f}",
-                f"₱{record['unpaid']:.2f}"
-            ), tags=(tag,))
\ No newline at end of file
+        """Sync the tree with (iid, values) rows, touching only rows that changed"""
+        wanted = {iid for iid, _ in data}
+        
+        # Remove rows that dropped out
+        for iid in [iid for iid in self.shown if iid not in wanted]:
+            self.tree.delete(iid)
+            del self.shown[iid]
+        
+        # Insert new rows in place; update values, position and stripe only when they differ
+        for position, (iid, values) in enumerate(data):
+            tag = 'evenrow' if position % 2 == 0 else 'oddrow'
+            previous = self.shown.get(iid)
+            if previous is None:
+                self.tree.insert("", position, iid=iid, values=values, tags=(tag,))
+            else:
+                old_position, old_values = previous
+                if old_values != values:
+                    self.tree.item(iid, values=values)
+                if old_position != position:
+                    self.tree.move(iid, "", position)
+                    if old_position % 2 != position % 2:
+                        self.tree.item(iid, tags=(tag,))
+            self.shown[iid] = (position, values)
@@ -1,13 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, date
-from config import COLORS
+from config import COLORS, LEAVE_PAGE_SIZE
+from database import format_leave_period
+from csv_export import ExportDialog
 
 class LeaveManagementView:
     def __init__(self, parent_frame, db):
         self.parent = parent_frame
         self.db = db
         self.current_filter = "Pending"
+        self.page = 0
+        self.total_rows = 0
         
         self.setup_ui()
         self.load_leave_requests()
@@ -32,7 +36,7 @@ class LeaveManagementView:
         stats_frame.pack(fill=tk.X, pady=(0, 20))
         
         # Get statistics
-        pending_count = len(self.db.get_pending_leave_requests())
+        pending_count = self.db.get_leave_status_counts()['Pending']
         today = date.today().strftime("%Y-%m-%d")
         on_leave_today = len(self.db.get_leaves_for_date(today))
         
@@ -45,9 +49,10 @@ class LeaveManagementView:
         tk.Label(pending_card, text="Pending Requests",
                 font=("Arial", 11), bg="#fff3cd",
                 fg="#856404").pack()
-        tk.Label(pending_card, text=str(pending_count),
+        self.pending_count_label = tk.Label(pending_card, text=str(pending_count),
                 font=("Arial", 24, "bold"), bg="#fff3cd",
-                fg="#856404").pack(pady=(5, 15))
+                fg="#856404")
+        self.pending_count_label.pack(pady=(5, 15))
         
         # On Leave Today Card
         leave_card = tk.Frame(stats_frame, bg="#d1ecf1", relief=tk.RAISED, bd=2)
@@ -58,9 +63,10 @@ class LeaveManagementView:
         tk.Label(leave_card, text="On Leave Today",
                 font=("Arial", 11), bg="#d1ecf1",
                 fg="#0c5460").pack()
-        tk.Label(leave_card, text=str(on_leave_today),
+        self.on_leave_label = tk.Label(leave_card, text=str(on_leave_today),
                 font=("Arial", 24, "bold"), bg="#d1ecf1",
-                fg="#0c5460").pack(pady=(5, 15))
+                fg="#0c5460")
+        self.on_leave_label.pack(pady=(5, 15))
     
     def create_leave_table(self):
         """Create the leave requests table with filters"""
@@ -93,7 +99,13 @@ class LeaveManagementView:
                                    width=15,
                                    font=("Arial", 10))
         filter_combo.pack(side=tk.LEFT)
-        filter_combo.bind("<<ComboboxSelected>>", lambda e: self.load_leave_requests())
+        filter_combo.bind("<<ComboboxSelected>>", lambda e: self.change_filter())
+        
+        tk.Button(filter_frame, text="📥 Export",
+                 bg="#27ae60", fg="white",
+                 font=("Arial", 10, "bold"),
+                 relief=tk.FLAT, padx=12, pady=3, cursor="hand2",
+                 command=self.export_requests).pack(side=tk.LEFT, padx=(10, 0))
         
         # Create Treeview
         tree_frame = tk.Frame(table_frame, bg=COLORS['bg_white'])
@@ -107,6 +119,7 @@ class LeaveManagementView:
         self.tree = ttk.Treeview(tree_frame,
                                 columns=("ID", "Employee", "Date", "Type", "Reason", "Status", "Submitted"),
                                 show="headings",
+                                selectmode="extended",
                                 yscrollcommand=vsb.set,
                                 xscrollcommand=hsb.set,
                                 height=12)
@@ -125,7 +138,7 @@ class LeaveManagementView:
         
         self.tree.column("ID", width=50, anchor=tk.CENTER)
         self.tree.column("Employee", width=150, anchor=tk.W)
-        self.tree.column("Date", width=100, anchor=tk.CENTER)
+        self.tree.column("Date", width=180, anchor=tk.CENTER)
         self.tree.column("Type", width=120, anchor=tk.W)
         self.tree.column("Reason", width=200, anchor=tk.W)
         self.tree.column("Status", width=100, anchor=tk.CENTER)
@@ -141,6 +154,32 @@ class LeaveManagementView:
         self.tree.tag_configure('approved', background='#d4edda')
         self.tree.tag_configure('rejected', background='#f8d7da')
         
+        # Pagination
+        pager_frame = tk.Frame(table_frame, bg=COLORS['bg_white'])
+        pager_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
+        
+        self.next_btn = tk.Button(pager_frame, text="Next ▶",
+                                font=("Arial", 10),
+                                command=lambda: self.change_page(1),
+                                cursor="hand2",
+                                relief=tk.FLAT,
+                                padx=10)
+        self.next_btn.pack(side=tk.RIGHT)
+        
+        self.page_label = tk.Label(pager_frame, text="",
+                                  font=("Arial", 10),
+                                  bg=COLORS['bg_white'],
+                                  fg=COLORS['text_gray'])
+        self.page_label.pack(side=tk.RIGHT, padx=10)
+        
+        self.prev_btn = tk.Button(pager_frame, text="◀ Prev",
+                                font=("Arial", 10),
+                                command=lambda: self.change_page(-1),
+                                cursor="hand2",
+                                relief=tk.FLAT,
+                                padx=10)
+        self.prev_btn.pack(side=tk.RIGHT)
+        
         # Action Buttons
         action_frame = tk.Frame(table_frame, bg=COLORS['bg_white'])
         action_frame.pack(fill=tk.X, padx=20, pady=(0, 15))
@@ -167,10 +206,23 @@ class LeaveManagementView:
                              relief=tk.FLAT,
                              padx=20,
                              pady=8)
-        reject_btn.pack(side=tk.LEFT)
+        reject_btn.pack(side=tk.LEFT, padx=(0, 10))
         reject_btn.bind("<Enter>", lambda e: reject_btn.config(bg="#c82333"))
         reject_btn.bind("<Leave>", lambda e: reject_btn.config(bg="#dc3545"))
         
+        select_all_btn = tk.Button(action_frame, text="☑ Select All Pending",
+                                 font=("Arial", 11),
+                                 bg=COLORS['bg_white'],
+                                 fg=COLORS['text_dark'],
+                                 command=self.select_all_pending,
+                                 cursor="hand2",
+                                 relief=tk.FLAT,
+                                 padx=20,
+                                 pady=8)
+        select_all_btn.pack(side=tk.LEFT)
+        select_all_btn.bind("<Enter>", lambda e: select_all_btn.config(bg=COLORS['hover']))
+        select_all_btn.bind("<Leave>", lambda e: select_all_btn.config(bg=COLORS['bg_white']))
+        
         refresh_btn = tk.Button(action_frame, text="🔄 Refresh",
                               font=("Arial", 11),
                               bg=COLORS['primary'],
@@ -184,24 +236,51 @@ class LeaveManagementView:
         refresh_btn.bind("<Enter>", lambda e: refresh_btn.config(bg="#0056b3"))
         refresh_btn.bind("<Leave>", lambda e: refresh_btn.config(bg=COLORS['primary']))
     
+    def status_filter(self):
+        """Status argument for the leave query (None means all)"""
+        filter_val = self.filter_var.get()
+        return None if filter_val == "All" else filter_val
+    
+    def export_requests(self):
+        """Export every request matching the status filter to CSV"""
+        status = self.status_filter()
+        where, params = ("", ()) if status is None else (" WHERE lr.status = %s", (status,))
+        ExportDialog(self.parent, 'leave_requests', "Leave Requests", where, params,
+                     file_prefix="leave_requests")
+    
+    def change_filter(self):
+        self.page = 0
+        self.load_leave_requests()
+    
+    def change_page(self, delta):
+        self.page = max(0, self.page + delta)
+        self.load_leave_requests()
+    
+    def update_pager(self):
+        pages = max(1, -(-self.total_rows // LEAVE_PAGE_SIZE))
+        self.page = min(self.page, pages - 1)
+        self.page_label.config(text=f"Page {self.page + 1} of {pages} ({self.total_rows} requests)")
+        self.prev_btn.config(state=tk.NORMAL if self.page > 0 else tk.DISABLED)
+        self.next_btn.config(state=tk.NORMAL if self.page < pages - 1 else tk.DISABLED)
+    
+    def refresh(self):
+        """Reload the current page and the stats in place"""
+        self.load_leave_requests()
+        self.refresh_stats()
+    
     def load_leave_requests(self):
-        """Load leave requests based on selected filter"""
+        """Load one page of leave requests for the selected filter"""
         # Clear existing items
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Get filter value
-        filter_val = self.filter_var.get()
+        status = self.status_filter()
+        self.total_rows = self.db.count_leave_requests(status=status)
+        self.update_pager()
         
-        # Get data from database
-        if filter_val == "All":
-            requests = self.db.get_all_leave_requests()
-        elif filter_val == "Pending":
-            requests = self.db.get_pending_leave_requests()
-        elif filter_val == "Approved":
-            requests = self.db.get_approved_leave_requests()
-        else:  # Rejected
-            requests = self.db.get_rejected_leave_requests()
+        requests = self.db.query_leave_requests(status=status,
+                                                limit=LEAVE_PAGE_SIZE,
+                                                offset=self.page * LEAVE_PAGE_SIZE)
         
         if not requests:
             self.tree.insert("", tk.END, values=("", "No leave requests found", "", "", "", "", ""))
@@ -218,11 +297,11 @@ class LeaveManagementView:
             status = req['status']
             tag = status.lower()
             
-            self.tree.insert("", tk.END, 
+            self.tree.insert("", tk.END, iid=str(req['id']),
                            values=(
                                req['id'],
                                req['employee_name'],
-                               req['leave_date'],
+                               format_leave_period(req),
                                req['leave_type'],
                                reason,
                                status,
@@ -230,77 +309,99 @@ class LeaveManagementView:
                            ),
                            tags=(tag,))
     
+    def selected_pending(self):
+        """(leave_id, employee_name) for every selected row that is still pending"""
+        pending = []
+        for item_id in self.tree.selection():
+            values = self.tree.item(item_id)['values']
+            if values and values[0] != "" and values[5] == "Pending":
+                pending.append((values[0], values[1]))
+        return pending
+    
+    def select_all_pending(self):
+        """Select every pending row currently shown"""
+        pending = [item_id for item_id in self.tree.get_children()
+                   if self.tree.item(item_id)['values'][5] == "Pending"]
+        self.tree.selection_set(pending)
+    
+    def confirm_bulk(self, action, pending):
+        if len(pending) == 1:
+            message = f"{action} leave request for {pending[0][1]}?"
+        else:
+            message = f"{action} {len(pending)} leave requests?"
+        return messagebox.askyesno(f"Confirm {action}", message)
+    
     def approve_selected(self):
-        """Approve the selected leave request"""
-        selected = self.tree.selection()
-        if not selected:
+        """Approve all selected pending leave requests"""
+        if not self.tree.selection():
             messagebox.showwarning("Warning", "Please select a leave request to approve")
             return
         
-        # Get the leave request ID
-        item = self.tree.item(selected[0])
-        leave_id = item['values'][0]
-        employee_name = item['values'][1]
-        status = item['values'][5]
-        
-        if status != "Pending":
+        pending = self.selected_pending()
+        if not pending:
             messagebox.showinfo("Info", "Only pending requests can be approved")
             return
         
-        # Confirm action
-        if not messagebox.askyesno("Confirm Approval", 
-                                   f"Approve leave request for {employee_name}?"):
+        if not self.confirm_bulk("Approve", pending):
             return
         
         # Approve in database (admin_id = 1 for now, you can pass actual admin ID)
-        success = self.db.approve_leave_request(leave_id, admin_id=1)
+        leave_ids = [leave_id for leave_id, _ in pending]
+        approved = self.db.approve_leave_requests(leave_ids, admin_id=1)
         
-        if success:
-            messagebox.showinfo("Success", "Leave request approved successfully!")
-            self.load_leave_requests()
-            # Refresh stats
-            self.refresh_stats()
+        if approved:
+            messagebox.showinfo("Success", f"{approved} leave request(s) approved successfully!")
+            self.refresh_rows(leave_ids)
         else:
             messagebox.showerror("Error", "Failed to approve leave request")
     
     def reject_selected(self):
-        """Reject the selected leave request"""
-        selected = self.tree.selection()
-        if not selected:
+        """Reject all selected pending leave requests"""
+        if not self.tree.selection():
             messagebox.showwarning("Warning", "Please select a leave request to reject")
             return
         
-        # Get the leave request ID
-        item = self.tree.item(selected[0])
-        leave_id = item['values'][0]
-        employee_name = item['values'][1]
-        status = item['values'][5]
-        
-        if status != "Pending":
+        pending = self.selected_pending()
+        if not pending:
             messagebox.showinfo("Info", "Only pending requests can be rejected")
             return
         
-        # Confirm action
-        if not messagebox.askyesno("Confirm Rejection", 
-                                   f"Reject leave request for {employee_name}?"):
+        if not self.confirm_bulk("Reject", pending):
             return
         
         # Reject in database (admin_id = 1 for now)
-        success = self.db.reject_leave_request(leave_id, admin_id=1, rejection_reason="Rejected by admin")
+        leave_ids = [leave_id for leave_id, _ in pending]
+        rejected = self.db.reject_leave_requests(leave_ids, admin_id=1, rejection_reason="Rejected by admin")
         
-        if success:
-            messagebox.showinfo("Success", "Leave request rejected successfully!")
-            self.load_leave_requests()
-            # Refresh stats
-            self.refresh_stats()
+        if rejected:
+            messagebox.showinfo("Success", f"{rejected} leave request(s) rejected successfully!")
+            self.refresh_rows(leave_ids)
         else:
             messagebox.showerror("Error", "Failed to reject leave request")
     
+    def refresh_rows(self, leave_ids):
+        """Update only the rows whose status changed, then the stats cards"""
+        filter_val = self.filter_var.get()
+        
+        for row in self.db.get_leave_requests_by_ids(leave_ids):
+            item_id = str(row['id'])
+            if not self.tree.exists(item_id):
+                continue
+            
+            if filter_val not in ("All", row['status']):
+                # No longer matches the current filter
+                self.tree.delete(item_id)
+                self.total_rows -= 1
+            else:
+                values = list(self.tree.item(item_id)['values'])
+                values[5] = row['status']
+                self.tree.item(item_id, values=values, tags=(row['status'].lower(),))
+        
+        self.update_pager()
+        self.refresh_stats()
+    
     def refresh_stats(self):
-        """Refresh the statistics cards"""
-        # Destroy and recreate stats
-        for widget in self.parent.winfo_children():
-            if isinstance(widget, tk.Frame) and widget != self.parent.winfo_children()[-1]:
-                widget.destroy()
-                break
-        self.create_stats_cards()
\ No newline at end of file
+        """Refresh the statistics cards in place"""
+        today = date.today().strftime("%Y-%m-%d")
+        self.pending_count_label.config(text=str(self.db.get_leave_status_counts()['Pending']))
+        self.on_leave_label.config(text=str(len(self.db.get_leaves_for_date(today))))
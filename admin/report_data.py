@@ -0,0 +1,470 @@
+"""
+Report Data Module
+Aggregates behind the admin Reports screen (KPI cards, department mix,
+weekly and monthly trends, top performers) and the PDF built from them.
+Nothing here needs Tk, so the same report can be produced headless (cli.py).
+"""
+import csv
+from datetime import datetime, timedelta
+from admin.attendance_analytics import get_attendance_analytics
+
+
+class ReportData:
+    def __init__(self, db, departments=None):
+        self.db = db
+        self.selected_departments = set(departments or ())  # empty = all departments
+        self.analytics = None  # columnar snapshot (None: use SQL)
+
+    def load_analytics(self):
+        """Refresh the columnar snapshot the getters below aggregate from"""
+        self.analytics = get_attendance_analytics(self.db)
+    
+    def get_all_departments(self):
+        """Fetch unique departments from database"""
+        try:
+            departments = self.analytics.departments() if self.analytics is not None else None
+            if departments:
+                return departments
+            
+            # First check if employees table has data
+            count_result = self.db.execute_query("SELECT COUNT(*) as count FROM employees", fetch=True)
+            count = count_result[0]['count'] if count_result else 0
+            print(f"Total employees in database: {count}")
+            
+            # Check departments
+            query = "SELECT DISTINCT department FROM employees WHERE department IS NOT NULL AND department != '' ORDER BY department"
+            result = self.db.execute_query(query, fetch=True)
+            departments = [row['department'] for row in result] if result else []
+            
+            # If no departments in DB, return default list
+            if not departments:
+                print("WARNING: No departments found in database, using defaults")
+                print("Make sure employees have department values assigned!")
+                return ["IT", "HR", "Finance", "Sales", "Marketing", "Operations"]
+            
+            print(f"Found departments: {departments}")
+            return departments
+        except Exception as e:
+            print(f"Error fetching departments: {e}")
+            import traceback
+            traceback.print_exc()
+            return ["IT", "HR", "Finance", "Sales", "Marketing", "Operations"]
+    
+    def get_filtered_employees(self):
+        """Get employees based on selected departments"""
+        if self.selected_departments:
+            placeholders = ','.join(['%s'] * len(self.selected_departments))
+            query = f"SELECT * FROM employees WHERE department IN ({placeholders})"
+            return self.db.execute_query(query, tuple(self.selected_departments), fetch=True)
+        else:
+            # Show all employees when no filter is selected
+            return self.db.execute_query("SELECT * FROM employees", fetch=True)
+    
+    def get_attendance_stats(self):
+        """Calculate attendance statistics for filtered departments"""
+        try:
+            today = datetime.now().strftime('%Y-%m-%d')
+            
+            if self.analytics is not None:
+                total_employees = self.analytics.employee_count(self.selected_departments)
+                today_date = datetime.now().date()
+                present_today = self.analytics.present_by_day(today_date, today_date, self.selected_departments)[0]
+                attendance_rate = (present_today / total_employees * 100) if total_employees > 0 else 0
+                return {
+                    'total': total_employees,
+                    'present': present_today,
+                    'absent': total_employees - present_today,
+                    'rate': f"{attendance_rate:.1f}%"
+                }
+            
+            # Total employees
+            if self.selected_departments:
+                placeholders = ','.join(['%s'] * len(self.selected_departments))
+                total_query = f"SELECT COUNT(*) as count FROM employees WHERE department IN ({placeholders})"
+                total_result = self.db.execute_query(total_query, tuple(self.selected_departments), fetch=True)
+            else:
+                total_result = self.db.execute_query("SELECT COUNT(*) as count FROM employees", fetch=True)
+            
+            total_employees = total_result[0]['count'] if total_result else 0
+            print(f"Total employees: {total_employees}")
+            
+            # Present today (including late)
+            if self.selected_departments:
+                placeholders = ','.join(['%s'] * len(self.selected_departments))
+                present_query = f"""
+                    SELECT COUNT(DISTINCT e.id) as count
+                    FROM employees e 
+                    INNER JOIN attendance a ON e.id = a.employee_id 
+                    WHERE a.date = %s AND a.status IN ('present', 'late') AND e.department IN ({placeholders})
+                """
+                params = [today] + list(self.selected_departments)
+                present_result = self.db.execute_query(present_query, tuple(params), fetch=True)
+            else:
+                present_query = """
+                    SELECT COUNT(DISTINCT e.id) as count
+                    FROM employees e 
+                    INNER JOIN attendance a ON e.id = a.employee_id 
+                    WHERE a.date = %s AND a.status IN ('present', 'late')
+                """
+                present_result = self.db.execute_query(present_query, (today,), fetch=True)
+            
+            present_today = present_result[0]['count'] if present_result else 0
+            print(f"Present today: {present_today}")
+            
+            # Absent today
+            absent_today = total_employees - present_today
+            
+            # Attendance rate
+            attendance_rate = (present_today / total_employees * 100) if total_employees > 0 else 0
+            
+            return {
+                'total': total_employees,
+                'present': present_today,
+                'absent': absent_today,
+                'rate': f"{attendance_rate:.1f}%"
+            }
+        except Exception as e:
+            print(f"Error in get_attendance_stats: {e}")
+            import traceback
+            traceback.print_exc()
+            return {'total': 0, 'present': 0, 'absent': 0, 'rate': '0.0%'}
+    
+    def get_department_distribution(self):
+        """Get employee count by department"""
+        try:
+            if self.analytics is not None:
+                result = [{'department': dept, 'count': count}
+                          for dept, count in self.analytics.department_counts(self.selected_departments)]
+            elif self.selected_departments:
+                placeholders = ','.join(['%s'] * len(self.selected_departments))
+                query = f"SELECT department, COUNT(*) as count FROM employees WHERE department IN ({placeholders}) GROUP BY department"
+                result = self.db.execute_query(query, tuple(self.selected_departments), fetch=True)
+            else:
+                query = "SELECT department, COUNT(*) as count FROM employees GROUP BY department"
+                result = self.db.execute_query(query, fetch=True)
+            
+            if not result:
+                return []
+            
+            # Assign colors
+            colors = ["#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6", "#06B6D4"]
+            return [(row['department'], row['count'], colors[i % len(colors)]) for i, row in enumerate(result)]
+        except Exception as e:
+            print(f"Error in get_department_distribution: {e}")
+            return []
+    
+    def get_weekly_attendance(self):
+        """Get attendance for last 7 days"""
+        try:
+            days = []
+            attendance = []
+            
+            if self.analytics is not None:
+                today = datetime.now().date()
+                first_day = today - timedelta(days=6)
+                days = [(first_day + timedelta(days=i)).strftime('%a') for i in range(7)]
+                return days, self.analytics.present_by_day(first_day, today, self.selected_departments)
+            
+            for i in range(6, -1, -1):
+                date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
+                day_name = (datetime.now() - timedelta(days=i)).strftime('%a')
+                
+                if self.selected_departments:
+                    placeholders = ','.join(['%s'] * len(self.selected_departments))
+                    query = f"""
+                        SELECT COUNT(DISTINCT e.id) as count
+                        FROM employees e 
+                        INNER JOIN attendance a ON e.id = a.employee_id 
+                        WHERE a.date = %s AND a.status IN ('present', 'late') AND e.department IN ({placeholders})
+                    """
+                    params = [date] + list(self.selected_departments)
+                    result = self.db.execute_query(query, tuple(params), fetch=True)
+                else:
+                    query = """
+                        SELECT COUNT(DISTINCT e.id) as count
+                        FROM employees e 
+                        INNER JOIN attendance a ON e.id = a.employee_id 
+                        WHERE a.date = %s AND a.status IN ('present', 'late')
+                    """
+                    result = self.db.execute_query(query, (date,), fetch=True)
+                
+                count = result[0]['count'] if result else 0
+                
+                days.append(day_name)
+                attendance.append(count)
+            
+            return days, attendance
+        except Exception as e:
+            print(f"Error in get_weekly_attendance: {e}")
+            return ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], [0, 0, 0, 0, 0, 0, 0]
+    
+    def get_monthly_trend(self):
+        """Get attendance rate for last 4 months"""
+        try:
+            rates = []
+            months = []
+            
+            # Get total employees for rate calculation
+            if self.analytics is not None:
+                total_result = [{'count': self.analytics.employee_count(self.selected_departments)}]
+            elif self.selected_departments:
+                placeholders = ','.join(['%s'] * len(self.selected_departments))
+                total_query = f"SELECT COUNT(*) as count FROM employees WHERE department IN ({placeholders})"
+                total_result = self.db.execute_query(total_query, tuple(self.selected_departments), fetch=True)
+            else:
+                total_result = self.db.execute_query("SELECT COUNT(*) as count FROM employees", fetch=True)
+            
+            total_emp = total_result[0]['count'] if total_result else 0
+            
+            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+            
+            for i in range(3, -1, -1):
+                # Calculate the target month
+                target_date = datetime.now() - timedelta(days=30*i)
+                month_start = target_date.replace(day=1).strftime('%Y-%m-%d')
+                
+                # Calculate last day of month
+                if target_date.month == 12:
+                    month_end = target_date.replace(day=31).strftime('%Y-%m-%d')
+                else:
+                    next_month = target_date.replace(month=target_date.month + 1, day=1)
+                    month_end = (next_month - timedelta(days=1)).strftime('%Y-%m-%d')
+                
+                if self.analytics is not None:
+                    first = datetime.strptime(month_start, '%Y-%m-%d').date()
+                    last = datetime.strptime(month_end, '%Y-%m-%d').date()
+                    result = [{'count': self.analytics.present_rows(first, last, self.selected_departments)}]
+                elif self.selected_departments:
+                    placeholders = ','.join(['%s'] * len(self.selected_departments))
+                    query = f"""
+                        SELECT COUNT(*) as count
+                        FROM attendance a 
+                        INNER JOIN employees e ON e.id = a.employee_id 
+                        WHERE a.date BETWEEN %s AND %s AND a.status IN ('present', 'late') AND e.department IN ({placeholders})
+                    """
+                    params = [month_start, month_end] + list(self.selected_departments)
+                    result = self.db.execute_query(query, tuple(params), fetch=True)
+                else:
+                    query = """
+                        SELECT COUNT(*) as count
+                        FROM attendance a 
+                        INNER JOIN employees e ON e.id = a.employee_id 
+                        WHERE a.date BETWEEN %s AND %s AND a.status IN ('present', 'late')
+                    """
+                    result = self.db.execute_query(query, (month_start, month_end), fetch=True)
+                
+                present_count = result[0]['count'] if result else 0
+                
+                # Calculate working days in this month
+                if self.analytics is not None:
+                    days_count = self.analytics.attendance_days(first, last)
+                else:
+                    days_query = "SELECT COUNT(DISTINCT date) as count FROM attendance WHERE date BETWEEN %s AND %s"
+                    days_result = self.db.execute_query(days_query, (month_start, month_end), fetch=True)
+                    days_count = days_result[0]['count'] if days_result else 1
+                
+                rate = (present_count / (total_emp * days_count) * 100) if total_emp > 0 and days_count > 0 else 0
+                
+                # Get month name
+                month_name = month_names[target_date.month - 1]
+                months.append(month_name)
+                rates.append(min(100, rate))
+            
+            return months, rates
+        except Exception as e:
+            print(f"Error in get_monthly_trend: {e}")
+            import traceback
+            traceback.print_exc()
+            return ["Sep", "Oct", "Nov", "Dec"], [0, 0, 0, 0]
+    
+    def get_top_performers(self):
+        """Get top 5 employees by attendance rate"""
+        try:
+            if self.analytics is not None:
+                result = [{'first_name': name, 'last_name': '', 'department': dept, 'rate': rate}
+                          for name, dept, rate in self.analytics.top_performers(5, self.selected_departments)]
+            elif self.selected_departments:
+                placeholders = ','.join(['%s'] * len(self.selected_departments))
+                query = f"""
+                    SELECT e.first_name, e.last_name, e.department, 
+                           ROUND(COUNT(CASE WHEN a.status IN ('present', 'late') THEN 1 END) * 100.0 / COUNT(a.id), 1) as rate
+                    FROM employees e
+                    LEFT JOIN attendance a ON e.id = a.employee_id
+                    WHERE e.department IN ({placeholders})
+                    GROUP BY e.id, e.first_name, e.last_name, e.department
+                    HAVING COUNT(a.id) > 0
+                    ORDER BY rate DESC
+                    LIMIT 5
+                """
+                result = self.db.execute_query(query, tuple(self.selected_departments), fetch=True)
+            else:
+                query = """
+                    SELECT e.first_name, e.last_name, e.department, 
+                           ROUND(COUNT(CASE WHEN a.status IN ('present', 'late') THEN 1 END) * 100.0 / COUNT(a.id), 1) as rate
+                    FROM employees e
+                    LEFT JOIN attendance a ON e.id = a.employee_id
+                    GROUP BY e.id, e.first_name, e.last_name, e.department
+                    HAVING COUNT(a.id) > 0
+                    ORDER BY rate DESC
+                    LIMIT 5
+                """
+                result = self.db.execute_query(query, fetch=True)
+            
+            if not result:
+                return []
+            
+            # Assign colors based on rate
+            def get_color(rate):
+                if rate >= 95:
+                    return "#10B981"  # Green
+                elif rate >= 85:
+                    return "#3B82F6"  # Blue
+                elif rate >= 75:
+                    return "#F59E0B"  # Orange
+                else:
+                    return "#6B7280"  # Gray
+            
+            return [(f"{row['first_name']} {row['last_name']}".strip(), 
+                    row['department'], 
+                    f"{row['rate']:.1f}%",
+                    get_color(row['rate'])) 
+                    for row in result]
+        except Exception as e:
+            print(f"Error in get_top_performers: {e}")
+            import traceback
+            traceback.print_exc()
+            return []
+
+
+def write_admin_csv(filename, stats, dept_data, top_employees):
+    """The admin report as CSV: summary, department and top performer sections"""
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Generated on', datetime.now().strftime('%Y-%m-%d %H:%M')])
+        writer.writerow([])
+        writer.writerow(['Metric', 'Value'])
+        writer.writerows([['Total Employees', stats['total']], ['Present Today', stats['present']],
+                          ['Absent Today', stats['absent']], ['Attendance Rate', stats['rate']]])
+        writer.writerow([])
+        writer.writerow(['Department', 'Employee Count'])
+        writer.writerows([dept, count] for dept, count, _ in dept_data)
+        writer.writerow([])
+        writer.writerow(['Rank', 'Employee Name', 'Department', 'Attendance Rate'])
+        writer.writerows([i, name, dept, rate] for i, (name, dept, rate, _) in enumerate(top_employees, 1))
+
+
+def build_admin_pdf(filename, stats, dept_data, top_employees):
+    """
+    Write the admin attendance report PDF (raises ImportError without reportlab)
+
+    Args:
+        stats, dept_data, top_employees: ReportData.get_attendance_stats(),
+            get_department_distribution() and get_top_performers() results
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+
+    # Create PDF
+    pdf = SimpleDocTemplate(filename, pagesize=letter)
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#4A90E2'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    elements.append(Paragraph("Attendance Report & Analytics", title_style))
+    
+    # Date
+    date_style = ParagraphStyle(
+        'DateStyle',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    )
+    elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", date_style))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Summary Statistics Table
+    elements.append(Paragraph("Summary Statistics", styles['Heading2']))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    stats_data = [
+        ['Metric', 'Value'],
+        ['Total Employees', str(stats['total'])],
+        ['Present Today', str(stats['present'])],
+        ['Absent Today', str(stats['absent'])],
+        ['Attendance Rate', stats['rate']]
+    ]
+    
+    stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
+    stats_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4A90E2')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(stats_table)
+    elements.append(Spacer(1, 0.4*inch))
+    
+    # Department Distribution
+    elements.append(Paragraph("Department Distribution", styles['Heading2']))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    if dept_data:
+        dept_table_data = [['Department', 'Employee Count']]
+        for dept, count, _ in dept_data:
+            dept_table_data.append([dept, str(count)])
+        
+        dept_table = Table(dept_table_data, colWidths=[3*inch, 2*inch])
+        dept_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10B981')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        elements.append(dept_table)
+    elements.append(Spacer(1, 0.4*inch))
+    
+    # Top Performers
+    elements.append(Paragraph("Top 5 Best Attendance", styles['Heading2']))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    if top_employees:
+        top_table_data = [['Rank', 'Employee Name', 'Department', 'Attendance Rate']]
+        for i, (name, dept, rate, _) in enumerate(top_employees, 1):
+            top_table_data.append([str(i), name, dept, rate])
+        
+        top_table = Table(top_table_data, colWidths=[0.7*inch, 2.5*inch, 1.5*inch, 1.3*inch])
+        top_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8B5CF6')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        elements.append(top_table)
+    
+    # Build PDF
+    pdf.build(elements)
@@ -1,297 +1,18 @@
 import tkinter as tk
 from tkinter import Canvas
-import math
-from datetime import datetime, timedelta
+from datetime import datetime
 from config import COLORS
+from canvas_charts import DonutChart, LineChart
+from admin.report_data import ReportData, build_admin_pdf
 from tkinter import messagebox
 
-class ReportsView:
+class ReportsView(ReportData):
     def __init__(self, parent_frame, db):
+        super().__init__(db)
         self.parent_frame = parent_frame
-        self.db = db
-        self.selected_departments = set()  # Track selected departments
         self.department_checkboxes = {}  # Store checkbox variables
         self.render()
     
-    def get_all_departments(self):
-        """Fetch unique departments from database"""
-        try:
-            # First check if employees table has data
-            count_result = self.db.execute_query("SELECT COUNT(*) as count FROM employees", fetch=True)
-            count = count_result[0]['count'] if count_result else 0
-            print(f"Total employees in database: {count}")
-            
-            # Check departments
-            query = "SELECT DISTINCT department FROM employees WHERE department IS NOT NULL AND department != '' ORDER BY department"
-            result = self.db.execute_query(query, fetch=True)
-            departments = [row['department'] for row in result] if result else []
-            
-            # If no departments in DB, return default list
-            if not departments:
-                print("WARNING: No departments found in database, using defaults")
-                print("Make sure employees have department values assigned!")
-                return ["IT", "HR", "Finance", "Sales", "Marketing", "Operations"]
-            
-            print(f"Found departments: {departments}")
-            return departments
-        except Exception as e:
-            print(f"Error fetching departments: {e}")
-            import traceback
-            traceback.print_exc()
-            return ["IT", "HR", "Finance", "Sales", "Marketing", "Operations"]
-    
-    def get_filtered_employees(self):
-        """Get employees based on selected departments"""
-        if self.selected_departments:
-            placeholders = ','.join(['%s'] * len(self.selected_departments))
-            query = f"SELECT * FROM employees WHERE department IN ({placeholders})"
-            return self.db.execute_query(query, tuple(self.selected_departments), fetch=True)
-        else:
-            # Show all employees when no filter is selected
-            return self.db.execute_query("SELECT * FROM employees", fetch=True)
-    
-    def get_attendance_stats(self):
-        """Calculate attendance statistics for filtered departments"""
-        try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            # Total employees
-            if self.selected_departments:
-                placeholders = ','.join(['%s'] * len(self.selected_departments))
-                total_query = f"SELECT COUNT(*) as count FROM employees WHERE department IN ({placeholders})"
-                total_result = self.db.execute_query(total_query, tuple(self.selected_departments), fetch=True)
-            else:
-                total_result = self.db.execute_query("SELECT COUNT(*) as count FROM employees", fetch=True)
-            
-            total_employees = total_result[0]['count'] if total_result else 0
-            print(f"Total employees: {total_employees}")
-            
-            # Present today (including late)
-            if self.selected_departments:
-                placeholders = ','.join(['%s'] * len(self.selected_departments))
-                present_query = f"""
-                    SELECT COUNT(DISTINCT e.id) as count
-                    FROM employees e 
-                    INNER JOIN attendance a ON e.id = a.employee_id 
-                    WHERE a.date = %s AND a.status IN ('present', 'late') AND e.department IN ({placeholders})
-                """
-                params = [today] + list(self.selected_departments)
-                present_result = self.db.execute_query(present_query, tuple(params), fetch=True)
-            else:
-                present_query = """
-                    SELECT COUNT(DISTINCT e.id) as count
-                    FROM employees e 
-                    INNER JOIN attendance a ON e.id = a.employee_id 
-                    WHERE a.date = %s AND a.status IN ('present', 'late')
-                """
-                present_result = self.db.execute_query(present_query, (today,), fetch=True)
-            
-            present_today = present_result[0]['count'] if present_result else 0
-            print(f"Present today: {present_today}")
-            
-            # Absent today
-            absent_today = total_employees - present_today
-            
-            # Attendance rate
-            attendance_rate = (present_today / total_employees * 100) if total_employees > 0 else 0
-            
-            return {
-                'total': total_employees,
-                'present': present_today,
-                'absent': absent_today,
-                'rate': f"{attendance_rate:.1f}%"
-            }
-        except Exception as e:
-            print(f"Error in get_attendance_stats: {e}")
-            import traceback
-            traceback.print_exc()
-            return {'total': 0, 'present': 0, 'absent': 0, 'rate': '0.0%'}
-    
-    def get_department_distribution(self):
-        """Get employee count by department"""
-        try:
-            if self.selected_departments:
-                placeholders = ','.join(['%s'] * len(self.selected_departments))
-                query = f"SELECT department, COUNT(*) as count FROM employees WHERE department IN ({placeholders}) GROUP BY department"
-                result = self.db.execute_query(query, tuple(self.selected_departments), fetch=True)
-            else:
-                query = "SELECT department, COUNT(*) as count FROM employees GROUP BY department"
-                result = self.db.execute_query(query, fetch=True)
-            
-            if not result:
-                return []
-            
-            # Assign colors
-            colors = ["#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6", "#06B6D4"]
-            return [(row['department'], row['count'], colors[i % len(colors)]) for i, row in enumerate(result)]
-        except Exception as e:
-            print(f"Error in get_department_distribution: {e}")
-            return []
-    
-    def get_weekly_attendance(self):
-        """Get attendance for last 7 days"""
-        try:
-            days = []
-            attendance = []
-            
-            for i in range(6, -1, -1):
-                date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-                day_name = (datetime.now() - timedelta(days=i)).strftime('%a')
-                
-                if self.selected_departments:
-                    placeholders = ','.join(['%s'] * len(self.selected_departments))
-                    query = f"""
-                        SELECT COUNT(DISTINCT e.id) as count
-                        FROM employees e 
-                        INNER JOIN attendance a ON e.id = a.employee_id 
-                        WHERE a.date = %s AND a.status IN ('present', 'late') AND e.department IN ({placeholders})
-                    """
-                    params = [date] + list(self.selected_departments)
-                    result = self.db.execute_query(query, tuple(params), fetch=True)
-                else:
-                    query = """
-                        SELECT COUNT(DISTINCT e.id) as count
-                        FROM employees e 
-                        INNER JOIN attendance a ON e.id = a.employee_id 
-                        WHERE a.date = %s AND a.status IN ('present', 'late')
-                    """
-                    result = self.db.execute_query(query, (date,), fetch=True)
-                
-                count = result[0]['count'] if result else 0
-                
-                days.append(day_name)
-                attendance.append(count)
-            
-            return days, attendance
-        except Exception as e:
-            print(f"Error in get_weekly_attendance: {e}")
-            return ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], [0, 0, 0, 0, 0, 0, 0]
-    
-    def get_monthly_trend(self):
-        """Get attendance rate for last 4 months"""
-        try:
-            rates = []
-            months = []
-            
-            # Get total employees for rate calculation
-            if self.selected_departments:
-                placeholders = ','.join(['%s'] * len(self.selected_departments))
-                total_query = f"SELECT COUNT(*) as count FROM employees WHERE department IN ({placeholders})"
-                total_result = self.db.execute_query(total_query, tuple(self.selected_departments), fetch=True)
-            else:
-                total_result = self.db.execute_query("SELECT COUNT(*) as count FROM employees", fetch=True)
-            
-            total_emp = total_result[0]['count'] if total_result else 0
-            
-            month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            
-            for i in range(3, -1, -1):
-                # Calculate the target month
-                target_date = datetime.now() - timedelta(days=30*i)
-                month_start = target_date.replace(day=1).strftime('%Y-%m-%d')
-                
-                # Calculate last day of month
-                if target_date.month == 12:
-                    month_end = target_date.replace(day=31).strftime('%Y-%m-%d')
-                else:
-                    next_month = target_date.replace(month=target_date.month + 1, day=1)
-                    month_end = (next_month - timedelta(days=1)).strftime('%Y-%m-%d')
-                
-                if self.selected_departments:
-                    placeholders = ','.join(['%s'] * len(self.selected_departments))
-                    query = f"""
-                        SELECT COUNT(*) as count
-                        FROM attendance a 
-                        INNER JOIN employees e ON e.id = a.employee_id 
-                        WHERE a.date BETWEEN %s AND %s AND a.status IN ('present', 'late') AND e.department IN ({placeholders})
-                    """
-                    params = [month_start, month_end] + list(self.selected_departments)
-                    result = self.db.execute_query(query, tuple(params), fetch=True)
-                else:
-                    query = """
-                        SELECT COUNT(*) as count
-                        FROM attendance a 
-                        INNER JOIN employees e ON e.id = a.employee_id 
-                        WHERE a.date BETWEEN %s AND %s AND a.status IN ('present', 'late')
-                    """
-                    result = self.db.execute_query(query, (month_start, month_end), fetch=True)
-                
-                present_count = result[0]['count'] if result else 0
-                
-                # Calculate working days in this month
-                days_query = "SELECT COUNT(DISTINCT date) as count FROM attendance WHERE date BETWEEN %s AND %s"
-                days_result = self.db.execute_query(days_query, (month_start, month_end), fetch=True)
-                days_count = days_result[0]['count'] if days_result else 1
-                
-                rate = (present_count / (total_emp * days_count) * 100) if total_emp > 0 and days_count > 0 else 0
-                
-                # Get month name
-                month_name = month_names[target_date.month - 1]
-                months.append(month_name)
-                rates.append(min(100, rate))
-            
-            return months, rates
-        except Exception as e:
-            print(f"Error in get_monthly_trend: {e}")
-            import traceback
-            traceback.print_exc()
-            return ["Sep", "Oct", "Nov", "Dec"], [0, 0, 0, 0]
-    
-    def get_top_performers(self):
-        """Get top 5 employees by attendance rate"""
-        try:
-            if self.selected_departments:
-                placeholders = ','.join(['%s'] * len(self.selected_departments))
-                query = f"""
-                    SELECT e.first_name, e.last_name, e.department, 
-                           ROUND(COUNT(CASE WHEN a.status IN ('present', 'late') THEN 1 END) * 100.0 / COUNT(a.id), 1) as rate
-                    FROM employees e
-                    LEFT JOIN attendance a ON e.id = a.employee_id
-                    WHERE e.department IN ({placeholders})
-                    GROUP BY e.id, e.first_name, e.last_name, e.department
-                    HAVING COUNT(a.id) > 0
-                    ORDER BY rate DESC
-                    LIMIT 5
-                """
-                result = self.db.execute_query(query, tuple(self.selected_departments), fetch=True)
-            else:
-                query = """
-                    SELECT e.first_name, e.last_name, e.department, 
-                           ROUND(COUNT(CASE WHEN a.status IN ('present', 'late') THEN 1 END) * 100.0 / COUNT(a.id), 1) as rate
-                    FROM employees e
-                    LEFT JOIN attendance a ON e.id = a.employee_id
-                    GROUP BY e.id, e.first_name, e.last_name, e.department
-                    HAVING COUNT(a.id) > 0
-                    ORDER BY rate DESC
-                    LIMIT 5
-                """
-                result = self.db.execute_query(query, fetch=True)
-            
-            if not result:
-                return []
-            
-            # Assign colors based on rate
-            def get_color(rate):
-                if rate >= 95:
-                    return "#10B981"  # Green
-                elif rate >= 85:
-                    return "#3B82F6"  # Blue
-                elif rate >= 75:
-                    return "#F59E0B"  # Orange
-                else:
-                    return "#6B7280"  # Gray
-            
-            return [(f"{row['first_name']} {row['last_name']}", 
-                    row['department'], 
-                    f"{row['rate']:.1f}%",
-                    get_color(row['rate'])) 
-                    for row in result]
-        except Exception as e:
-            print(f"Error in get_top_performers: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
-    
     def on_department_change(self):
         """Called when checkbox is toggled"""
         # Update selected departments
@@ -314,6 +35,9 @@ class ReportsView:
         self.render()
     
     def render(self):
+        # One snapshot refresh per render; every chart below aggregates from it
+        self.load_analytics()
+
         # --- Background ---
         self.parent_frame.configure(bg="#F0F2F5")
 
@@ -566,37 +290,10 @@ class ReportsView:
         chart_frame = tk.Frame(parent, bg="white")
         chart_frame.pack(pady=20)
 
-        total = sum(count for _, count, _ in departments)
-
-        # Canvas for donut
-        canvas = Canvas(chart_frame, width=300, height=300, bg="white", highlightthickness=0)
-        canvas.pack(side=tk.LEFT, padx=30)
-
-        center_x, center_y = 150, 150
-        radius = 110
-        inner_radius = 70
-
-        # Draw donut segments
-        start_angle = 0
-        for dept, count, color in departments:
-            extent = (count / total) * 360
-            self.draw_donut_arc(canvas, center_x, center_y, radius, inner_radius, 
-                               start_angle, extent, color)
-            start_angle += extent
-
-        # Center text
-        canvas.create_text(
-            center_x, center_y - 10,
-            text=str(total),
-            font=("Segoe UI", 32, "bold"),
-            fill="#1a1a1a"
-        )
-        canvas.create_text(
-            center_x, center_y + 20,
-            text="Employees",
-            font=("Segoe UI", 12),
-            fill="#6B7280"
-        )
+        # Donut (hover a segment for its share)
+        donut = DonutChart(chart_frame, width=300, height=300, radius=110, inner_radius=70)
+        donut.canvas.pack(side=tk.LEFT, padx=30)
+        donut.set_data(departments, center_subtext="Employees")
 
         # Legend
         legend_frame = tk.Frame(chart_frame, bg="white")
@@ -719,138 +416,11 @@ class ReportsView:
         )
 
     def create_monthly_line_chart(self, parent, months, rates):
-        canvas = Canvas(parent, width=600, height=340, bg="white", highlightthickness=0)
-        canvas.pack(pady=20, padx=30)
-
-        # Chart dimensions
-        margin_left = 60
-        margin_right = 40
-        margin_top = 40
-        margin_bottom = 60
-        chart_width = 600 - margin_left - margin_right
-        chart_height = 240
-
-        # Draw grid lines
-        for i in range(5):
-            y = margin_top + (chart_height / 4) * i
-            canvas.create_line(
-                margin_left, y,
-                margin_left + chart_width, y,
-                fill="#E5E7EB", width=1, dash=(2, 2)
-            )
-            # Y-axis labels (percentage)
-            value = 100 - (25 * i)
-            canvas.create_text(
-                margin_left - 10, y,
-                text=f"{value}%",
-                font=("Segoe UI", 9),
-                fill="#6B7280",
-                anchor="e"
-            )
-
-        # Calculate points
-        points = []
-        for i, rate in enumerate(rates):
-            x = margin_left + (i / (len(rates) - 1)) * chart_width if len(rates) > 1 else margin_left + chart_width / 2
-            y = margin_top + chart_height - (rate / 100) * chart_height
-            points.append((x, y))
-
-        # Draw gradient area under line
-        if len(points) > 1:
-            area_points = [(points[0][0], margin_top + chart_height)]
-            area_points.extend(points)
-            area_points.append((points[-1][0], margin_top + chart_height))
-            
-            flat_area = [coord for point in area_points for coord in point]
-            canvas.create_polygon(
-                flat_area,
-                fill="#D1FAE5",
-                outline="",
-                smooth=True
-            )
-
-        # Draw line with shadow
-        if len(points) > 1:
-            for i in range(len(points) - 1):
-                # Shadow
-                canvas.create_line(
-                    points[i][0] + 2, points[i][1] + 2,
-                    points[i+1][0] + 2, points[i+1][1] + 2,
-                    fill="#9CA3AF", width=3, smooth=True
-                )
-                # Main line
-                canvas.create_line(
-                    points[i][0], points[i][1],
-                    points[i+1][0], points[i+1][1],
-                    fill="#10B981", width=4, smooth=True
-                )
-
-        # Draw points, labels, and trend indicators
-        for i, (point, rate, month) in enumerate(zip(points, rates, months)):
-            # Outer glow circle
-            canvas.create_oval(
-                point[0]-10, point[1]-10,
-                point[0]+10, point[1]+10,
-                fill="#D1FAE5", outline=""
-            )
-            
-            # Main circle
-            canvas.create_oval(
-                point[0]-7, point[1]-7,
-                point[0]+7, point[1]+7,
-                fill="#10B981", outline="white", width=3
-            )
-
-            # Rate value with background
-            text_y = point[1] - 25
-            canvas.create_rectangle(
-                point[0] - 25, text_y - 10,
-                point[0] + 25, text_y + 10,
-                fill="#059669", outline=""
-            )
-            canvas.create_text(
-                point[0], text_y,
-                text=f"{rate:.0f}%",
-                font=("Segoe UI", 11, "bold"),
-                fill="white"
-            )
-
-            # Trend indicator (if not first point)
-            if i > 0:
-                prev_rate = rates[i-1]
-                if rate > prev_rate:
-                    # Up arrow
-                    canvas.create_text(
-                        point[0], text_y + 20,
-                        text="↑",
-                        font=("Segoe UI", 14, "bold"),
-                        fill="#10B981"
-                    )
-                elif rate < prev_rate:
-                    # Down arrow
-                    canvas.create_text(
-                        point[0], text_y + 20,
-                        text="↓",
-                        font=("Segoe UI", 14, "bold"),
-                        fill="#EF4444"
-                    )
-
-            # Month label
-            canvas.create_text(
-                point[0], margin_top + chart_height + 20,
-                text=month,
-                font=("Segoe UI", 11, "bold"),
-                fill="#374151"
-            )
-
-        # Y-axis label
-        canvas.create_text(
-            20, margin_top + chart_height / 2,
-            text="Attendance %",
-            font=("Segoe UI", 10, "bold"),
-            fill="#6B7280",
-            angle=90
-        )
+        # Trend line (hover a point for its month)
+        chart = LineChart(parent, width=600, height=340)
+        chart.canvas.pack(pady=20, padx=30)
+        chart.set_data(months, rates, color="#10B981", area_color="#D1FAE5",
+                       y_max=100, ticks=4, suffix="%")
 
     def create_top_performers(self, parent, employees):
         if not employees:
@@ -954,42 +524,10 @@ class ReportsView:
             progress_width = rate_value
             progress_canvas.create_rectangle(0, 0, progress_width, 6, fill=color, outline="")
 
-    def draw_donut_arc(self, canvas, center_x, center_y, radius, inner_radius, start_angle, extent, color):
-        if extent <= 0:
-            return
-
-        start_rad = math.radians(start_angle - 90)
-        end_rad = math.radians(start_angle + extent - 90)
-
-        points = []
-        steps = max(2, int(extent / 2))
-        
-        for i in range(steps + 1):
-            angle = start_rad + (end_rad - start_rad) * i / steps
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            points.append((x, y))
-
-        for i in range(steps, -1, -1):
-            angle = start_rad + (end_rad - start_rad) * i / steps
-            x = center_x + inner_radius * math.cos(angle)
-            y = center_y + inner_radius * math.sin(angle)
-            points.append((x, y))
-
-        flat_points = [coord for point in points for coord in point]
-        canvas.create_polygon(flat_points, fill=color, outline=color, smooth=True)
-
     def export_to_pdf(self):
         """Export current report data to PDF"""
         try:
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.lib import colors
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT
             from tkinter import filedialog
-            from datetime import datetime
             
             # Ask user where to save
             filename = filedialog.asksaveasfilename(
@@ -1001,111 +539,8 @@ class ReportsView:
             if not filename:
                 return
             
-            # Create PDF
-            pdf = SimpleDocTemplate(filename, pagesize=letter)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#4A90E2'),
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-            elements.append(Paragraph("Attendance Report & Analytics", title_style))
-            
-            # Date
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                textColor=colors.grey,
-                alignment=TA_CENTER
-            )
-            elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", date_style))
-            elements.append(Spacer(1, 0.3*inch))
-            
-            # Get stats
-            stats = self.get_attendance_stats()
-            
-            # Summary Statistics Table
-            elements.append(Paragraph("Summary Statistics", styles['Heading2']))
-            elements.append(Spacer(1, 0.2*inch))
-            
-            stats_data = [
-                ['Metric', 'Value'],
-                ['Total Employees', str(stats['total'])],
-                ['Present Today', str(stats['present'])],
-                ['Absent Today', str(stats['absent'])],
-                ['Attendance Rate', stats['rate']]
-            ]
-            
-            stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4A90E2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            elements.append(stats_table)
-            elements.append(Spacer(1, 0.4*inch))
-            
-            # Department Distribution
-            elements.append(Paragraph("Department Distribution", styles['Heading2']))
-            elements.append(Spacer(1, 0.2*inch))
-            
-            dept_data = self.get_department_distribution()
-            if dept_data:
-                dept_table_data = [['Department', 'Employee Count']]
-                for dept, count, _ in dept_data:
-                    dept_table_data.append([dept, str(count)])
-                
-                dept_table = Table(dept_table_data, colWidths=[3*inch, 2*inch])
-                dept_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10B981')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                elements.append(dept_table)
-            elements.append(Spacer(1, 0.4*inch))
-            
-            # Top Performers
-            elements.append(Paragraph("Top 5 Best Attendance", styles['Heading2']))
-            elements.append(Spacer(1, 0.2*inch))
-            
-            top_employees = self.get_top_performers()
-            if top_employees:
-                top_table_data = [['Rank', 'Employee Name', 'Department', 'Attendance Rate']]
-                for i, (name, dept, rate, _) in enumerate(top_employees, 1):
-                    top_table_data.append([str(i), name, dept, rate])
-                
-                top_table = Table(top_table_data, colWidths=[0.7*inch, 2.5*inch, 1.5*inch, 1.3*inch])
-                top_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#8B5CF6')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                elements.append(top_table)
-            
-            # Build PDF
-            pdf.build(elements)
+            build_admin_pdf(filename, self.get_attendance_stats(),
+                            self.get_department_distribution(), self.get_top_performers())
             
             messagebox.showinfo("Success", f"Report exported successfully to:\n{filename}")
             
@@ -1114,4 +549,4 @@ class ReportsView:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export PDF:\n{str(e)}")
             import traceback
-            traceback.print_exc()
\ No newline at end of file
+            traceback.print_exc()
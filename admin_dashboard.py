@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import messagebox
 from database import Database
 from config import COLORS
+from view_manager import ViewManager
 
 # Import separate modules from admin folder
 from admin.dashboard_view import DashboardView
@@ -17,22 +18,42 @@ from admin.late_fee_management_view import LateFeeManagementView
 from admin.holidays_view import HolidaysView  # <--- NEW IMPORT
 
 class AdminDashboard:
-    def __init__(self, user_data):
-        self.window = tk.Tk()
+    def __init__(self, user_data, root=None, db=None):
+        # main.py passes a shared root/db so the dashboard can be reused
+        # across logins; standalone use still owns its own window
+        self.owns_window = root is None
+        self.owns_db = db is None
+        self.window = root if root is not None else tk.Tk()
+        
+        self.user_data = user_data
+        self.db = db if db is not None else Database()
+        self.db.connect()
+        
+        self.setup_ui()
+        self.show_dashboard()
+        
+    def prepare_window(self):
         self.window.title("Admin Dashboard - Attendance System")
         self.window.geometry("1200x700")
+        self.window.resizable(True, True)
         self.window.configure(bg=COLORS['bg_main'])
         
+    def welcome_text(self):
+        return f"Welcome, {self.user_data['username']}"
+    
+    def switch_user(self, user_data):
+        """Reuse this dashboard for another user of the same role"""
         self.user_data = user_data
-        self.db = Database()
         self.db.connect()
-        
-        self.setup_ui()
+        self.welcome_label.config(text=self.welcome_text())
+        self.views.clear()
         self.show_dashboard()
         
     def setup_ui(self):
+        self.container = tk.Frame(self.window, bg=COLORS['bg_main'])
+        
         # Top Header
-        header = tk.Frame(self.window, bg=COLORS['primary'], height=70)
+        header = tk.Frame(self.container, bg=COLORS['primary'], height=70)
         header.pack(fill=tk.X)
         header.pack_propagate(False)
         
@@ -41,13 +62,14 @@ class AdminDashboard:
                 bg=COLORS['primary'], 
                 fg="white").pack(side=tk.LEFT, padx=30, pady=20)
         
-        tk.Label(header, text=f"Welcome, {self.user_data['username']}", 
+        self.welcome_label = tk.Label(header, text=self.welcome_text(), 
                 font=("Arial", 11),
                 bg=COLORS['primary'], 
-                fg="white").pack(side=tk.RIGHT, padx=30)
+                fg="white")
+        self.welcome_label.pack(side=tk.RIGHT, padx=30)
         
         # Main Container
-        main_container = tk.Frame(self.window, bg=COLORS['bg_main'])
+        main_container = tk.Frame(self.container, bg=COLORS['bg_main'])
         main_container.pack(fill=tk.BOTH, expand=True)
         
         # Sidebar
@@ -112,67 +134,62 @@ class AdminDashboard:
         self.content_frame = tk.Frame(main_container, bg=COLORS['bg_main'])
         self.content_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-    def clear_content(self):
-        """Clear all widgets from content frame"""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Views are built once and kept (hidden) between menu clicks
+        self.views = ViewManager(self.content_frame, self.db)
     
     def show_dashboard(self):
         """Display Dashboard Overview"""
-        self.clear_content()
-        DashboardView(self.content_frame, self.db)
+        self.views.show('DashboardView', lambda parent: DashboardView(parent, self.db))
     
     def show_attendance_logs(self):
         """Display Attendance Logs"""
-        self.clear_content()
-        AttendanceLogsView(self.content_frame, self.db)
+        self.views.show('AttendanceLogsView', lambda parent: AttendanceLogsView(parent, self.db))
 
     def show_late_fees_management(self):
         """Display Late Fee Management View"""
-        self.clear_content()
-        LateFeeManagementView(self.content_frame, self.db)
+        self.views.show('LateFeeManagementView', lambda parent: LateFeeManagementView(parent, self.db))
     
     def show_employees(self):
         """Display All Employees"""
-        self.clear_content()
-        EmployeesView(self.content_frame, self.db)
+        self.views.show('EmployeesView', lambda parent: EmployeesView(parent, self.db))
     
     def show_leave_requests(self):
         """Display Leave Requests Management"""
-        self.clear_content()
-        LeaveManagementView(self.content_frame, self.db)
+        self.views.show('LeaveManagementView', lambda parent: LeaveManagementView(parent, self.db))
     
     def show_manage_holidays(self):  # <--- NEW FUNCTION
         """Display Holidays Management Window"""
-        self.clear_content()
-        HolidaysView(self.content_frame, self.db)
+        self.views.show('HolidaysView', lambda parent: HolidaysView(parent, self.db))
     
     def show_reports(self):
         """Display Reports & Analytics"""
-        self.clear_content()
-        ReportsView(self.content_frame, self.db)
+        self.views.show('ReportsView', lambda parent: ReportsView(parent, self.db))
 
     def show_settings(self):
         """Display Settings View"""
-        self.clear_content()
-        SettingsView(self.content_frame, self.db)
+        self.views.show('SettingsView', lambda parent: SettingsView(parent, self.db))
     
     def show_create_employee(self):
         """Display Create Employee Form"""
-        self.clear_content()
-        CreateEmployeeView(self.content_frame, self.db)
+        self.views.show('CreateEmployeeView', lambda parent: CreateEmployeeView(parent, self.db))
     
     def show_create_hr(self):
         """Display Create HR Manager Form"""
-        self.clear_content()
-        CreateHRView(self.content_frame, self.db)
+        self.views.show('CreateHRView', lambda parent: CreateHRView(parent, self.db))
 
     def logout(self):
-        """Logout and close application"""
+        """Logout and hand control back to the login screen"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-            self.db.disconnect()
-            self.window.destroy()
+            if self.owns_db:
+                self.db.disconnect()
+            if self.owns_window:
+                self.window.destroy()
+            else:
+                self.container.pack_forget()
+                self.window.quit()
     
     def run(self):
-        """Run the admin dashboard"""
-        self.window.mainloop() 
\ No newline at end of file
+        """Run the dashboard until logout"""
+        self.prepare_window()
+        self.container.pack(fill=tk.BOTH, expand=True)
+        self.window.mainloop()
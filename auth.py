@@ -0,0 +1,153 @@
+"""
+Authentication Helpers Module
+Salted password hashing, a verified-login cache and a per-user attempt limiter
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+from config import (PASSWORD_HASH_ITERATIONS, AUTH_CACHE_TTL,
+                    LOGIN_MAX_ATTEMPTS, LOGIN_LOCKOUT_SECONDS)
+
+HASH_ALGORITHM = "pbkdf2_sha256"
+
+
+def hash_password(password, iterations=None):
+    """
+    Hash a password with a random salt
+
+    Returns:
+        str: "pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>" (fits users.password)
+    """
+    iterations = iterations or PASSWORD_HASH_ITERATIONS
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f"{HASH_ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def is_hashed(stored):
+    return bool(stored) and stored.startswith(HASH_ALGORITHM + "$")
+
+
+def verify_password(password, stored):
+    """Check a password against a stored hash (or a legacy plaintext value)"""
+    if not stored:
+        return False
+
+    if not is_hashed(stored):
+        # Legacy plaintext row - authenticate_user rehashes it on success
+        return hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+
+    try:
+        _, iterations, salt_hex, hash_hex = stored.split('$')
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'),
+                                     bytes.fromhex(salt_hex), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), hash_hex)
+
+
+def needs_rehash(stored):
+    """True for plaintext rows and hashes made with a different cost"""
+    if not is_hashed(stored):
+        return True
+    try:
+        return int(stored.split('$')[1]) != PASSWORD_HASH_ITERATIONS
+    except (IndexError, ValueError):
+        return True
+
+
+class VerifiedLoginCache:
+    """
+    Remembers recent successful logins so a repeat sign-in on the same
+    kiosk skips the PBKDF2 work and the user lookup.
+
+    Only a keyed HMAC of the password is kept, and only in memory.
+    """
+
+    def __init__(self, ttl=AUTH_CACHE_TTL):
+        self.ttl = ttl
+        self._secret = os.urandom(32)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, username, password):
+        message = f"{username}\0{password}".encode('utf-8')
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def get(self, username, password):
+        """Return the cached user row if this exact login was verified recently"""
+        with self._lock:
+            entry = self._entries.get(username)
+            if not entry:
+                return None
+            fingerprint, user, expires = entry
+            if time.monotonic() > expires:
+                del self._entries[username]
+                return None
+        if hmac.compare_digest(fingerprint, self._fingerprint(username, password)):
+            return dict(user)
+        return None
+
+    def put(self, username, password, user):
+        entry = (self._fingerprint(username, password), dict(user), time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[username] = entry
+
+    def invalidate(self, username=None):
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+
+
+class LoginRateLimiter:
+    """Locks a username out for a while after too many failed attempts"""
+
+    def __init__(self, max_attempts=LOGIN_MAX_ATTEMPTS, lockout_seconds=LOGIN_LOCKOUT_SECONDS):
+        self.max_attempts = max_attempts
+        self.lockout_seconds = lockout_seconds
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def retry_after(self, username):
+        """Seconds until this username may try again (0 if allowed now)"""
+        with self._lock:
+            failures = self._failures.get(username)
+            if not failures:
+                return 0
+            cutoff = time.monotonic() - self.lockout_seconds
+            failures = [t for t in failures if t > cutoff]
+            self._failures[username] = failures
+            if len(failures) < self.max_attempts:
+                return 0
+            return int(failures[0] - cutoff) + 1
+
+    def record_failure(self, username):
+        with self._lock:
+            self._failures.setdefault(username, []).append(time.monotonic())
+
+    def record_success(self, username):
+        with self._lock:
+            self._failures.pop(username, None)
+
+
+# Shared by every login screen in the process
+login_cache = VerifiedLoginCache()
+login_limiter = LoginRateLimiter()
+
+
+def benchmark_hash(iteration_counts=(100000, 200000, 400000, 600000)):
+    """Print hashing time per cost setting to help tune PASSWORD_HASH_ITERATIONS"""
+    for iterations in iteration_counts:
+        start = time.perf_counter()
+        verify_password("benchmark", hash_password("benchmark", iterations))
+        elapsed = (time.perf_counter() - start) * 1000 / 2
+        print(f"{iterations:>8} iterations: {elapsed:7.1f} ms per hash")
+
+
+if __name__ == "__main__":
+    benchmark_hash()
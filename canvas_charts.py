@@ -0,0 +1,332 @@
+"""
+Canvas Charts Module
+Small charts drawn straight onto a Tk Canvas: grouped bars, donuts and
+line trends. Canvas items are keyed and reused between updates (moved
+with coords()/itemconfig() instead of deleted and recreated), and every
+bar, segment and point carries a tooltip shown on hover.
+"""
+import math
+import tkinter as tk
+from abc import ABC, abstractmethod
+
+GRID_COLOR = "#e0e0e0"
+AXIS_TEXT_COLOR = "#7f8c8d"
+TITLE_COLOR = "#2c3e50"
+FONT = "Segoe UI"
+
+
+def nice_max(value, ticks=5):
+    """Round an axis maximum up so `ticks` gridlines land on whole numbers"""
+    if value <= 0:
+        return ticks
+    step = max(1, math.ceil(value / ticks))
+    return step * ticks
+
+
+class CanvasChart(ABC):
+    """Base class: item pool, margins, resize handling and tooltips"""
+
+    def __init__(self, parent, width=600, height=340, bg="white",
+                 margins=(60, 40, 40, 60), resize=False):
+        """
+        Args:
+            margins: (left, right, top, bottom) around the plot area
+            resize: redraw to fill the canvas whenever it is resized
+        """
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=bg, highlightthickness=0)
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self.margin_left, self.margin_right, self.margin_top, self.margin_bottom = margins
+
+        self.items = {}       # key -> canvas item id
+        self.touched = set()  # keys drawn in the current frame
+        self.tooltips = {}    # canvas item id -> tooltip text
+        self.tooltip_items = None
+
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Leave>", lambda e: self.hide_tooltip())
+        if resize:
+            self.canvas.bind("<Configure>", self.on_resize)
+
+    # ---- item reuse -------------------------------------------------------
+
+    def item(self, key, kind, coords, tooltip=None, **options):
+        """Create the item the first time `key` is drawn, otherwise move/restyle it"""
+        item_id = self.items.get(key)
+        if item_id is None:
+            item_id = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            self.items[key] = item_id
+        else:
+            self.canvas.coords(item_id, *coords)
+            self.canvas.itemconfigure(item_id, state=tk.NORMAL, **options)
+        self.touched.add(key)
+        if tooltip is not None:
+            self.tooltips[item_id] = tooltip
+        else:
+            self.tooltips.pop(item_id, None)
+        return item_id
+
+    def begin(self):
+        self.touched = set()
+        self.hide_tooltip()
+
+    def end(self):
+        """Hide pooled items that the last draw did not use"""
+        for key, item_id in self.items.items():
+            if key not in self.touched:
+                self.canvas.itemconfigure(item_id, state=tk.HIDDEN)
+                self.tooltips.pop(item_id, None)
+
+    # ---- layout -----------------------------------------------------------
+
+    @property
+    def plot_width(self):
+        return self.width - self.margin_left - self.margin_right
+
+    @property
+    def plot_height(self):
+        return self.height - self.margin_top - self.margin_bottom
+
+    def on_resize(self, event):
+        if (event.width, event.height) != (self.width, self.height) and event.width > 1:
+            self.width, self.height = event.width, event.height
+            self.draw()
+
+    @abstractmethod
+    def draw(self):
+        """Redraw from the stored data (implemented by each chart)"""
+
+    def draw_y_grid(self, y_max, ticks=5, suffix=""):
+        bottom = self.margin_top + self.plot_height
+        for i in range(ticks + 1):
+            y = bottom - self.plot_height * i / ticks
+            self.item(('grid', i), 'line', (self.margin_left, y, self.width - self.margin_right, y),
+                      fill=GRID_COLOR, width=1)
+            self.item(('ytick', i), 'text', (self.margin_left - 10, y),
+                      text=f"{round(y_max * i / ticks)}{suffix}",
+                      font=(FONT, 9), fill=AXIS_TEXT_COLOR, anchor=tk.E)
+
+    def draw_title(self, title):
+        if title:
+            self.item('title', 'text', (self.width / 2, 15), text=title,
+                      font=(FONT, 12, "bold"), fill=TITLE_COLOR)
+
+    def draw_legend(self, entries):
+        """entries: [(label, color), ...] laid out left to right under the title"""
+        x = self.margin_left
+        y = self.margin_top - 12
+        for i, (label, color) in enumerate(entries):
+            self.item(('legend_box', i), 'rectangle', (x, y - 5, x + 10, y + 5), fill=color, outline="")
+            self.item(('legend_text', i), 'text', (x + 15, y), text=label,
+                      font=(FONT, 9), fill=TITLE_COLOR, anchor=tk.W)
+            x += 30 + 7 * len(label)
+
+    # ---- tooltips ---------------------------------------------------------
+
+    def on_motion(self, event):
+        hit = None
+        for item_id in reversed(self.canvas.find_overlapping(event.x, event.y, event.x, event.y)):
+            if item_id in self.tooltips:
+                hit = item_id
+                break
+        if hit is None:
+            self.hide_tooltip()
+        else:
+            self.show_tooltip(event.x, event.y, self.tooltips[hit])
+
+    def show_tooltip(self, x, y, text):
+        if self.tooltip_items is None:
+            box = self.canvas.create_rectangle(0, 0, 0, 0, fill="#2c3e50", outline="")
+            label = self.canvas.create_text(0, 0, text="", fill="white",
+                                            font=(FONT, 9), anchor=tk.NW)
+            self.tooltip_items = (box, label)
+        box, label = self.tooltip_items
+
+        self.canvas.itemconfigure(label, text=text, state=tk.NORMAL)
+        self.canvas.coords(label, x + 12, y + 12)
+        x1, y1, x2, y2 = self.canvas.bbox(label)
+        # Keep the tooltip inside the canvas
+        dx = min(0, self.width - x2 - 6)
+        dy = min(0, self.height - y2 - 6)
+        if dx or dy:
+            self.canvas.move(label, dx, dy)
+            x1, y1, x2, y2 = x1 + dx, y1 + dy, x2 + dx, y2 + dy
+        self.canvas.coords(box, x1 - 5, y1 - 3, x2 + 5, y2 + 3)
+        self.canvas.itemconfigure(box, state=tk.NORMAL)
+        self.canvas.tag_raise(box)
+        self.canvas.tag_raise(label)
+
+    def hide_tooltip(self):
+        if self.tooltip_items:
+            for item_id in self.tooltip_items:
+                self.canvas.itemconfigure(item_id, state=tk.HIDDEN)
+
+
+class GroupedBarChart(CanvasChart):
+    """Side-by-side bars per category, one colour per series"""
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.labels = []
+        self.series = []
+        self.title = None
+        self.y_max = None
+
+    def set_data(self, labels, series, title=None, y_max=None):
+        """
+        Args:
+            labels: category labels along the x axis
+            series: [(name, values, color), ...] with one value per label
+            y_max: fixed axis maximum (default: rounded-up largest value)
+        """
+        self.labels = list(labels)
+        self.series = [(name, list(values), color) for name, values, color in series]
+        self.title = title
+        self.y_max = y_max
+        self.draw()
+
+    def draw(self):
+        self.begin()
+        largest = max([v for _, values, _ in self.series for v in values] + [0])
+        y_max = nice_max(max(self.y_max or 0, largest))
+
+        self.draw_title(self.title)
+        self.draw_legend([(name, color) for name, _, color in self.series])
+        self.draw_y_grid(y_max)
+
+        if self.labels:
+            bottom = self.margin_top + self.plot_height
+            group_width = self.plot_width / len(self.labels)
+            bar_width = group_width * 0.75 / max(1, len(self.series))
+            for i, label in enumerate(self.labels):
+                group_left = self.margin_left + i * group_width + group_width * 0.125
+                for s, (name, values, color) in enumerate(self.series):
+                    value = values[i] if i < len(values) else 0
+                    x1 = group_left + s * bar_width
+                    y1 = bottom - self.plot_height * value / y_max
+                    self.item(('bar', s, i), 'rectangle', (x1, y1, x1 + bar_width - 2, bottom),
+                              tooltip=f"{label}\n{name}: {value}", fill=color, outline="")
+                self.item(('xlabel', i), 'text', (group_left + group_width * 0.375, bottom + 15),
+                          text=label, font=(FONT, 9), fill=TITLE_COLOR)
+        self.end()
+
+
+class DonutChart(CanvasChart):
+    """Ring of segments with a total in the middle"""
+
+    def __init__(self, parent, width=300, height=300, radius=110, inner_radius=70, **kwargs):
+        super().__init__(parent, width=width, height=height, margins=(0, 0, 0, 0), **kwargs)
+        self.radius = radius
+        self.inner_radius = inner_radius
+        self.segments = []
+        self.center_text = ""
+        self.center_subtext = ""
+
+    def set_data(self, segments, center_text=None, center_subtext=""):
+        """segments: [(label, value, color), ...]; center_text defaults to the total"""
+        self.segments = list(segments)
+        total = sum(value for _, value, _ in self.segments)
+        self.center_text = str(total) if center_text is None else center_text
+        self.center_subtext = center_subtext
+        self.draw()
+
+    def ring_points(self, start_angle, extent):
+        """Polygon outline of one ring segment (angles in degrees, clockwise from 12 o'clock)"""
+        cx, cy = self.width / 2, self.height / 2
+        start_rad = math.radians(start_angle - 90)
+        end_rad = math.radians(start_angle + extent - 90)
+        steps = max(2, int(extent / 2))
+
+        points = []
+        for radius, order in ((self.radius, range(steps + 1)), (self.inner_radius, range(steps, -1, -1))):
+            for i in order:
+                angle = start_rad + (end_rad - start_rad) * i / steps
+                points.extend((cx + radius * math.cos(angle), cy + radius * math.sin(angle)))
+        return points
+
+    def draw(self):
+        self.begin()
+        total = sum(value for _, value, _ in self.segments)
+        start_angle = 0
+        for i, (label, value, color) in enumerate(self.segments):
+            extent = value / total * 360 if total else 0
+            if extent > 0:
+                share = value / total * 100
+                self.item(('segment', i), 'polygon', self.ring_points(start_angle, min(extent, 359.9)),
+                          tooltip=f"{label}: {value} ({share:.0f}%)",
+                          fill=color, outline=color, smooth=True)
+            start_angle += extent
+
+        cx, cy = self.width / 2, self.height / 2
+        self.item('center', 'text', (cx, cy - 10), text=self.center_text,
+                  font=(FONT, 32, "bold"), fill="#1a1a1a")
+        self.item('center_sub', 'text', (cx, cy + 20), text=self.center_subtext,
+                  font=(FONT, 12), fill="#6B7280")
+        self.end()
+
+
+class LineChart(CanvasChart):
+    """Single trend line with point markers, value labels and an optional shaded area"""
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.labels = []
+        self.values = []
+        self.color = "#3498db"
+        self.area_color = None
+        self.title = None
+        self.y_max = None
+        self.ticks = 5
+        self.suffix = ""
+
+    def set_data(self, labels, values, color="#3498db", area_color=None, title=None,
+                 y_max=None, ticks=5, suffix=""):
+        """
+        Args:
+            labels: point labels along the x axis
+            values: one value per label
+            area_color: fill under the line (default: no fill)
+            y_max: fixed axis maximum (default: rounded-up largest value)
+        """
+        self.labels = list(labels)
+        self.values = list(values)
+        self.color = color
+        self.area_color = area_color
+        self.title = title
+        self.y_max = y_max
+        self.ticks = ticks
+        self.suffix = suffix
+        self.draw()
+
+    def draw(self):
+        self.begin()
+        y_max = self.y_max or nice_max(max(self.values + [0]), self.ticks)
+        self.draw_title(self.title)
+        self.draw_y_grid(y_max, ticks=self.ticks, suffix=self.suffix)
+
+        bottom = self.margin_top + self.plot_height
+        count = len(self.values)
+        step = self.plot_width / (count - 1) if count > 1 else 0
+        points = []
+        for i, (label, value) in enumerate(zip(self.labels, self.values)):
+            x = self.margin_left + (i * step if count > 1 else self.plot_width / 2)
+            y = bottom - self.plot_height * min(value, y_max) / y_max
+            points.append((x, y))
+            self.item(('xlabel', i), 'text', (x, bottom + 15), text=label,
+                      font=(FONT, 9), fill=TITLE_COLOR)
+
+        if len(points) > 1:
+            if self.area_color:
+                outline = [(points[0][0], bottom)] + points + [(points[-1][0], bottom)]
+                self.item('area', 'polygon', [c for p in outline for c in p],
+                          fill=self.area_color, outline="")
+            self.item('line', 'line', [c for p in points for c in p], fill=self.color, width=3)
+        for i, (x, y) in enumerate(points):
+            text = f"{round(self.values[i], 1):g}{self.suffix}"
+            self.item(('value', i), 'text', (x, y - 15), text=text,
+                      font=(FONT, 9, "bold"), fill=TITLE_COLOR)
+            self.item(('point', i), 'oval', (x - 5, y - 5, x + 5, y + 5),
+                      tooltip=f"{self.labels[i]}: {text}",
+                      fill="white", outline=self.color, width=2)
+        self.end()
@@ -0,0 +1,344 @@
+# cli.py
+"""
+Employee Attendance Monitoring System - Headless Jobs
+Command-line entry point for scheduled reports and maintenance; no Tk window.
+
+    python cli.py admin-report --out report.pdf [--department IT ...]
+    python cli.py employee-reports --out-dir reports/ [--from 2025-01-01 --to 2025-01-31]
+                                   [--department IT ...] [--employee 12 ...] [--format pdf|csv] [--workers 8]
+    python cli.py month-reports 2025-01 --out-dir reports/ [--department IT ...] [--format pdf|csv] [--workers 8]
+    python cli.py export attendance --out logs.csv.gz [--from ... --to ...] [--department IT ...] [--resume]
+    python cli.py payroll 2025-01 [2025-03] [--out exports/payroll]
+    python cli.py rebuild-rollups
+    python cli.py recalc-late-fees [--from ... --to ...] [--dry-run]
+    python cli.py reconcile-ledger [--check]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from config import CLI_REPORT_WORKERS
+from database import Database, get_connection_pool
+
+
+def parse_date(text):
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def connect():
+    db = Database()
+    if not db.connect():
+        raise SystemExit("Could not connect to the database")
+    return db
+
+
+def period_label(start_date, end_date):
+    if not start_date and not end_date:
+        return "All Time"
+    return f"{start_date or 'Hire date'} to {end_date or 'Today'}"
+
+
+# ---- admin report -----------------------------------------------------------
+
+def admin_report(args):
+    from admin.report_data import ReportData, build_admin_pdf, write_admin_csv
+
+    db = connect()
+    try:
+        data = ReportData(db, args.department)
+        data.load_analytics()
+        sections = (data.get_attendance_stats(), data.get_department_distribution(), data.get_top_performers())
+        if args.out.lower().endswith(".csv"):
+            write_admin_csv(args.out, *sections)
+        else:
+            build_admin_pdf(args.out, *sections)
+        print(f"Admin report written to {args.out}")
+    finally:
+        db.disconnect()
+
+
+# ---- per-employee reports (process pool) ------------------------------------
+
+_worker_db = None
+
+
+def init_report_worker():
+    """Each worker process opens one connection, once; it never needs a full pool"""
+    global _worker_db
+    get_connection_pool(pool_size=1)
+    _worker_db = connect()
+
+
+def employee_report_job(employee, out_dir, fmt, start_date, end_date):
+    """Worker process: build one employee's report; returns (employee id, path, error)"""
+    from employee.report_builder import (load_employee_logs, calculate_kpis, hire_date_of, report_records,
+                                         report_filename, write_employee_pdf, write_employee_csv)
+    from holiday_calendar import get_holiday_calendar
+
+    try:
+        db = _worker_db
+        employee = dict(employee, full_name=f"{employee['first_name']} {employee['last_name']}")
+        logs = load_employee_logs(db, employee['id'], start_date, end_date)
+        kpis = calculate_kpis(db, employee['id'], logs, employee, start_date, end_date)
+
+        leave_dates = set()
+        first_day = hire_date_of(employee)
+        if first_day:
+            leave_dates = db.get_leave_dates(employee['id'], max(first_day, start_date or first_day), end_date)
+        records = report_records(logs, employee, leave_dates, get_holiday_calendar(db), start_date, end_date)
+
+        path = os.path.join(out_dir, report_filename(employee, fmt))
+        period = period_label(start_date, end_date)
+        if fmt == "pdf":
+            write_employee_pdf(path, employee, kpis, records, period)
+        else:
+            write_employee_csv(path, employee, kpis, records, period)
+        return employee['id'], path, None
+    except Exception as e:
+        return employee['id'], None, str(e)
+
+
+def employee_reports(args):
+    from employee.report_batch import select_employees
+
+    db = connect()
+    try:
+        employees = select_employees(db, args.department, args.employee)
+    finally:
+        db.disconnect()
+    if not employees:
+        print("No matching employees")
+        return 0
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    workers = args.workers or CLI_REPORT_WORKERS or os.cpu_count() or 1
+    print(f"Generating {len(employees)} {args.format.upper()} reports with {workers} workers...")
+
+    started = time.perf_counter()
+    failed = 0
+    # spawn: workers must not inherit the parent's pooled MySQL sockets
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_report_worker,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {}
+        for emp in employees:
+            try:
+                futures[pool.submit(employee_report_job, dict(emp), args.out_dir, args.format,
+                                    args.start_date, args.end_date)] = emp['id']
+            except Exception as e:
+                failed += 1
+                print(f"employee {emp['id']}: FAILED - {e!r}")
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                emp_id, path, error = future.result()
+            except Exception as e:
+                # A worker died (e.g. BrokenProcessPool): count it and keep going
+                emp_id, path, error = futures[future], None, f"worker failed: {e!r}"
+            if error:
+                failed += 1
+                print(f"[{done}/{len(futures)}] employee {emp_id}: FAILED - {error}")
+            else:
+                print(f"[{done}/{len(futures)}] {path}")
+
+    elapsed = time.perf_counter() - started
+    print(f"Done: {len(employees) - failed} reports, {failed} failed in {elapsed:.1f}s "
+          f"({len(employees) / elapsed:.1f} reports/sec)")
+    return 1 if failed else 0
+
+
+def month_reports(args):
+    from employee.report_batch import generate_month_reports
+    from payroll_export import parse_month
+
+    def progress(done, total, entry):
+        if entry['error']:
+            print(f"[{done}/{total}] employee {entry['employee_id']}: FAILED - {entry['error']}")
+        elif done % 50 == 0 or done == total:
+            print(f"[{done}/{total}] reports written")
+
+    year, month = parse_month(args.month)
+    db = connect()
+    try:
+        manifest = generate_month_reports(db, args.out_dir, year, month, args.department, args.employee,
+                                          args.format, args.workers, progress)
+    finally:
+        db.disconnect()
+    if manifest is None:
+        print("Could not load the month's attendance")
+        return 1
+
+    print(f"Done: {manifest['written']} reports, {manifest['failed']} failed in "
+          f"{manifest['elapsed_seconds']:.1f}s ({manifest['reports_per_sec'] or 0:.1f} reports/sec) "
+          f"-> {manifest['directory']}")
+    return 1 if manifest['failed'] else 0
+
+
+# ---- CSV export -------------------------------------------------------------
+
+def export_table(args):
+    from csv_export import CsvExport, EXPORT_SOURCES
+
+    department_column = {'attendance': 'e.department', 'employees': 'e.department',
+                         'leave_requests': 'e.department', 'late_fees': 'e.department'}
+    date_column = {'attendance': 'a.date', 'leave_requests': 'lr.leave_date'}
+
+    where = " WHERE 1=1"
+    params = []
+    if args.department:
+        where += f" AND {department_column[args.source]} IN ({','.join(['%s'] * len(args.department))})"
+        params.extend(args.department)
+    if (args.start_date or args.end_date) and args.source not in date_column:
+        raise SystemExit(f"--from/--to are not supported for {args.source}")
+    if args.start_date:
+        where += f" AND {date_column[args.source]} >= %s"
+        params.append(args.start_date)
+    if args.end_date:
+        where += f" AND {date_column[args.source]} <= %s"
+        params.append(args.end_date)
+
+    columns = [c for c in EXPORT_SOURCES[args.source]['columns'] if c.default or args.all_columns]
+    export = CsvExport(args.source, columns, args.out, where, params,
+                       compress=args.out.lower().endswith(".gz"))
+    if args.resume and export.checkpoint() is None:
+        print(f"No checkpoint for this export at {args.out}; starting over")
+    export.run(resume=args.resume)
+
+    result = None
+    while not export.queue.empty():
+        result = export.queue.get()
+    if result and result[0] == 'done':
+        print(f"Exported {result[1]} records to {args.out}")
+        return 0
+    print(f"Export failed: {result[1] if result else 'unknown error'}")
+    return 1
+
+
+# ---- payroll / maintenance --------------------------------------------------
+
+def payroll(args):
+    from payroll_export import parse_month
+
+    db = connect()
+    try:
+        manifest = db.export_payroll(args.out, parse_month(args.first_month),
+                                     parse_month(args.last_month) if args.last_month else None,
+                                     fmt=args.format)
+        total = sum(p['rows'] for p in manifest['partitions'])
+        print(f"Wrote {len(manifest['partitions'])} partitions ({total} rows) to {args.out}")
+    finally:
+        db.disconnect()
+
+
+def rebuild_rollups(args):
+    db = connect()
+    try:
+        days = db.rebuild_leave_days()
+        print(f"leave_days rebuilt: {days} day rows")
+        mismatched = db.reconcile_fee_ledger(fix=True)
+        print(f"late_fee_ledger: {len(mismatched)} employee rows rewritten")
+    finally:
+        db.disconnect()
+
+
+def recalc_late_fees(args):
+    from late_fee_calculator import LateFeeCalculator
+
+    db = connect()
+    try:
+        changes = LateFeeCalculator(db).recalculate_late_fees(args.start_date, args.end_date, args.dry_run)
+        if changes is None:
+            print("Late fee settings are not configured")
+            return 1
+        action = "would change" if args.dry_run else "changed"
+        print(f"Late fee recalculation {action} {len(changes)} attendance rows")
+    finally:
+        db.disconnect()
+
+
+def reconcile_ledger(args):
+    db = connect()
+    try:
+        mismatched = db.reconcile_fee_ledger(fix=not args.check)
+        if not mismatched:
+            print("Late fee ledger matches attendance")
+        else:
+            action = "found" if args.check else "fixed"
+            print(f"Ledger mismatches {action} for {len(mismatched)} employees: {sorted(mismatched)}")
+        return 1 if mismatched and args.check else 0
+    finally:
+        db.disconnect()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Attendance system headless jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_period(command):
+        command.add_argument("--from", dest="start_date", type=parse_date, help="YYYY-MM-DD")
+        command.add_argument("--to", dest="end_date", type=parse_date, help="YYYY-MM-DD")
+
+    command = commands.add_parser("admin-report", help="admin attendance report (PDF, or CSV by extension)")
+    command.add_argument("--out", required=True)
+    command.add_argument("--department", action="append", help="repeatable; default: all")
+    command.set_defaults(func=admin_report)
+
+    command = commands.add_parser("employee-reports", help="one report per employee, in parallel")
+    command.add_argument("--out-dir", required=True)
+    command.add_argument("--format", choices=("pdf", "csv"), default="pdf")
+    command.add_argument("--department", action="append", help="repeatable; default: all")
+    command.add_argument("--employee", action="append", type=int, help="employee id (repeatable)")
+    command.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    add_period(command)
+    command.set_defaults(func=employee_reports)
+
+    command = commands.add_parser("month-reports", help="month-end batch: one report per employee for a month")
+    command.add_argument("month", help="YYYY-MM")
+    command.add_argument("--out-dir", default="reports", help="a dated run directory is created inside")
+    command.add_argument("--format", choices=("pdf", "csv"), default="pdf")
+    command.add_argument("--department", action="append", help="repeatable; default: all")
+    command.add_argument("--employee", action="append", type=int, help="employee id (repeatable)")
+    command.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    command.set_defaults(func=month_reports)
+
+    command = commands.add_parser("export", help="stream a table to CSV (.csv.gz compresses)")
+    command.add_argument("source", choices=("attendance", "employees", "leave_requests", "late_fees"))
+    command.add_argument("--out", required=True)
+    command.add_argument("--department", action="append", help="repeatable; default: all")
+    command.add_argument("--all-columns", action="store_true", help="include optional columns")
+    command.add_argument("--resume", action="store_true",
+                         help="continue an interrupted export of the same selection (default: start over)")
+    add_period(command)
+    command.set_defaults(func=export_table)
+
+    command = commands.add_parser("payroll", help="month-partitioned Parquet/NPZ payroll export")
+    command.add_argument("first_month", help="YYYY-MM")
+    command.add_argument("last_month", nargs="?", help="YYYY-MM (default: first_month)")
+    command.add_argument("--out", default=os.path.join("exports", "payroll"))
+    command.add_argument("--format", choices=("parquet", "npz"))
+    command.set_defaults(func=payroll)
+
+    command = commands.add_parser("rebuild-rollups", help="rebuild leave_days and the late fee ledger")
+    command.set_defaults(func=rebuild_rollups)
+
+    command = commands.add_parser("recalc-late-fees", help="recompute unpaid late fees with current settings")
+    command.add_argument("--dry-run", action="store_true")
+    add_period(command)
+    command.set_defaults(func=recalc_late_fees)
+
+    command = commands.add_parser("reconcile-ledger", help="check the late fee ledger against attendance")
+    command.add_argument("--check", action="store_true", help="report mismatches without fixing them")
+    command.set_defaults(func=reconcile_ledger)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    sys.exit(args.func(args) or 0)
+
+
+if __name__ == "__main__":
+    main()
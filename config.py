@@ -8,10 +8,52 @@ DB_CONFIG = {
     'database': 'attendance_system'
 }
 
+# Connection pool shared by every Database() in the process
+DB_POOL_NAME = "attendance_pool"
+DB_POOL_SIZE = 5
+
 # Application Settings
 APP_TITLE = "Employee Attendance System"
 APP_VERSION = "2.0.0"
 
+# Authentication
+PASSWORD_HASH_ITERATIONS = 200000   # PBKDF2 cost; tune with `python auth.py`
+AUTH_CACHE_TTL = 300                # seconds a verified login is remembered
+LOGIN_MAX_ATTEMPTS = 5              # failed attempts per username ...
+LOGIN_LOCKOUT_SECONDS = 60          # ... within this window before lockout
+
+# Kiosk clock-in mode
+KIOSK_RESET_MS = 1000       # how long a punch result stays on screen
+KIOSK_POLL_MS = 50          # how often the UI drains finished punches
+KIOSK_RATE_WINDOW = 60      # seconds used for the punches-per-minute figure
+
+# Leave screens
+LEAVE_PAGE_SIZE = 50        # leave requests fetched per page
+
+# Dashboard navigation
+VIEW_MAX_AGE = 120          # seconds before a cached view is refreshed on show
+VIEW_WIDGET_BUDGET = 4000   # widgets kept alive across hidden views before LRU eviction
+
+# Live clocks
+CLOCK_TICK_MS = 1000        # one shared timer drives every on-screen clock
+
+# Employee dashboard calendar
+MONTH_CACHE_SIZE = 12       # months kept per employee
+MONTH_CACHE_MAX_AGE = 60    # seconds before a cached month is re-queried
+
+# PDF reports
+PDF_ROWS_PER_TABLE = 30     # attendance rows per table chunk (fits one page)
+PDF_POLL_MS = 100           # how often the UI checks on a running export
+
+# CSV exports
+EXPORT_CHUNK_SIZE = 5000        # rows fetched from the server and written per chunk
+EXPORT_BUFFER_SIZE = 1 << 20    # bytes buffered before each write to disk
+EXPORT_POLL_MS = 100            # how often the export dialog checks on the worker
+
+# Headless jobs (cli.py)
+CLI_REPORT_WORKERS = None       # processes for per-employee reports (None: one per CPU)
+BATCH_REPORTS_PER_TASK = 20     # employees handed to a worker at a time (month-end batch)
+
 # User Roles
 ROLE_ADMIN = "admin"
 ROLE_EMPLOYEE = "employee"
@@ -0,0 +1,423 @@
+"""
+CSV Export Module
+Streams a query to a CSV file on a worker thread: rows come off an
+unbuffered (server-side) cursor in chunks and go through a buffered,
+optionally gzipped writer, so memory stays flat however many rows match.
+Progress and completion are posted to a queue polled by ExportDialog.
+
+Rows are written in the order of each source's unique key. A cancelled or
+failed export leaves a `<file>.part` checkpoint (last key, rows and bytes
+written); exporting the same selection to the same file again can resume
+after that key, so rows added or changed in between never shift the
+resumed part the way an OFFSET would.
+"""
+import csv
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+
+from config import EXPORT_CHUNK_SIZE, EXPORT_BUFFER_SIZE, EXPORT_POLL_MS
+from database import Database
+
+
+def format_clock(value):
+    """Clock in/out as 12-hour time ('---' when missing)"""
+    if not value:
+        return "---"
+    if hasattr(value, 'strftime'):
+        return value.strftime("%I:%M %p")
+    return str(value)
+
+
+def format_money(value):
+    return f"{float(value or 0):.2f}"
+
+
+class ExportColumn:
+    def __init__(self, label, expression, formatter=None, default=True):
+        """
+        Args:
+            expression: SQL select expression for the column
+            formatter: value -> cell text (None writes the value as-is)
+            default: ticked when the export dialog opens
+        """
+        self.label = label
+        self.expression = expression
+        self.formatter = formatter
+        self.default = default
+
+
+# Exportable tables: FROM clause, the unique key rows are ordered and resumed
+# by, and the columns the dialog offers
+EXPORT_SOURCES = {
+    'attendance': {
+        'from': "attendance a JOIN employees e ON a.employee_id = e.id",
+        'key': "a.id",
+        'columns': [
+            ExportColumn('Employee Name', "CONCAT(e.first_name, ' ', e.last_name)"),
+            ExportColumn('Department', "COALESCE(e.department, 'N/A')"),
+            ExportColumn('Date', "a.date"),
+            ExportColumn('Clock In', "a.clock_in", format_clock),
+            ExportColumn('Clock Out', "a.clock_out", format_clock),
+            ExportColumn('Status', "UPPER(COALESCE(a.status, 'absent'))"),
+            ExportColumn('Minutes Late', "COALESCE(a.minutes_late, 0)", default=False),
+            ExportColumn('Late Fee', "a.late_fee_amount", format_money, default=False),
+            ExportColumn('Employee ID', "a.employee_id", default=False),
+        ],
+    },
+    'employees': {
+        'from': "employees e",
+        'key': "e.id",
+        'columns': [
+            ExportColumn('ID', "e.id"),
+            ExportColumn('First Name', "e.first_name"),
+            ExportColumn('Last Name', "e.last_name"),
+            ExportColumn('Email', "e.email"),
+            ExportColumn('Phone', "e.phone"),
+            ExportColumn('Department', "e.department"),
+            ExportColumn('Position', "e.position"),
+            ExportColumn('Hire Date', "e.hire_date"),
+            ExportColumn('Created', "e.created_at", default=False),
+        ],
+    },
+    'leave_requests': {
+        'from': "leave_requests lr JOIN employees e ON lr.employee_id = e.id",
+        'key': "lr.id",
+        'columns': [
+            ExportColumn('ID', "lr.id"),
+            ExportColumn('Employee', "CONCAT(e.first_name, ' ', e.last_name)"),
+            ExportColumn('Department', "e.department", default=False),
+            ExportColumn('Leave Date', "lr.leave_date"),
+            ExportColumn('End Date', "COALESCE(lr.end_date, lr.leave_date)"),
+            ExportColumn('Type', "lr.leave_type"),
+            ExportColumn('Reason', "lr.reason"),
+            ExportColumn('Status', "lr.status"),
+            ExportColumn('Requested', "lr.created_at"),
+            ExportColumn('Decided', "lr.approved_at", default=False),
+        ],
+    },
+    'late_fees': {
+        'from': "late_fee_ledger l JOIN employees e ON e.id = l.employee_id",
+        'key': "l.employee_id",
+        'columns': [
+            ExportColumn('Employee ID', "e.id", default=False),
+            ExportColumn('Employee Name', "CONCAT(e.first_name, ' ', e.last_name)"),
+            ExportColumn('Department', "e.department"),
+            ExportColumn('Late Count', "l.late_count"),
+            ExportColumn('Total Fees', "l.total_fees", format_money),
+            ExportColumn('Paid', "l.paid_amount", format_money),
+            ExportColumn('Unpaid', "l.unpaid_amount", format_money),
+        ],
+    },
+}
+
+
+class CsvExport:
+    """One export run: a filtered query streamed into a CSV file"""
+
+    def __init__(self, source, columns, filename, where="", params=(), compress=False):
+        """
+        Args:
+            source: key into EXPORT_SOURCES
+            columns: the ExportColumns to write, in order
+            where: " WHERE ..." clause using the source's table aliases
+            compress: gzip the output
+        """
+        spec = EXPORT_SOURCES[source]
+        self.columns = list(columns)
+        self.filename = filename
+        self.compress = compress
+        self.params = tuple(params)
+        # The key rides along as a hidden last column so a checkpoint knows where to continue
+        key = spec['key']
+        expressions = ', '.join([c.expression for c in self.columns] + [key])
+        condition = where.strip()[len("WHERE"):].strip() if where.strip() else ""
+        self.select = f"""SELECT {expressions}
+                          FROM {spec['from']}{where}
+                          ORDER BY {key}"""
+        self.resume_select = f"""SELECT {expressions}
+                                 FROM {spec['from']}
+                                 WHERE {f"({condition}) AND " if condition else ""}{key} > %s
+                                 ORDER BY {key}"""
+        self.count_query = f"SELECT COUNT(*) as count FROM {spec['from']}{where}"
+
+        self.checkpoint_file = filename + ".part"
+        self.signature = hashlib.sha1(
+            repr((self.select, self.params, compress)).encode('utf-8')).hexdigest()
+
+        self.queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = None
+
+    # ---- checkpoints ------------------------------------------------------
+
+    def checkpoint(self):
+        """(rows, bytes, last key) written by an interrupted run of this export, or None"""
+        try:
+            with open(self.checkpoint_file, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('signature') != self.signature:
+                return None
+            if os.path.getsize(self.filename) < state['bytes']:
+                return None
+            return state['rows'], state['bytes'], state['last_key']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save_checkpoint(self, rows, last_key):
+        with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
+            json.dump({'signature': self.signature, 'rows': rows, 'last_key': last_key,
+                       'bytes': os.path.getsize(self.filename)}, f)
+
+    def clear_checkpoint(self):
+        try:
+            os.remove(self.checkpoint_file)
+        except OSError:
+            pass
+
+    # ---- worker -----------------------------------------------------------
+
+    def start(self, resume=False):
+        self.thread = threading.Thread(target=self.run, args=(resume,), daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def open_output(self, resume_bytes):
+        """Buffered text writer; a resumed export truncates to the checkpoint and appends"""
+        if resume_bytes is None:
+            mode = 'w'
+        else:
+            mode = 'a'
+            with open(self.filename, 'r+b') as f:
+                f.truncate(resume_bytes)
+        if self.compress:
+            # Appending adds a new gzip member; readers see one continuous stream
+            return gzip.open(self.filename, mode + 't', encoding='utf-8', newline='')
+        return open(self.filename, mode, encoding='utf-8', newline='', buffering=EXPORT_BUFFER_SIZE)
+
+    def format_rows(self, rows):
+        """CSV cells for fetched rows (the trailing key column dropped)"""
+        formatted = [(i, c.formatter) for i, c in enumerate(self.columns) if c.formatter]
+        if not formatted:
+            return [row[:-1] for row in rows]
+        result = []
+        for row in rows:
+            row = list(row[:-1])
+            for i, formatter in formatted:
+                row[i] = formatter(row[i])
+            result.append(row)
+        return result
+
+    def run(self, resume):
+        """Worker thread: stream the query into the file chunk by chunk"""
+        db = Database()
+        written = 0
+        last_key = None    # key of the last row fully written
+        clean = True       # False while a chunk is half-written
+        streaming = False  # True while the server still has rows for us
+        try:
+            if not db.connect():
+                raise Exception("Database unavailable")
+
+            checkpoint = self.checkpoint() if resume else None
+            count = db.execute_query(self.count_query, self.params, fetch=True)
+            total = count[0]['count'] if count else 0
+
+            if checkpoint:
+                written, resume_bytes, last_key = checkpoint
+                query, params = self.resume_select, self.params + (last_key,)
+            else:
+                resume_bytes = None
+                query, params = self.select, self.params
+            self.queue.put(('progress', written, total))
+
+            with self.open_output(resume_bytes) as out:
+                writer = csv.writer(out)
+                if not checkpoint:
+                    writer.writerow([c.label for c in self.columns])
+
+                # Unbuffered cursor: fetchmany() pulls each chunk off the socket
+                cursor = db.connection.cursor()
+                try:
+                    cursor.execute(query, params)
+                    streaming = True
+                    while not self.cancelled.is_set():
+                        rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                        if not rows:
+                            streaming = False
+                            break
+                        clean = False
+                        writer.writerows(self.format_rows(rows))
+                        clean = True
+                        written += len(rows)
+                        last_key = rows[-1][-1]
+                        self.queue.put(('progress', written, total))
+                finally:
+                    if streaming:
+                        # Drain what the server already sent so the pooled
+                        # connection goes back clean
+                        db.connection.consume_results()
+                    cursor.close()
+
+            if self.cancelled.is_set():
+                if last_key is not None:
+                    self.save_checkpoint(written, last_key)
+                else:
+                    self.clear_checkpoint()
+                self.queue.put(('cancelled', written))
+            else:
+                self.clear_checkpoint()
+                self.queue.put(('done', written))
+        except Exception as e:
+            print(f"Export error: {e}")
+            import traceback
+            traceback.print_exc()
+            try:
+                if clean and last_key is not None and os.path.exists(self.filename):
+                    self.save_checkpoint(written, last_key)
+                else:
+                    self.clear_checkpoint()
+            except OSError:
+                pass
+            self.queue.put(('error', str(e)))
+        finally:
+            db.disconnect()
+
+
+class ExportDialog:
+    """Column picker, gzip option, progress bar and cancel button for one export source"""
+
+    def __init__(self, parent, source, title, where="", params=(), file_prefix="export"):
+        self.source = source
+        self.where = where
+        self.params = params
+        self.file_prefix = file_prefix
+        self.export = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Export {title}")
+        self.window.configure(bg="white")
+        self.window.resizable(False, False)
+        self.window.transient(parent.winfo_toplevel())
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        body = tk.Frame(self.window, bg="white", padx=20, pady=15)
+        body.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(body, text=f"Export {title}", font=("Segoe UI", 14, "bold"),
+                 fg="#2c3e50", bg="white").pack(anchor="w")
+        tk.Label(body, text="Columns:", font=("Segoe UI", 10),
+                 bg="white").pack(anchor="w", pady=(10, 2))
+
+        columns_frame = tk.Frame(body, bg="white")
+        columns_frame.pack(fill=tk.X)
+        self.column_vars = []
+        for i, column in enumerate(EXPORT_SOURCES[source]['columns']):
+            var = tk.BooleanVar(value=column.default)
+            tk.Checkbutton(columns_frame, text=column.label, variable=var,
+                           font=("Segoe UI", 9), bg="white",
+                           activebackground="white").grid(row=i // 2, column=i % 2, sticky="w", padx=(0, 15))
+            self.column_vars.append((column, var))
+
+        self.compress_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(body, text="Compress (.csv.gz)", variable=self.compress_var,
+                       font=("Segoe UI", 9), bg="white",
+                       activebackground="white").pack(anchor="w", pady=(10, 0))
+
+        self.progress = ttk.Progressbar(body, mode='determinate', length=320, maximum=100)
+        self.progress.pack(fill=tk.X, pady=(15, 5))
+        self.status = tk.Label(body, text="", font=("Segoe UI", 9), fg="#7f8c8d", bg="white")
+        self.status.pack(anchor="w")
+
+        buttons = tk.Frame(body, bg="white")
+        buttons.pack(fill=tk.X, pady=(10, 0))
+        self.cancel_btn = tk.Button(buttons, text="Close", bg="#95a5a6", fg="white",
+                                    font=("Segoe UI", 10, "bold"), relief=tk.FLAT,
+                                    padx=15, pady=5, cursor="hand2", command=self.close)
+        self.cancel_btn.pack(side=tk.RIGHT, padx=(5, 0))
+        self.export_btn = tk.Button(buttons, text="📥 Export", bg="#27ae60", fg="white",
+                                    font=("Segoe UI", 10, "bold"), relief=tk.FLAT,
+                                    padx=15, pady=5, cursor="hand2", command=self.start)
+        self.export_btn.pack(side=tk.RIGHT)
+
+    def start(self):
+        columns = [column for column, var in self.column_vars if var.get()]
+        if not columns:
+            messagebox.showwarning("No Columns", "Select at least one column to export.", parent=self.window)
+            return
+
+        compress = self.compress_var.get()
+        extension = ".csv.gz" if compress else ".csv"
+        filename = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=extension,
+            filetypes=[("Gzipped CSV", "*.csv.gz") if compress else ("CSV files", "*.csv"),
+                       ("All files", "*.*")],
+            initialfile=f"{self.file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+        )
+        if not filename:
+            return
+
+        self.export = CsvExport(self.source, columns, filename, self.where, self.params, compress)
+        resume = False
+        checkpoint = self.export.checkpoint()
+        if checkpoint:
+            resume = messagebox.askyesno(
+                "Resume Export",
+                f"An earlier export to this file stopped after {checkpoint[0]} records.\n\n"
+                "Resume it? (No starts over)", parent=self.window)
+
+        self.export_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(text="Cancel", bg="#e74c3c")
+        self.status.config(text="Starting export...")
+        self.export.start(resume)
+        self.window.after(EXPORT_POLL_MS, self.poll)
+
+    def poll(self):
+        """Show worker progress on the Tk thread until the export finishes"""
+        if not self.window.winfo_exists():
+            return
+        try:
+            while True:
+                message = self.export.queue.get_nowait()
+                if message[0] == 'progress':
+                    _, done, total = message
+                    self.progress['value'] = done * 100 / total if total else 100
+                    self.status.config(text=f"Exported {done:,} of {total:,} records")
+                    continue
+
+                filename = self.export.filename
+                self.export = None
+                if message[0] == 'done':
+                    self.window.destroy()
+                    messagebox.showinfo("Success", f"Exported {message[1]} records to:\n{filename}")
+                elif message[0] == 'cancelled':
+                    self.window.destroy()
+                    messagebox.showinfo("Export Cancelled",
+                                        f"Export stopped after {message[1]} records.\n\n"
+                                        "Export the same columns to the same file to resume.")
+                else:
+                    self.export_btn.config(state=tk.NORMAL)
+                    self.cancel_btn.config(text="Close", bg="#95a5a6")
+                    self.status.config(text="Export failed")
+                    messagebox.showerror("Error", f"Failed to export: {message[1]}", parent=self.window)
+                return
+        except queue.Empty:
+            pass
+        self.window.after(EXPORT_POLL_MS, self.poll)
+
+    def close(self):
+        """Cancel a running export (its result still arrives via poll) or close the dialog"""
+        if self.export is not None:
+            self.export.cancel()
+            self.cancel_btn.config(state=tk.DISABLED, text="Cancelling...")
+        else:
+            self.window.destroy()
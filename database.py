@@ -1,49 +1,293 @@
 import mysql.connector
-from mysql.connector import Error
-from config import DB_CONFIG
+from mysql.connector import Error, pooling
+from config import DB_CONFIG, DB_POOL_NAME, DB_POOL_SIZE
+from auth import hash_password, verify_password, needs_rehash, is_hashed, login_cache
+from holiday_calendar import get_holiday_calendar
+from records import Employee, AttendanceRecord, LeaveRequest, FeeSummary, build_records
+from admin.fee_summary_index import invalidate_fee_summary_index
+from admin.attendance_analytics import invalidate_attendance_analytics
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
+import threading
+
+
+_connection_pool = None
+_process_commits = 0  # commits by every Database in this process (kiosk, workers, ...)
+_commit_lock = threading.Lock()
+
+
+def get_connection_pool(pool_size=None):
+    """
+    Return the process-wide connection pool, creating it on first use
+    
+    pool_size overrides DB_POOL_SIZE, and only when the pool is created
+    (single-connection worker processes pass 1).
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        _connection_pool = pooling.MySQLConnectionPool(
+            pool_name=DB_POOL_NAME,
+            pool_size=pool_size or DB_POOL_SIZE,
+            pool_reset_session=True,
+            **DB_CONFIG
+        )
+    return _connection_pool
+
+
+def process_commit_count():
+    """Commits made through any Database in this process; views compare it to spot stale data"""
+    return _process_commits
+
+
+def _count_commit():
+    global _process_commits
+    with _commit_lock:
+        _process_commits += 1
+
+
+def expand_leave_days(start_date, end_date=None):
+    """
+    Working days covered by a leave request (Sundays are rest days)
+
+    A single-day request always covers its own date, even on a Sunday.
+    """
+    end_date = end_date or start_date
+    days = []
+    current = start_date
+    while current <= end_date:
+        if current.weekday() != 6:
+            days.append(current)
+        current += timedelta(days=1)
+    return days or [start_date]
+
+
+def format_leave_period(request):
+    """'2025-03-10' or '2025-03-10 → 2025-03-14' for a leave request row"""
+    end_date = request.get('end_date')
+    if end_date and end_date != request['leave_date']:
+        return f"{request['leave_date']} → {end_date}"
+    return str(request['leave_date'])
+
+
+LEAVE_DAYS_INSERT = """INSERT IGNORE INTO leave_days 
+                       (leave_request_id, employee_id, leave_date, leave_type)
+                       VALUES (%s, %s, %s, %s)"""
 
 
 class Database:
     def __init__(self):
         self.connection = None
+        self.transaction_depth = 0  # >0 while inside `with db.transaction():`
+        self.commit_count = 0
+        self.rollback_count = 0
         
     def connect(self):
+        """Borrow a connection from the shared pool (no-op if already connected)"""
+        if self.is_connected():
+            return True
+        # A dropped pooled connection still holds its pool slot until close()
+        self.release_connection()
         try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
+            self.connection = get_connection_pool().get_connection()
             if self.connection.is_connected():
                 return True
         except Error as e:
             print(f"Error connecting to database: {e}")
             return False
     
+    def is_connected(self):
+        try:
+            return bool(self.connection and self.connection.is_connected())
+        except Error:
+            return False
+    
     def disconnect(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        """Return the connection to the pool"""
+        self.release_connection()
     
-    def execute_query(self, query, params=None, fetch=False):
+    def release_connection(self):
+        """close() the pooled connection, live or dropped, so its slot returns to the pool"""
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Error as e:
+                print(f"Error releasing connection: {e}")
+        self.connection = None
+    
+    def execute_query(self, query, params=None, fetch=False, row_type=None):
+        """
+        Run one statement; with fetch=True return its rows
+        
+        Rows are dicts unless `row_type` (a records.py type) is given, in
+        which case they are built straight from a tuple cursor.
+        """
         try:
-            cursor = self.connection.cursor(dictionary=True)
+            cursor = self.connection.cursor(dictionary=row_type is None)
             cursor.execute(query, params or ())
             
             if fetch:
                 result = cursor.fetchall()
+                if row_type is not None:
+                    result = build_records(row_type, cursor.column_names, result)
                 cursor.close()
                 return result
             else:
-                self.connection.commit()
+                self.commit()
                 last_id = cursor.lastrowid
                 cursor.close()
                 return last_id
         except Error as e:
             print(f"Database error: {e}")
+            if self.transaction_depth:
+                # Let transaction() roll back instead of committing a partial change
+                raise
             return None if fetch else False
     
+    def execute_many(self, query, seq_params):
+        """executemany() for bulk INSERT/UPDATE; commits unless inside a transaction"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, seq_params)
+            self.commit()
+            return cursor.rowcount
+        finally:
+            cursor.close()
+    
+    def fetch_columns(self, query, params=None, width=None):
+        """
+        Run a SELECT and return its result column-wise: [values of column 0, ...]
+        
+        Uses a tuple cursor, so no per-row dict is built. `width` gives the
+        column count for an empty result. Returns None on error.
+        """
+        try:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query, params or ())
+                rows = cursor.fetchall()
+                width = width or len(cursor.column_names)
+            finally:
+                cursor.close()
+            return [list(column) for column in zip(*rows)] if rows else [[] for _ in range(width)]
+        except Error as e:
+            print(f"Database error: {e}")
+            return None
+    
+    def commit(self):
+        """Commit now, or defer to the enclosing transaction() block"""
+        if self.transaction_depth == 0:
+            self.connection.commit()
+            self.commit_count += 1
+            _count_commit()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: statements inside the block share one commit.
+        
+        Nested blocks become savepoints, so an inner failure can be rolled
+        back without discarding the outer work. Errors propagate after the
+        rollback.
+        
+            with db.transaction():
+                db.execute_query(...)
+                db.execute_query(...)
+        """
+        depth = self.transaction_depth
+        savepoint = f"sp_{depth}"
+        cursor = self.connection.cursor()
+        if depth:
+            cursor.execute(f"SAVEPOINT {savepoint}")
+        self.transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self.transaction_depth = depth
+            if depth:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            else:
+                self.connection.rollback()
+            self.rollback_count += 1
+            raise
+        else:
+            self.transaction_depth = depth
+            if depth:
+                cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+            else:
+                self.connection.commit()
+                self.commit_count += 1
+                _count_commit()
+        finally:
+            cursor.close()
+    
+    def get_transaction_stats(self):
+        """Commit/rollback counters for instrumentation"""
+        return {
+            'commits': self.commit_count,
+            'rollbacks': self.rollback_count,
+            'in_transaction': self.transaction_depth > 0
+        }
+    
+    def execute_transaction(self, statements):
+        """Run several (query, params) statements with a single commit; roll back on error"""
+        try:
+            with self.transaction():
+                for query, params in statements:
+                    self.execute_query(query, params)
+            return True
+        except Error as e:
+            print(f"Database error (rolled back): {e}")
+            if self.transaction_depth:
+                # Nested: the enclosing unit of work must roll back as well
+                raise
+            return False
+    
     # User Authentication
     def authenticate_user(self, username, password):
-        query = "SELECT * FROM users WHERE username = %s AND password = %s"
-        result = self.execute_query(query, (username, password), fetch=True)
-        return result[0] if result else None
+        """
+        Verify a login against the stored salted hash; returns the user row without its password
+        
+        Raises Error when the lookup itself fails, so callers can tell an
+        unreachable database apart from a wrong password (None).
+        """
+        cached = login_cache.get(username, password)
+        if cached:
+            return cached
+        
+        query = "SELECT * FROM users WHERE username = %s"
+        result = self.execute_query(query, (username,), fetch=True)
+        if result is None:
+            raise Error("Could not look up the user")
+        if not result or not verify_password(password, result[0]['password']):
+            return None
+        
+        user = result[0]
+        if needs_rehash(user['password']):
+            # Migrates legacy plaintext rows and applies a changed hash cost
+            self.set_user_password(user['id'], password)
+        
+        user = {k: v for k, v in user.items() if k != 'password'}
+        login_cache.put(username, password, user)
+        return user
+    
+    def set_user_password(self, user_id, password):
+        query = "UPDATE users SET password = %s WHERE id = %s"
+        result = self.execute_query(query, (hash_password(password), user_id))
+        login_cache.invalidate()
+        return result
+    
+    def migrate_plaintext_passwords(self):
+        """Hash every users.password still stored in clear text; returns rows migrated"""
+        rows = self.execute_query("SELECT id, password FROM users", fetch=True) or []
+        migrated = 0
+        for row in rows:
+            if not is_hashed(row['password']):
+                self.execute_query("UPDATE users SET password = %s WHERE id = %s",
+                                   (hash_password(row['password']), row['id']))
+                migrated += 1
+        if migrated:
+            login_cache.invalidate()
+        return migrated
     
     # --- Employee Operations ---
     def create_employee(self, first_name, last_name, email, phone, department, position, hire_date):
@@ -69,23 +313,49 @@ class Database:
                                              department, position, emp_id))
 
     def delete_employee(self, emp_id):
-        self.execute_query("DELETE FROM users WHERE employee_id=%s", (emp_id,))
-        return self.execute_query("DELETE FROM employees WHERE id=%s", (emp_id,))
+        try:
+            with self.transaction():
+                self.execute_query("DELETE FROM users WHERE employee_id=%s", (emp_id,))
+                self.execute_query("DELETE FROM employees WHERE id=%s", (emp_id,))
+        except Error:
+            return False
+        finally:
+            login_cache.invalidate()
+        return True
 
     def get_all_employees(self):
-        query = "SELECT * FROM employees ORDER BY id DESC"
-        return self.execute_query(query, fetch=True)
+        query = """SELECT id, first_name, last_name, email, phone,
+                          department, position, hire_date, created_at
+                   FROM employees ORDER BY id DESC"""
+        return self.execute_query(query, fetch=True, row_type=Employee)
     
     def get_employee_by_id(self, employee_id):
         query = "SELECT * FROM employees WHERE id = %s"
         result = self.execute_query(query, (employee_id,), fetch=True)
         return result[0] if result else None
     
+    def get_employee_by_badge(self, badge):
+        """Resolve a kiosk badge scan (employee ID or username) to an employee"""
+        badge = str(badge).strip()
+        if not badge:
+            return None
+        # A username match wins; a numeric badge only falls back to the employee ID
+        query = """SELECT e.* FROM employees e
+                   JOIN users u ON u.employee_id = e.id
+                   WHERE u.username = %s
+                   LIMIT 1"""
+        result = self.execute_query(query, (badge,), fetch=True)
+        if result:
+            return result[0]
+        if badge.isdigit():
+            return self.get_employee_by_id(int(badge))
+        return None
+    
     # User Operations
     def create_user(self, username, password, role, employee_id=None):
         query = """INSERT INTO users (username, password, role, employee_id)
                    VALUES (%s, %s, %s, %s)"""
-        return self.execute_query(query, (username, password, role, employee_id))
+        return self.execute_query(query, (username, hash_password(password), role, employee_id))
     
     def get_all_users(self):
         query = "SELECT u.*, e.first_name, e.last_name FROM users u LEFT JOIN employees e ON u.employee_id = e.id"
@@ -95,7 +365,8 @@ class Database:
     def create_manager(self, first_name, last_name, email, phone, username, password, role="HR"):
         query = """INSERT INTO managers (first_name, last_name, email, phone, username, password, role, created_at)
                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"""
-        return self.execute_query(query, (first_name, last_name, email, phone, username, password, role, datetime.now()))
+        return self.execute_query(query, (first_name, last_name, email, phone, username,
+                                          hash_password(password), role, datetime.now()))
     
     def get_all_managers(self):
         query = "SELECT * FROM managers ORDER BY created_at DESC"
@@ -127,11 +398,12 @@ class Database:
     def clock_out(self, employee_id):
         today = date.today()
         query = """UPDATE attendance SET clock_out = %s 
-                   WHERE employee_id = %s AND date = %s AND clock_out IS NULL"""
+                   WHERE employee_id = %s AND date = %s AND clock_out IS NULL
+                     AND status IN ('present', 'late') AND clock_in IS NOT NULL"""
         cursor = self.connection.cursor()
         cursor.execute(query, (datetime.now(), employee_id, today))
         rows_affected = cursor.rowcount
-        self.connection.commit()
+        self.commit()
         cursor.close()
         
         if rows_affected > 0:
@@ -139,24 +411,29 @@ class Database:
         else:
             return False, "No active clock-in found for today"
     
+    # Exactly the AttendanceRecord fields, in order
+    ATTENDANCE_LOG_COLUMNS = """a.id, a.employee_id, a.date, a.clock_in, a.clock_out, a.status,
+                                a.minutes_late, a.late_fee_amount, a.late_fee_paid, a.created_at,
+                                e.first_name, e.last_name, e.department"""
+    
     def get_attendance_logs(self, limit=None, employee_id=None):
         if employee_id:
-            query = """SELECT a.*, e.first_name, e.last_name, e.department 
+            query = f"""SELECT {self.ATTENDANCE_LOG_COLUMNS}
                        FROM attendance a 
                        JOIN employees e ON a.employee_id = e.id 
                        WHERE a.employee_id = %s
                        ORDER BY a.date DESC, a.clock_in DESC"""
             if limit:
                 query += f" LIMIT {limit}"
-            return self.execute_query(query, (employee_id,), fetch=True)
+            return self.execute_query(query, (employee_id,), fetch=True, row_type=AttendanceRecord)
         else:
-            query = """SELECT a.*, e.first_name, e.last_name, e.department 
+            query = f"""SELECT {self.ATTENDANCE_LOG_COLUMNS}
                        FROM attendance a 
                        JOIN employees e ON a.employee_id = e.id 
                        ORDER BY a.date DESC, a.clock_in DESC"""
             if limit:
                 query += f" LIMIT {limit}"
-            return self.execute_query(query, fetch=True)
+            return self.execute_query(query, fetch=True, row_type=AttendanceRecord)
     
     def get_today_attendance_status(self, employee_id):
         today = date.today()
@@ -192,20 +469,10 @@ class Database:
             
             # On Leave Today (approved leave requests) - FIXED
             try:
-                # First, let's debug what's in the database
-                debug_query = """
-                    SELECT employee_id, leave_date, status 
-                    FROM leave_requests 
-                    WHERE leave_date = %s
-                """
-                debug_result = self.execute_query(debug_query, (today,), fetch=True)
-                print(f"DEBUG - All leave requests for today: {debug_result}")
-                
-                # Now count approved ones (case-insensitive)
                 query = """
                     SELECT COUNT(DISTINCT employee_id) as count 
-                    FROM leave_requests 
-                    WHERE leave_date = %s AND LOWER(status) = 'approved'
+                    FROM leave_days 
+                    WHERE leave_date = %s
                 """
                 result = self.execute_query(query, (today,), fetch=True)
                 stats['on_leave'] = result[0]['count'] if result else 0
@@ -262,9 +529,8 @@ class Database:
             leave_query = """
                 SELECT leave_date as date,
                        COUNT(*) as on_leave
-                FROM leave_requests
+                FROM leave_days
                 WHERE leave_date >= DATE_SUB(CURDATE(), INTERVAL %s DAY)
-                AND status = 'Approved'
                 GROUP BY leave_date
                 ORDER BY leave_date ASC
             """
@@ -315,9 +581,8 @@ class Database:
             leave_query = """
                 SELECT WEEK(leave_date, 1) as week_num,
                        COUNT(*) as on_leave
-                FROM leave_requests
+                FROM leave_days
                 WHERE leave_date >= DATE_SUB(CURDATE(), INTERVAL %s WEEK)
-                AND status = 'Approved'
                 GROUP BY WEEK(leave_date, 1)
             """
             leave_result = self.execute_query(leave_query, (weeks,), fetch=True)
@@ -407,199 +672,262 @@ class Database:
 
     # --- Get Upcoming Holidays ---
     def get_upcoming_holidays(self, limit=5):
-        """Get upcoming holidays"""
+        """Get upcoming holidays (recurring ones included) from the shared holiday calendar"""
         try:
-            query = """
-                SELECT id, name, DATE_FORMAT(holiday_date, '%d-%b') as date
-                FROM holidays
-                WHERE holiday_date >= CURDATE()
-                ORDER BY holiday_date ASC
-                LIMIT %s
-            """
-            result = self.execute_query(query, (limit,), fetch=True)
-            print(f"DEBUG - Holidays fetched: {result}")
-            return result if result else []
-        except Exception as e:
-            print(f"ERROR fetching holidays: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
-    
-    # --- Get Upcoming Holidays ---
-    def get_upcoming_holidays(self, limit=5):
-        """Get upcoming holidays"""
-        try:
-            query = """
-                SELECT id, name, DATE_FORMAT(holiday_date, '%d-%b') as date
-                FROM holidays
-                WHERE holiday_date >= CURDATE()
-                ORDER BY holiday_date ASC
-                LIMIT %s
-            """
-            result = self.execute_query(query, (limit,), fetch=True)
-            
-            if result:
-                data = [{'name': row['name'], 'date': row['date']} for row in result]
-                return data
-            else:
-                return []
+            holidays = get_holiday_calendar(self).upcoming(limit)
+            return [{'id': holiday['id'], 'name': holiday['name'], 'date': day.strftime('%d-%b')}
+                    for day, holiday in holidays]
         except Exception as e:
             print(f"Error fetching holidays: {e}")
             return []
     
     # ==================== LEAVE MANAGEMENT METHODS ====================
     
-    def create_leave_request(self, employee_id, leave_date, leave_type, reason):
-        """Create a new leave request"""
+    def create_leave_request(self, employee_id, leave_date, leave_type, reason, end_date=None):
+        """Create a new leave request (end_date for a multi-day range, inclusive)"""
         try:
+            if end_date == leave_date:
+                end_date = None
             query = """INSERT INTO leave_requests 
-                       (employee_id, leave_date, leave_type, reason, status, created_at)
-                       VALUES (%s, %s, %s, %s, 'Pending', %s)"""
-            result = self.execute_query(query, (employee_id, leave_date, leave_type, reason, datetime.now()))
+                       (employee_id, leave_date, end_date, leave_type, reason, status, created_at)
+                       VALUES (%s, %s, %s, %s, %s, 'Pending', %s)"""
+            result = self.execute_query(query, (employee_id, leave_date, end_date, leave_type, reason,
+                                                datetime.now()))
             return result is not False
         except Exception as e:
             print(f"Error creating leave request: {e}")
             return False
     
-    def get_employee_leave_requests(self, employee_id):
-        """Get all leave requests for a specific employee"""
+    LEAVE_REQUEST_COLUMNS = """
+        lr.id, lr.employee_id,
+        CONCAT(e.first_name, ' ', e.last_name) as employee_name,
+        lr.leave_date, lr.end_date, lr.leave_type, lr.reason, lr.status,
+        DATE_FORMAT(lr.created_at, '%Y-%m-%d %H:%i') as created_at,
+        DATE_FORMAT(lr.approved_at, '%Y-%m-%d %H:%i') as approved_at
+    """
+    
+    def leave_request_filters(self, status=None, employee_id=None, start_date=None, end_date=None):
+        """WHERE clause and params shared by query_leave_requests and count_leave_requests"""
+        clauses = []
+        params = []
+        if status:
+            clauses.append("lr.status = %s")
+            params.append(status)
+        if employee_id:
+            clauses.append("lr.employee_id = %s")
+            params.append(employee_id)
+        if start_date:
+            # Ranges overlapping [start_date, end_date]
+            clauses.append("COALESCE(lr.end_date, lr.leave_date) >= %s")
+            params.append(start_date)
+        if end_date:
+            clauses.append("lr.leave_date <= %s")
+            params.append(end_date)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+    
+    def query_leave_requests(self, status=None, employee_id=None, start_date=None, end_date=None,
+                             limit=None, offset=0):
+        """
+        Leave requests with employee names, newest first
+        
+        Args:
+            status: 'Pending' / 'Approved' / 'Rejected' (None for all)
+            employee_id: only this employee's requests
+            start_date, end_date: only requests overlapping this period
+            limit, offset: page window (limit=None returns every match)
+        """
+        where, params = self.leave_request_filters(status, employee_id, start_date, end_date)
+        query = f"""
+            SELECT {self.LEAVE_REQUEST_COLUMNS}
+            FROM leave_requests lr
+            INNER JOIN employees e ON lr.employee_id = e.id
+            {where}
+            ORDER BY lr.created_at DESC, lr.id DESC
+        """
+        if limit is not None:
+            query += " LIMIT %s OFFSET %s"
+            params += [limit, offset]
         try:
-            query = """
-                SELECT id, leave_date, leave_type, reason, status,
-                       DATE_FORMAT(created_at, '%Y-%m-%d %H:%i') as created_at,
-                       DATE_FORMAT(approved_at, '%Y-%m-%d %H:%i') as approved_at
-                FROM leave_requests 
-                WHERE employee_id = %s 
-                ORDER BY created_at DESC
-            """
-            return self.execute_query(query, (employee_id,), fetch=True) or []
+            return self.execute_query(query, tuple(params), fetch=True, row_type=LeaveRequest) or []
         except Exception as e:
-            print(f"Error fetching employee leave requests: {e}")
+            print(f"Error fetching leave requests: {e}")
             return []
     
-    def get_pending_leave_requests(self):
-        """Get all pending leave requests with employee details"""
+    def count_leave_requests(self, status=None, employee_id=None, start_date=None, end_date=None):
+        """Number of rows query_leave_requests would return without a limit"""
+        where, params = self.leave_request_filters(status, employee_id, start_date, end_date)
+        query = f"SELECT COUNT(*) as count FROM leave_requests lr{where}"
         try:
-            query = """
-                SELECT lr.id, lr.employee_id,
-                       CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                       lr.leave_date, lr.leave_type, lr.reason, lr.status,
-                       DATE_FORMAT(lr.created_at, '%Y-%m-%d %H:%i') as created_at
-                FROM leave_requests lr
-                INNER JOIN employees e ON lr.employee_id = e.id
-                WHERE lr.status = 'Pending'
-                ORDER BY lr.created_at DESC
-            """
-            return self.execute_query(query, fetch=True) or []
+            result = self.execute_query(query, tuple(params), fetch=True)
+            return result[0]['count'] if result else 0
         except Exception as e:
-            print(f"Error fetching pending leave requests: {e}")
-            return []
+            print(f"Error counting leave requests: {e}")
+            return 0
     
-    def get_all_leave_requests(self):
-        """Get all leave requests with employee details"""
+    def get_leave_status_counts(self, employee_id=None):
+        """
+        Leave request counts by status in one aggregate
+        
+        Returns:
+            dict: {'Pending': n, 'Approved': n, 'Rejected': n, 'All': n}
+        """
+        counts = {'Pending': 0, 'Approved': 0, 'Rejected': 0}
+        query = "SELECT status, COUNT(*) as count FROM leave_requests"
+        params = ()
+        if employee_id:
+            query += " WHERE employee_id = %s"
+            params = (employee_id,)
+        query += " GROUP BY status"
         try:
-            query = """
-                SELECT lr.id, lr.employee_id,
-                       CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                       lr.leave_date, lr.leave_type, lr.reason, lr.status,
-                       DATE_FORMAT(lr.created_at, '%Y-%m-%d %H:%i') as created_at,
-                       DATE_FORMAT(lr.approved_at, '%Y-%m-%d %H:%i') as approved_at
-                FROM leave_requests lr
-                INNER JOIN employees e ON lr.employee_id = e.id
-                ORDER BY lr.created_at DESC
-            """
-            return self.execute_query(query, fetch=True) or []
+            for row in self.execute_query(query, params, fetch=True) or []:
+                status = (row['status'] or '').capitalize()
+                counts[status] = counts.get(status, 0) + row['count']
         except Exception as e:
-            print(f"Error fetching all leave requests: {e}")
-            return []
+            print(f"Error counting leave requests by status: {e}")
+        counts['All'] = sum(counts.values())
+        return counts
+    
+    def get_employee_leave_requests(self, employee_id):
+        """Get all leave requests for a specific employee"""
+        return self.query_leave_requests(employee_id=employee_id)
+    
+    def get_pending_leave_requests(self):
+        """Get all pending leave requests with employee details"""
+        return self.query_leave_requests(status='Pending')
+    
+    def get_all_leave_requests(self):
+        """Get all leave requests with employee details"""
+        return self.query_leave_requests()
     
     def get_approved_leave_requests(self):
         """Get all approved leave requests"""
-        try:
-            query = """
-                SELECT lr.id, lr.employee_id,
-                       CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                       lr.leave_date, lr.leave_type, lr.reason, lr.status,
-                       DATE_FORMAT(lr.created_at, '%Y-%m-%d %H:%i') as created_at,
-                       DATE_FORMAT(lr.approved_at, '%Y-%m-%d %H:%i') as approved_at
-                FROM leave_requests lr
-                INNER JOIN employees e ON lr.employee_id = e.id
-                WHERE lr.status = 'Approved'
-                ORDER BY lr.leave_date DESC
-            """
-            return self.execute_query(query, fetch=True) or []
-        except Exception as e:
-            print(f"Error fetching approved leave requests: {e}")
-            return []
+        return self.query_leave_requests(status='Approved')
     
     def get_rejected_leave_requests(self):
         """Get all rejected leave requests"""
-        try:
-            query = """
-                SELECT lr.id, lr.employee_id,
-                       CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                       lr.leave_date, lr.leave_type, lr.reason, lr.status,
-                       DATE_FORMAT(lr.created_at, '%Y-%m-%d %H:%i') as created_at,
-                       DATE_FORMAT(lr.approved_at, '%Y-%m-%d %H:%i') as approved_at
-                FROM leave_requests lr
-                INNER JOIN employees e ON lr.employee_id = e.id
-                WHERE lr.status = 'Rejected'
-                ORDER BY lr.created_at DESC
-            """
-            return self.execute_query(query, fetch=True) or []
-        except Exception as e:
-            print(f"Error fetching rejected leave requests: {e}")
-            return []
+        return self.query_leave_requests(status='Rejected')
     
     def approve_leave_request(self, leave_id, admin_id):
         """Approve a leave request and mark attendance as leave"""
+        return self.approve_leave_requests([leave_id], admin_id) > 0
+    
+    def approve_leave_requests(self, leave_ids, admin_id):
+        """
+        Approve many pending leave requests in one transaction
+        
+        Updates their status with one UPDATE, expands each approved range
+        into leave_days and upserts the matching attendance rows.
+        
+        Returns:
+            int: number of requests approved (0 on failure)
+        """
+        if not leave_ids:
+            return 0
+        
+        placeholders = ", ".join(["%s"] * len(leave_ids))
+        approved_at = datetime.now().replace(microsecond=0)
+        
+        update_query = f"""UPDATE leave_requests 
+                          SET status = 'Approved', approved_by = %s, approved_at = %s 
+                          WHERE id IN ({placeholders}) AND status = 'Pending'"""
+        
+        # Exactly the rows approved above
+        approved_query = f"""
+            SELECT id, employee_id, leave_date, end_date, leave_type
+            FROM leave_requests
+            WHERE id IN ({placeholders}) AND status = 'Approved'
+              AND approved_by = %s AND approved_at = %s
+        """
+        attendance_query = """
+            INSERT INTO attendance (employee_id, date, status, leave_type, clock_in)
+            VALUES (%s, %s, 'leave', %s, NULL)
+            ON DUPLICATE KEY UPDATE 
+                status = 'leave', 
+                leave_type = VALUES(leave_type)
+        """
         try:
-            # Get leave request details
-            query = "SELECT employee_id, leave_date, leave_type FROM leave_requests WHERE id = %s"
-            leave_data = self.execute_query(query, (leave_id,), fetch=True)
-            
-            if not leave_data:
-                return False
-            
-            leave_info = leave_data[0]
-            
-            # Update leave request status
-            update_query = """UPDATE leave_requests 
-                            SET status = 'Approved', approved_by = %s, approved_at = %s 
-                            WHERE id = %s"""
-            self.execute_query(update_query, (admin_id, datetime.now(), leave_id))
-            
-            # Mark attendance as leave
-            attendance_query = """
-                INSERT INTO attendance (employee_id, date, status, leave_type, clock_in)
-                VALUES (%s, %s, 'leave', %s, NULL)
-                ON DUPLICATE KEY UPDATE 
-                    status = 'leave', 
-                    leave_type = %s
-            """
-            self.execute_query(attendance_query, (
-                leave_info['employee_id'],
-                leave_info['leave_date'],
-                leave_info['leave_type'],
-                leave_info['leave_type']
-            ))
-            
-            return True
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute(update_query, (admin_id, approved_at, *leave_ids))
+                approved = cursor.rowcount
+                cursor.close()
+                if approved:
+                    rows = self.execute_query(approved_query, (*leave_ids, admin_id, approved_at),
+                                              fetch=True) or []
+                    day_rows = self.leave_day_rows(rows)
+                    if day_rows:
+                        self.execute_many(LEAVE_DAYS_INSERT, day_rows)
+                        self.execute_many(attendance_query,
+                                          [(emp, day, leave_type) for _, emp, day, leave_type in day_rows])
+            if approved:
+                invalidate_attendance_analytics()
+            return approved
         except Exception as e:
-            print(f"Error approving leave request: {e}")
-            return False
+            print(f"Error approving leave requests: {e}")
+            return 0
+    
+    @staticmethod
+    def leave_day_rows(requests):
+        """(leave_request_id, employee_id, leave_date, leave_type) for every day the requests cover"""
+        return [(req['id'], req['employee_id'], day, req['leave_type'])
+                for req in requests
+                for day in expand_leave_days(req['leave_date'], req.get('end_date'))]
+    
+    def rebuild_leave_days(self):
+        """Re-expand every approved request into leave_days; returns the number of day rows"""
+        try:
+            with self.transaction():
+                rows = self.execute_query("""
+                    SELECT id, employee_id, leave_date, end_date, leave_type
+                    FROM leave_requests
+                    WHERE status = 'Approved'
+                """, fetch=True) or []
+                day_rows = self.leave_day_rows(rows)
+                self.execute_query("DELETE FROM leave_days")
+                if day_rows:
+                    self.execute_many(LEAVE_DAYS_INSERT, day_rows)
+            return len(day_rows)
+        except Exception as e:
+            print(f"Error rebuilding leave days: {e}")
+            return 0
     
     def reject_leave_request(self, leave_id, admin_id, rejection_reason=""):
         """Reject a leave request"""
+        return self.reject_leave_requests([leave_id], admin_id, rejection_reason) > 0
+    
+    def reject_leave_requests(self, leave_ids, admin_id, rejection_reason=""):
+        """Reject many pending leave requests with one UPDATE; returns the number rejected"""
+        if not leave_ids:
+            return 0
+        
+        placeholders = ", ".join(["%s"] * len(leave_ids))
+        query = f"""UPDATE leave_requests 
+                   SET status = 'Rejected', approved_by = %s, approved_at = %s
+                   WHERE id IN ({placeholders}) AND status = 'Pending'"""
         try:
-            query = """UPDATE leave_requests 
-                       SET status = 'Rejected', approved_by = %s, approved_at = %s
-                       WHERE id = %s"""
-            result = self.execute_query(query, (admin_id, datetime.now(), leave_id))
-            return result is not False
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute(query, (admin_id, datetime.now(), *leave_ids))
+                rejected = cursor.rowcount
+                cursor.close()
+            return rejected
         except Exception as e:
-            print(f"Error rejecting leave request: {e}")
-            return False
+            print(f"Error rejecting leave requests: {e}")
+            return 0
+    
+    def get_leave_requests_by_ids(self, leave_ids):
+        """Current status rows for the given leave requests (used for partial refreshes)"""
+        if not leave_ids:
+            return []
+        placeholders = ", ".join(["%s"] * len(leave_ids))
+        query = f"""
+            SELECT lr.id, lr.status,
+                   DATE_FORMAT(lr.approved_at, '%Y-%m-%d %H:%i') as approved_at
+            FROM leave_requests lr
+            WHERE lr.id IN ({placeholders})
+        """
+        return self.execute_query(query, tuple(leave_ids), fetch=True) or []
     
     def get_leaves_for_date(self, target_date):
         """Get all employees on leave for a specific date"""
@@ -608,9 +936,10 @@ class Database:
                 SELECT lr.id, lr.employee_id,
                        CONCAT(e.first_name, ' ', e.last_name) as employee_name,
                        lr.leave_type, lr.reason
-                FROM leave_requests lr
-                INNER JOIN employees e ON lr.employee_id = e.id
-                WHERE lr.leave_date = %s AND lr.status = 'Approved'
+                FROM leave_days ld
+                INNER JOIN leave_requests lr ON ld.leave_request_id = lr.id
+                INNER JOIN employees e ON ld.employee_id = e.id
+                WHERE ld.leave_date = %s
             """
             return self.execute_query(query, (target_date,), fetch=True) or []
         except Exception as e:
@@ -623,19 +952,79 @@ class Database:
             if year is None:
                 year = datetime.now().year
             
-            query = """
-                SELECT COUNT(*) as leave_count
-                FROM leave_requests
-                WHERE employee_id = %s 
-                    AND status = 'Approved'
-                    AND YEAR(leave_date) = %s
-            """
-            result = self.execute_query(query, (employee_id, year), fetch=True)
-            return result[0]['leave_count'] if result else 0
+            return self.count_leave_days(employee_id, date(year, 1, 1), date(year, 12, 31))
         except Exception as e:
             print(f"Error fetching employee leave count: {e}")
             return 0
     
+    def count_leave_days(self, employee_id, start_date=None, end_date=None):
+        """Approved leave days for an employee, optionally within [start_date, end_date]"""
+        query = "SELECT COUNT(*) as leave_count FROM leave_days WHERE employee_id = %s"
+        params = [employee_id]
+        if start_date:
+            query += " AND leave_date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND leave_date <= %s"
+            params.append(end_date)
+        result = self.execute_query(query, tuple(params), fetch=True)
+        return result[0]['leave_count'] if result else 0
+    
+    def get_leave_days(self, employee_id, start_date, end_date):
+        """Approved leave days for an employee in [start_date, end_date], one row per day"""
+        query = """
+            SELECT leave_date, leave_type, leave_request_id
+            FROM leave_days
+            WHERE employee_id = %s AND leave_date BETWEEN %s AND %s
+            ORDER BY leave_date
+        """
+        return self.execute_query(query, (employee_id, start_date, end_date), fetch=True) or []
+    
+    def get_leave_dates(self, employee_id, start_date=None, end_date=None):
+        """Set of approved leave dates for an employee (for absence computation)"""
+        query = "SELECT leave_date FROM leave_days WHERE employee_id = %s"
+        params = [employee_id]
+        if start_date:
+            query += " AND leave_date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND leave_date <= %s"
+            params.append(end_date)
+        rows = self.execute_query(query, tuple(params), fetch=True) or []
+        return {row['leave_date'] for row in rows}
+    
+    def get_leave_calendar(self, employee_id, start_date, end_date):
+        """
+        Leave status per day for a calendar range
+        
+        Approved days come from leave_days; pending and rejected requests
+        overlapping the range are expanded here (they are never indexed).
+        Both are read in one query.
+        
+        Returns:
+            dict: {date: {'status': ..., 'leave_type': ...}}
+        """
+        calendar = {}
+        query = """
+            SELECT leave_date, leave_date AS end_date, leave_type, 'Approved' AS status
+            FROM leave_days
+            WHERE employee_id = %s AND leave_date BETWEEN %s AND %s
+            UNION ALL
+            SELECT leave_date, end_date, leave_type, status
+            FROM leave_requests
+            WHERE employee_id = %s AND status <> 'Approved'
+              AND leave_date <= %s AND COALESCE(end_date, leave_date) >= %s
+        """
+        params = (employee_id, start_date, end_date, employee_id, end_date, start_date)
+        rows = self.execute_query(query, params, fetch=True) or []
+        
+        # Approved days win over any pending/rejected request on the same day
+        for req in sorted(rows, key=lambda r: r['status'] == 'Approved'):
+            for day in expand_leave_days(req['leave_date'], req['end_date']):
+                if start_date <= day <= end_date:
+                    calendar[day] = {'status': req['status'], 'leave_type': req['leave_type']}
+        return calendar
+    
     # ==================== END LEAVE MANAGEMENT METHODS ====================
     
     # OLD LEAVE REQUEST OPERATIONS (Keep for compatibility if needed)
@@ -661,26 +1050,13 @@ class Database:
         return self.execute_query(query, (status, leave_id))
     
     def fetch_all_employees(self):
-        employees = self.get_all_employees()
-        formatted_data = []
-        if employees:
-            for emp in employees:
-                display_id = emp.get('Emp_ID') if emp.get('Emp_ID') else str(emp['id'])
-                
-                row = (
-                    display_id,
-                    emp['first_name'],
-                    emp['last_name'],
-                    emp['email'],
-                    emp.get('phone', '---'),
-                    emp['department'],
-                    emp['position'],
-                    str(emp['hire_date']) if emp['hire_date'] else "---",
-                    emp['id']
-                )
-                formatted_data.append(row)
-        
-        return formatted_data
+        """Employees as treeview value tuples (display id first, real id last)"""
+        return [(str(emp.id), emp.first_name, emp.last_name, emp.email,
+                 emp.phone,
+                 emp.department, emp.position,
+                 str(emp.hire_date) if emp.hire_date else "---",
+                 emp.id)
+                for emp in self.get_all_employees() or []]
     
 # ==================== LATE FEE METHODS ====================
     # Copy and paste this inside your Database class in database.py
@@ -702,19 +1078,46 @@ class Database:
         
         clock_in_time = datetime.now()
         
-        # Insert attendance record
+        # Insert attendance record and apply the late fee in one commit
         query = """INSERT INTO attendance (employee_id, clock_in, date, status)
                    VALUES (%s, %s, %s, 'present')"""
-        attendance_id = self.execute_query(query, (employee_id, clock_in_time, today))
-        
-        if attendance_id:
-            # Calculate and process late fee
-            calculator = LateFeeCalculator(self)
-            late_result = calculator.process_late_attendance(attendance_id, employee_id, clock_in_time)
-            
-            return True, late_result['message'], late_result
-        else:
+        try:
+            with self.transaction():
+                attendance_id = self.execute_query(query, (employee_id, clock_in_time, today))
+                calculator = LateFeeCalculator(self)
+                late_result = calculator.process_late_attendance(attendance_id, employee_id, clock_in_time)
+        except Exception as e:
+            print(f"Clock-in failed (rolled back): {e}")
             return False, "Failed to clock in", None
+        
+        invalidate_fee_summary_index()
+        return True, late_result['message'], late_result
+
+    def toggle_clock(self, employee_id):
+        """Clock in (with late fee) or clock out, whichever is due today.
+        
+        Returns:
+            dict: {'success': bool, 'action': 'in'|'out'|None, 'message': str, 'late_result': dict|None}
+        """
+        # Only a real clock-in counts; approved-leave rows have no clock_in
+        query = """SELECT * FROM attendance
+                   WHERE employee_id = %s AND date = %s
+                     AND status IN ('present', 'late') AND clock_in IS NOT NULL"""
+        result = self.execute_query(query, (employee_id, date.today()), fetch=True)
+        today_status = result[0] if result else None
+        
+        if today_status and today_status['clock_out'] is None:
+            success, message = self.clock_out(employee_id)
+            return {'success': success, 'action': 'out' if success else None,
+                    'message': message, 'late_result': None}
+        
+        if today_status:
+            return {'success': False, 'action': None,
+                    'message': "Attendance already completed today", 'late_result': None}
+        
+        success, message, late_result = self.clock_in_with_late_fee(employee_id)
+        return {'success': success, 'action': 'in' if success else None,
+                'message': message, 'late_result': late_result}
 
     def get_employee_late_fees(self, employee_id):
         """Get all late fees for an employee"""
@@ -737,19 +1140,119 @@ class Database:
         return self.execute_query(query, fetch=True)
 
     def get_admin_fee_summary(self):
-        """Get late fee summary for all employees (For Admin Dashboard)"""
+        """Get late fee summary for all employees (For Admin Dashboard) from the ledger"""
         query = """SELECT e.id, CONCAT(e.first_name, ' ', e.last_name) as name,
                         e.department,
-                        COUNT(CASE WHEN a.late_fee_amount > 0 THEN 1 END) as late_count,
-                        COALESCE(SUM(a.late_fee_amount), 0) as total_fees,
-                        COALESCE(SUM(CASE WHEN a.late_fee_paid = 1 THEN a.late_fee_amount ELSE 0 END), 0) as paid,
-                        COALESCE(SUM(CASE WHEN a.late_fee_paid = 0 OR a.late_fee_paid IS NULL THEN a.late_fee_amount ELSE 0 END), 0) as unpaid
-                FROM employees e
-                LEFT JOIN attendance a ON e.id = a.employee_id
-                GROUP BY e.id, e.first_name, e.last_name, e.department
-                HAVING late_count > 0
-                ORDER BY total_fees DESC"""
-        return self.execute_query(query, fetch=True)
+                        l.late_count,
+                        l.total_fees,
+                        l.paid_amount as paid,
+                        l.unpaid_amount as unpaid
+                FROM late_fee_ledger l
+                JOIN employees e ON e.id = l.employee_id
+                WHERE l.late_count > 0
+                ORDER BY l.total_fees DESC"""
+        return self.execute_query(query, fetch=True, row_type=FeeSummary)
+
+    # --- Late Fee Ledger ---
+    # One balance row per employee, kept in step with attendance by the
+    # statements below so fee screens never aggregate raw attendance.
+
+    def ledger_charge_statement(self, employee_id, amount):
+        """(query, params) adding a new unpaid late fee to an employee's ledger row"""
+        query = """INSERT INTO late_fee_ledger
+                       (employee_id, late_count, unpaid_count, total_fees, paid_amount, unpaid_amount)
+                   VALUES (%s, 1, 1, %s, 0, %s)
+                   ON DUPLICATE KEY UPDATE
+                       late_count = late_count + 1,
+                       unpaid_count = unpaid_count + 1,
+                       total_fees = total_fees + VALUES(total_fees),
+                       unpaid_amount = unpaid_amount + VALUES(unpaid_amount)"""
+        return query, (employee_id, float(amount), float(amount))
+
+    def ledger_payment_statement(self, attendance_ids):
+        """
+        (query, params) moving the given fees from unpaid to paid in the ledger.
+        Must run before late_fee_paid is flipped; already-paid rows are ignored.
+        """
+        placeholders = ", ".join(["%s"] * len(attendance_ids))
+        query = f"""UPDATE late_fee_ledger l
+                    JOIN (SELECT employee_id,
+                                 COUNT(*) as fee_count,
+                                 SUM(late_fee_amount) as amount
+                          FROM attendance
+                          WHERE id IN ({placeholders})
+                            AND late_fee_amount > 0
+                            AND (late_fee_paid = 0 OR late_fee_paid IS NULL)
+                          GROUP BY employee_id) p ON p.employee_id = l.employee_id
+                    SET l.unpaid_count = l.unpaid_count - p.fee_count,
+                        l.paid_amount = l.paid_amount + p.amount,
+                        l.unpaid_amount = l.unpaid_amount - p.amount"""
+        return query, tuple(attendance_ids)
+
+    def get_fee_ledger(self, employee_id):
+        """O(1) late fee balances for one employee"""
+        query = """SELECT late_count, unpaid_count, total_fees, paid_amount, unpaid_amount
+                   FROM late_fee_ledger WHERE employee_id = %s"""
+        result = self.execute_query(query, (employee_id,), fetch=True)
+        row = result[0] if result else {}
+        return {
+            'late_count': row.get('late_count') or 0,
+            'unpaid_count': row.get('unpaid_count') or 0,
+            'total_fees': float(row.get('total_fees') or 0),
+            'paid_amount': float(row.get('paid_amount') or 0),
+            'unpaid_amount': float(row.get('unpaid_amount') or 0)
+        }
+
+    def reconcile_fee_ledger(self, fix=True):
+        """
+        Verify the ledger against raw attendance rows
+
+        Args:
+            fix: rewrite mismatched ledger rows from the raw totals
+
+        Returns:
+            list: employee_ids whose ledger row did not match
+        """
+        raw_query = """SELECT employee_id,
+                              COUNT(*) as late_count,
+                              SUM(CASE WHEN late_fee_paid = 1 THEN 0 ELSE 1 END) as unpaid_count,
+                              SUM(late_fee_amount) as total_fees,
+                              SUM(CASE WHEN late_fee_paid = 1 THEN late_fee_amount ELSE 0 END) as paid_amount,
+                              SUM(CASE WHEN late_fee_paid = 1 THEN 0 ELSE late_fee_amount END) as unpaid_amount
+                       FROM attendance
+                       WHERE late_fee_amount > 0
+                       GROUP BY employee_id"""
+        raw_rows = self.execute_query(raw_query, fetch=True) or []
+        ledger_rows = self.execute_query("SELECT * FROM late_fee_ledger", fetch=True) or []
+
+        fields = ('late_count', 'unpaid_count', 'total_fees', 'paid_amount', 'unpaid_amount')
+
+        def totals(row):
+            return tuple(round(float(row.get(f) or 0), 2) for f in fields)
+
+        raw = {row['employee_id']: totals(row) for row in raw_rows}
+        ledger = {row['employee_id']: totals(row) for row in ledger_rows}
+        empty = totals({})
+
+        mismatched = [emp_id for emp_id in set(raw) | set(ledger)
+                      if raw.get(emp_id, empty) != ledger.get(emp_id, empty)]
+
+        if mismatched:
+            print(f"Late fee ledger mismatch for employees: {sorted(mismatched)}")
+            if fix:
+                upsert = """INSERT INTO late_fee_ledger
+                                (employee_id, late_count, unpaid_count, total_fees, paid_amount, unpaid_amount)
+                            VALUES (%s, %s, %s, %s, %s, %s)
+                            ON DUPLICATE KEY UPDATE
+                                late_count = VALUES(late_count),
+                                unpaid_count = VALUES(unpaid_count),
+                                total_fees = VALUES(total_fees),
+                                paid_amount = VALUES(paid_amount),
+                                unpaid_amount = VALUES(unpaid_amount)"""
+                self.execute_transaction([(upsert, (emp_id,) + raw.get(emp_id, empty))
+                                          for emp_id in mismatched])
+                invalidate_fee_summary_index()
+        return mismatched
 
     def get_late_fee_settings(self):
         """Get current late fee settings"""
@@ -771,23 +1274,63 @@ class Database:
 
 
     def process_payment(self, attendance_id, employee_id, amount):
-        """Record a payment and mark attendance as paid"""
-        try:
-            # 1. Record the payment
-            payment_query = """
-                INSERT INTO late_fee_payments 
-                (attendance_id, employee_id, amount_paid, payment_date) 
-                VALUES (%s, %s, %s, NOW())
-            """
-            self.execute_query(payment_query, (attendance_id, employee_id, amount))
+        """Record a payment, mark attendance as paid and update the ledger in one transaction"""
+        return self.process_payments_batch(employee_id, [(attendance_id, amount)])
 
-            # 2. Mark the attendance record as 'paid'
-            update_query = "UPDATE attendance SET late_fee_paid = 1 WHERE id = %s"
-            self.execute_query(update_query, (attendance_id,))
-            
+    def process_payments_batch(self, employee_id, payments, method='Cash', notes=''):
+        """
+        Pay several late fees atomically
+
+        Args:
+            employee_id: ID of the paying employee
+            payments: list of (attendance_id, amount) tuples
+            method: payment method recorded on every row
+
+        Returns:
+            bool: True if every fee was recorded; nothing is changed otherwise
+                  (including when a fee is already paid or belongs to someone else)
+        """
+        if not payments:
+            return False
+
+        attendance_ids = [attendance_id for attendance_id, _ in payments]
+        now = datetime.now()
+        payment_query = """INSERT INTO late_fee_payments 
+                          (attendance_id, employee_id, amount_paid, payment_date, payment_method, notes, created_at)
+                          VALUES (%s, %s, %s, %s, %s, %s, %s)"""
+        payment_rows = [(attendance_id, employee_id, float(amount), now.date(), method, notes, now)
+                        for attendance_id, amount in payments]
+        ledger_query, ledger_params = self.ledger_payment_statement(attendance_ids)
+        placeholders = ", ".join(["%s"] * len(attendance_ids))
+        update_query = f"""UPDATE attendance SET late_fee_paid = 1
+                           WHERE id IN ({placeholders}) AND employee_id = %s
+                             AND (late_fee_paid = 0 OR late_fee_paid IS NULL)"""
+
+        try:
+            with self.transaction():
+                self.execute_many(payment_query, payment_rows)
+                self.execute_query(ledger_query, ledger_params)
+                cursor = self.connection.cursor()
+                try:
+                    cursor.execute(update_query, (*attendance_ids, employee_id))
+                    updated = cursor.rowcount
+                finally:
+                    cursor.close()
+                if updated != len(set(attendance_ids)):
+                    raise ValueError(f"{len(set(attendance_ids)) - updated} fee(s) already paid "
+                                     f"or not owed by employee {employee_id}")
+            invalidate_fee_summary_index()
             return True
-        except Exception as e:
-            print(f"Payment Error: {e}")
+        except (Error, ValueError) as e:
+            print(f"Payment Error (rolled back): {e}")
             return False
 
+    def export_payroll(self, directory, first_month, last_month=None, fmt=None, datasets=None, progress=None):
+        """
+        Write attendance, monthly late-fee totals and payments as month-partitioned
+        Parquet (or NumPy .npz) files; see payroll_export.export_payroll
+        """
+        from payroll_export import export_payroll
+        return export_payroll(self, directory, first_month, last_month, fmt, datasets, progress)
+
     # ==================== END LATE FEE METHODS ====================
\ No newline at end of file
@@ -2,6 +2,18 @@
 import mysql.connector
 from mysql.connector import Error
 from config import DB_CONFIG
+from auth import hash_password, is_hashed
+from database import Database
+
+def ensure_index(cursor, table, index_name, columns):
+    """Add an index to a table created by an older setup if it is missing"""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (DB_CONFIG['database'], table, index_name))
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table} ADD INDEX {index_name} {columns}")
+        print(f"Index '{index_name}' added to '{table}'")
 
 def setup_database():
     """Create database and tables if they don't exist"""
@@ -76,15 +88,103 @@ def setup_database():
         """)
         print("Table 'departments' created successfully")
         
+        # Create late fee ledger (per-employee balances maintained on charge/payment)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS late_fee_ledger (
+                employee_id INT PRIMARY KEY,
+                late_count INT NOT NULL DEFAULT 0,
+                unpaid_count INT NOT NULL DEFAULT 0,
+                total_fees DECIMAL(12, 2) NOT NULL DEFAULT 0,
+                paid_amount DECIMAL(12, 2) NOT NULL DEFAULT 0,
+                unpaid_amount DECIMAL(12, 2) NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE
+            )
+        """)
+        print("Table 'late_fee_ledger' created successfully")
+        
+        # Create holidays table (recurring holidays repeat every year on the same day)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS holidays (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(150) NOT NULL,
+                holiday_date DATE NOT NULL,
+                is_recurring TINYINT(1) NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                KEY idx_holidays_date (holiday_date)
+            )
+        """)
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'holidays' AND COLUMN_NAME = 'is_recurring'
+        """, (DB_CONFIG['database'],))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("ALTER TABLE holidays ADD COLUMN is_recurring TINYINT(1) NOT NULL DEFAULT 0")
+            print("Column 'holidays.is_recurring' added")
+        print("Table 'holidays' created successfully")
+        
+        # Create leave requests table (end_date is NULL for single-day requests)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS leave_requests (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                employee_id INT NOT NULL,
+                leave_date DATE NOT NULL,
+                end_date DATE NULL,
+                leave_type VARCHAR(50),
+                reason TEXT,
+                status VARCHAR(20) DEFAULT 'Pending',
+                approved_by INT,
+                approved_at DATETIME,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                KEY idx_leave_requests_employee (employee_id, leave_date),
+                KEY idx_leave_requests_employee_created (employee_id, created_at),
+                KEY idx_leave_requests_status_created (status, created_at),
+                FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE
+            )
+        """)
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = 'leave_requests' AND COLUMN_NAME = 'end_date'
+        """, (DB_CONFIG['database'],))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("ALTER TABLE leave_requests ADD COLUMN end_date DATE NULL AFTER leave_date")
+            print("Column 'leave_requests.end_date' added")
+        ensure_index(cursor, 'leave_requests', 'idx_leave_requests_employee_created',
+                     '(employee_id, created_at)')
+        ensure_index(cursor, 'leave_requests', 'idx_leave_requests_status_created',
+                     '(status, created_at)')
+        print("Table 'leave_requests' created successfully")
+        
+        # Create leave days (one row per approved leave day, maintained on approval)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS leave_days (
+                leave_request_id INT NOT NULL,
+                employee_id INT NOT NULL,
+                leave_date DATE NOT NULL,
+                leave_type VARCHAR(50),
+                PRIMARY KEY (employee_id, leave_date, leave_request_id),
+                KEY idx_leave_days_date (leave_date),
+                FOREIGN KEY (leave_request_id) REFERENCES leave_requests(id) ON DELETE CASCADE
+            )
+        """)
+        print("Table 'leave_days' created successfully")
+        
         # Insert default admin if not exists
         cursor.execute("SELECT * FROM users WHERE username = 'admin'")
         if not cursor.fetchone():
             cursor.execute("""
                 INSERT INTO users (username, password, role) 
-                VALUES ('admin', 'admin123', 'admin')
-            """)
+                VALUES ('admin', %s, 'admin')
+            """, (hash_password('admin123'),))
             print("Default admin user created (username: admin, password: admin123)")
         
+        # Migrate any plaintext passwords to salted hashes
+        cursor.execute("SELECT id, password FROM users")
+        plaintext = [(hash_password(pw), uid) for uid, pw in cursor.fetchall() if not is_hashed(pw)]
+        if plaintext:
+            cursor.executemany("UPDATE users SET password = %s WHERE id = %s", plaintext)
+            print(f"Hashed {len(plaintext)} plaintext password(s)")
+        
         # Insert sample departments
         departments = ['IT', 'HR', 'Finance', 'Sales', 'Marketing', 'Operations']
         for dept in departments:
@@ -95,6 +195,14 @@ def setup_database():
         cursor.close()
         connection.close()
         
+        # Backfill / verify the late fee ledger against existing attendance
+        db = Database()
+        if db.connect():
+            mismatched = db.reconcile_fee_ledger(fix=True)
+            print(f"Late fee ledger reconciled ({len(mismatched)} employee(s) corrected)")
+            print(f"Leave days rebuilt ({db.rebuild_leave_days()} day(s))")
+            db.disconnect()
+        
         print("\n✓ Database setup completed successfully!")
         return True
         
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import messagebox, Canvas
 from datetime import datetime
 import math
+from tick_scheduler import get_tick_scheduler
 
 class AttendanceView:
     def __init__(self, parent_frame, db, employee):
@@ -83,7 +84,14 @@ class AttendanceView:
             # No record yet today
             self.create_ready_status(status_section)
 
-        self.update_clock()
+        # Driven by the shared tick; cancelled when the canvas is destroyed
+        self.clock_token = get_tick_scheduler(self.clock_canvas).subscribe(self.clock_canvas, self.update_clock)
+
+    def on_show(self):
+        self.clock_token = get_tick_scheduler(self.clock_canvas).subscribe(self.clock_canvas, self.update_clock)
+
+    def on_hide(self):
+        get_tick_scheduler(self.clock_canvas).unsubscribe(self.clock_token)
 
     # ====================== CLOCK FACE ===========================
     def draw_clock_face(self):
@@ -119,42 +127,34 @@ class AttendanceView:
 
             self.clock_canvas.create_text(x, y, text=str(hour), font=("Segoe UI", 16, "bold"), fill="#374151")
 
+        # Hands are created once and moved with coords() on every tick
+        self.hands = {
+            'hour': self.clock_canvas.create_line(center, center, center, center, fill="#1F2937",
+                                                  width=8, capstyle=tk.ROUND),
+            'minute': self.clock_canvas.create_line(center, center, center, center, fill="#3B82F6",
+                                                    width=6, capstyle=tk.ROUND),
+            'second': self.clock_canvas.create_line(center, center, center, center, fill="#EF4444",
+                                                    width=3, capstyle=tk.ROUND),
+        }
+
     # ====================== CLOCK UPDATE ===========================
-    def update_clock(self):
-        try:
-            now = datetime.now()
-
-            self.clock_canvas.delete("hands")
-            center = 175
-
-            hours = now.hour % 12
-            minutes = now.minute
-            seconds = now.second
-
-            hour_angle = math.radians((hours * 30 + minutes * 0.5) - 90)
-            hour_x = center + 60 * math.cos(hour_angle)
-            hour_y = center + 60 * math.sin(hour_angle)
-            self.clock_canvas.create_line(center, center, hour_x, hour_y,
-                                          fill="#1F2937", width=8, tags="hands", capstyle=tk.ROUND)
-
-            minute_angle = math.radians((minutes * 6) - 90)
-            minute_x = center + 85 * math.cos(minute_angle)
-            minute_y = center + 85 * math.sin(minute_angle)
-            self.clock_canvas.create_line(center, center, minute_x, minute_y,
-                                          fill="#3B82F6", width=6, tags="hands", capstyle=tk.ROUND)
-
-            second_angle = math.radians((seconds * 6) - 90)
-            second_x = center + 105 * math.cos(second_angle)
-            second_y = center + 105 * math.sin(second_angle)
-            self.clock_canvas.create_line(center, center, second_x, second_y,
-                                          fill="#EF4444", width=3, tags="hands", capstyle=tk.ROUND)
-
-            self.digital_time.config(text=now.strftime("%I:%M:%S %p"))
-            self.date_label.config(text=now.strftime("%A, %B %d, %Y"))
-
-            self.parent_frame.after(1000, self.update_clock)
-        except Exception:
-            pass # Handle window close
+    def update_clock(self, now):
+        center = 175
+
+        hours = now.hour % 12
+        minutes = now.minute
+        seconds = now.second
+
+        for hand, degrees, length in (('hour', hours * 30 + minutes * 0.5, 60),
+                                      ('minute', minutes * 6, 85),
+                                      ('second', seconds * 6, 105)):
+            angle = math.radians(degrees - 90)
+            self.clock_canvas.coords(self.hands[hand], center, center,
+                                     center + length * math.cos(angle),
+                                     center + length * math.sin(angle))
+
+        self.digital_time.config(text=now.strftime("%I:%M:%S %p"))
+        self.date_label.config(text=now.strftime("%A, %B %d, %Y"))
 
     # ====================== STATUS TEMPLATES ===========================
     def create_completed_status(self, parent, today_status):
@@ -362,29 +362,30 @@ class EmployeeLateFeesView:
             
             try:
                if is_pay_all:
-                # Process all fees
-                success_count = 0
+                # Pay every listed fee in one transaction (all or nothing)
+                payments = []
                 for item in self.tree.get_children():
                     values = self.tree.item(item)['values']
-                    item_fee_id = values[0]
                     amount_str = str(values[4]).replace('₱', '').replace(',', '')
-                    fee_amount = float(amount_str)
-                    if self.db.process_payment(item_fee_id, self.employee_id, paid_amount):  # ✅ Changed fee_amount to paid_amount
-                        success_count += 1
+                    payments.append((values[0], float(amount_str)))
+                
+                if self.db.process_payments_batch(self.employee_id, payments, method):
+                    msg = f"Payment Successful!\n\n"
+                    msg += f"Payment Method: {method}\n"
+                    msg += f"Total Paid: ₱{paid_amount:.2f}\n"
+                    msg += f"Amount Due: ₱{amount:.2f}\n"
+                    msg += f"Change: ₱{change:.2f}\n"
+                    msg += f"Fees Paid: {len(payments)}"
                     
-                    if success_count > 0:
-                        msg = f"Payment Successful!\n\n"
-                        msg += f"Payment Method: {method}\n"
-                        msg += f"Total Paid: ₱{paid_amount:.2f}\n"
-                        msg += f"Amount Due: ₱{amount:.2f}\n"
-                        msg += f"Change: ₱{change:.2f}\n"
-                        msg += f"Fees Paid: {success_count}"
-                        
-                        messagebox.showinfo("Success", msg, parent=dialog)
-                        dialog.destroy()
-                        self.load_data()
+                    messagebox.showinfo("Success", msg, parent=dialog)
+                    dialog.destroy()
+                    self.load_data()
+                else:
+                    messagebox.showerror("Error", 
+                                       "Payment processing failed. No fees were marked as paid.",
+                                       parent=dialog)
                else:
-                    if self.db.process_payment(fee_id, self.employee_id, paid_amount):  # ✅ Changed amount to paid_amount
+                    if self.db.process_payments_batch(self.employee_id, [(fee_id, amount)], method):
                         msg = f"Payment Successful!\n\n"
                         msg += f"Payment Method: {method}\n"
                         msg += f"Amount Paid: ₱{paid_amount:.2f}\n"
@@ -440,7 +441,6 @@ class EmployeeLateFeesView:
                     print(f"Available keys: {unpaid_fees[0].keys()}")
             print("="*50 + "\n")
             
-            total_unpaid = 0
             unpaid_count = 0
             
             if unpaid_fees and len(unpaid_fees) > 0:
@@ -502,7 +502,6 @@ class EmployeeLateFeesView:
                     
                     print(f"Final time_str: {time_str}")
                     
-                    total_unpaid += amount
                     unpaid_count += 1
                     
                     tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
@@ -518,8 +517,10 @@ class EmployeeLateFeesView:
                 self.tree.pack_forget()
                 self.empty_frame.pack(fill=tk.BOTH, expand=True)
             
-            self.unpaid_amount_label.config(text=f"₱{total_unpaid:,.2f}")
-            self.instances_label.config(text=str(unpaid_count))
+            # Summary cards read the ledger balance instead of re-summing rows
+            ledger = self.db.get_fee_ledger(self.employee_id)
+            self.unpaid_amount_label.config(text=f"₱{ledger['unpaid_amount']:,.2f}")
+            self.instances_label.config(text=str(ledger['unpaid_count']))
             
             if unpaid_count == 0:
                 self.status_badge.config(text="All clear", bg="#D1FAE5", fg="#065F46")
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, date
-from config import COLORS
+from config import COLORS, LEAVE_PAGE_SIZE
+from database import format_leave_period
+from employee.month_cache import get_month_cache
 
 class LeaveRequestView:
     def __init__(self, parent_frame, db, employee):
@@ -34,24 +36,20 @@ class LeaveRequestView:
         stats_frame = tk.Frame(self.parent, bg=COLORS['bg_main'])
         stats_frame.pack(fill=tk.X, pady=(0, 20))
         
-        # Get statistics
-        current_year = datetime.now().year
-        total_leaves = self.db.get_employee_leave_count(self.employee['id'], current_year)
-        pending_requests = len([r for r in self.db.get_employee_leave_requests(self.employee['id']) 
-                               if r['status'] == 'Pending'])
-        
         # Total Leaves This Year Card
         total_card = tk.Frame(stats_frame, bg="#d1ecf1", relief=tk.RAISED, bd=2)
         total_card.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
         tk.Label(total_card, text="📅", font=("Arial", 30),
                 bg="#d1ecf1").pack(pady=(15, 5))
-        tk.Label(total_card, text=f"Total Leaves {current_year}",
-                font=("Arial", 11), bg="#d1ecf1",
-                fg="#0c5460").pack()
-        tk.Label(total_card, text=str(total_leaves),
-                font=("Arial", 24, "bold"), bg="#d1ecf1",
-                fg="#0c5460").pack(pady=(5, 15))
+        self.total_title_label = tk.Label(total_card, text="Total Leaves",
+                                          font=("Arial", 11), bg="#d1ecf1",
+                                          fg="#0c5460")
+        self.total_title_label.pack()
+        self.total_leaves_label = tk.Label(total_card, text="0",
+                                           font=("Arial", 24, "bold"), bg="#d1ecf1",
+                                           fg="#0c5460")
+        self.total_leaves_label.pack(pady=(5, 15))
         
         # Pending Requests Card
         pending_card = tk.Frame(stats_frame, bg="#fff3cd", relief=tk.RAISED, bd=2)
@@ -62,9 +60,12 @@ class LeaveRequestView:
         tk.Label(pending_card, text="Pending Requests",
                 font=("Arial", 11), bg="#fff3cd",
                 fg="#856404").pack()
-        tk.Label(pending_card, text=str(pending_requests),
-                font=("Arial", 24, "bold"), bg="#fff3cd",
-                fg="#856404").pack(pady=(5, 15))
+        self.pending_count_label = tk.Label(pending_card, text="0",
+                                            font=("Arial", 24, "bold"), bg="#fff3cd",
+                                            fg="#856404")
+        self.pending_count_label.pack(pady=(5, 15))
+        
+        self.refresh_stats()
     
     def create_leave_form(self):
         """Create the leave request submission form"""
@@ -102,6 +103,19 @@ class LeaveRequestView:
         self.date_entry.bind('<FocusIn>', self.clear_date_placeholder)
         self.date_entry.bind('<FocusOut>', self.restore_date_placeholder)
         
+        # End Date (optional, for multi-day leave)
+        tk.Label(left_col, text="End Date (optional)", 
+                font=("Arial", 10, "bold"),
+                bg=COLORS['bg_white'],
+                fg=COLORS['text_dark']).pack(anchor=tk.W, pady=(0, 5))
+        self.end_date_entry = tk.Entry(left_col, font=("Arial", 11), 
+                                       relief=tk.SOLID, bd=1)
+        self.end_date_entry.pack(fill=tk.X, pady=(0, 10), ipady=6)
+        self.end_date_entry.insert(0, "YYYY-MM-DD")
+        self.end_date_entry.config(fg='gray')
+        self.end_date_entry.bind('<FocusIn>', self.clear_date_placeholder)
+        self.end_date_entry.bind('<FocusOut>', self.restore_date_placeholder)
+        
         # Leave Type
         tk.Label(left_col, text="Leave Type *", 
                 font=("Arial", 10, "bold"),
@@ -168,20 +182,21 @@ class LeaveRequestView:
         refresh_btn.bind("<Leave>", lambda e: refresh_btn.config(bg=COLORS['primary']))
     
     def clear_date_placeholder(self, event):
-        if self.date_entry.get() == "YYYY-MM-DD":
-            self.date_entry.delete(0, tk.END)
-            self.date_entry.config(fg='black')
+        if event.widget.get() == "YYYY-MM-DD":
+            event.widget.delete(0, tk.END)
+            event.widget.config(fg='black')
     
     def restore_date_placeholder(self, event):
-        if not self.date_entry.get():
-            self.date_entry.insert(0, "YYYY-MM-DD")
-            self.date_entry.config(fg='gray')
+        if not event.widget.get():
+            event.widget.insert(0, "YYYY-MM-DD")
+            event.widget.config(fg='gray')
     
     def clear_form(self):
         """Clear all form fields"""
-        self.date_entry.delete(0, tk.END)
-        self.date_entry.insert(0, "YYYY-MM-DD")
-        self.date_entry.config(fg='gray')
+        for entry in (self.date_entry, self.end_date_entry):
+            entry.delete(0, tk.END)
+            entry.insert(0, "YYYY-MM-DD")
+            entry.config(fg='gray')
         self.leave_type.set("Sick Leave")
         self.reason_text.delete("1.0", tk.END)
     
@@ -239,7 +254,7 @@ class LeaveRequestView:
         self.tree.heading("Status", text="Status")
         self.tree.heading("Submitted", text="Submitted On")
         
-        self.tree.column("Date", width=120, anchor=tk.CENTER)
+        self.tree.column("Date", width=190, anchor=tk.CENTER)
         self.tree.column("Type", width=140, anchor=tk.W)
         self.tree.column("Reason", width=300, anchor=tk.W)
         self.tree.column("Status", width=120, anchor=tk.CENTER)
@@ -254,11 +269,22 @@ class LeaveRequestView:
         self.tree.tag_configure('pending', background='#fff3cd')
         self.tree.tag_configure('approved', background='#d4edda')
         self.tree.tag_configure('rejected', background='#f8d7da')
+        
+        # Older requests are fetched a page at a time
+        self.more_btn = tk.Button(history_frame, text="Load Older Requests",
+                                 font=("Arial", 10),
+                                 command=self.load_more_requests,
+                                 cursor="hand2",
+                                 relief=tk.FLAT,
+                                 padx=15,
+                                 pady=4)
+        self.more_btn.pack(pady=(0, 15))
     
     def submit_leave_request(self):
         """Submit a new leave request"""
         # Get form values
         leave_date = self.date_entry.get()
+        end_date = self.end_date_entry.get().strip()
         leave_type = self.leave_type.get()
         reason = self.reason_text.get("1.0", tk.END).strip()
         
@@ -287,15 +313,31 @@ class LeaveRequestView:
             messagebox.showerror("Error", "Leave date cannot be in the past")
             return
         
+        # Optional end date for a multi-day range
+        if end_date in ("", "YYYY-MM-DD"):
+            end_date = None
+        else:
+            try:
+                end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
+            except ValueError:
+                messagebox.showerror("Error", "Invalid end date format. Please use YYYY-MM-DD")
+                return
+            if end_date_obj < leave_date_obj:
+                messagebox.showerror("Error", "End date cannot be before the leave date")
+                return
+        
         # Submit to database
         success = self.db.create_leave_request(
             self.employee['id'],
             leave_date,
             leave_type,
-            reason
+            reason,
+            end_date
         )
         
         if success:
+            # The dashboard calendar shows pending requests
+            get_month_cache(self.employee['id']).invalidate()
             messagebox.showinfo("Success", "Leave request submitted successfully!")
             self.clear_form()
             self.load_leave_requests()
@@ -303,20 +345,36 @@ class LeaveRequestView:
         else:
             messagebox.showerror("Error", "Failed to submit leave request")
     
+    def refresh(self):
+        """Reload history and stats in place"""
+        self.load_leave_requests()
+        self.refresh_stats()
+    
     def load_leave_requests(self):
-        """Load employee's leave requests into the table"""
+        """Load the newest page of the employee's leave requests into the table"""
         # Clear existing items
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Get leave requests from database
-        requests = self.db.get_employee_leave_requests(self.employee['id'])
+        self.loaded_rows = 0
+        self.total_rows = self.db.count_leave_requests(employee_id=self.employee['id'])
         
-        if not requests:
+        if not self.total_rows:
             # Show "No data" message
             self.tree.insert("", tk.END, values=("", "No leave requests found", "", "", ""))
+            self.more_btn.config(state=tk.DISABLED)
             return
         
+        self.load_more_requests()
+    
+    def load_more_requests(self):
+        """Append the next page of older requests"""
+        requests = self.db.query_leave_requests(employee_id=self.employee['id'],
+                                                limit=LEAVE_PAGE_SIZE,
+                                                offset=self.loaded_rows)
+        self.loaded_rows += len(requests)
+        self.more_btn.config(state=tk.NORMAL if self.loaded_rows < self.total_rows else tk.DISABLED)
+        
         # Populate table
         for req in requests:
             # Truncate long reasons
@@ -330,7 +388,7 @@ class LeaveRequestView:
             
             self.tree.insert("", tk.END, 
                            values=(
-                               req['leave_date'],
+                               format_leave_period(req),
                                req['leave_type'],
                                reason,
                                status,
@@ -339,21 +397,10 @@ class LeaveRequestView:
                            tags=(tag,))
     
     def refresh_stats(self):
-        """Refresh the statistics cards"""
-        # Find and destroy stats frame
-        for widget in self.parent.winfo_children():
-            if isinstance(widget, tk.Frame):
-                # Check if it's the stats frame (second frame from top)
-                children = self.parent.winfo_children()
-                if children.index(widget) == 1:  # Stats frame is at index 1
-                    widget.destroy()
-                    break
-        
-        # Recreate stats at the correct position
-        self.create_stats_cards()
-        
-        # Reorder widgets to maintain correct layout
-        children = self.parent.winfo_children()
-        if len(children) >= 2:
-            children[1].pack_forget()
-            children[1].pack(after=children[0], fill=tk.X, pady=(0, 20))
\ No newline at end of file
+        """Refresh the statistics cards in place"""
+        current_year = datetime.now().year
+        total_leaves = self.db.get_employee_leave_count(self.employee['id'], current_year)
+        pending_requests = self.db.get_leave_status_counts(self.employee['id'])['Pending']
+        self.total_title_label.config(text=f"Total Leaves {current_year}")
+        self.total_leaves_label.config(text=str(total_leaves))
+        self.pending_count_label.config(text=str(pending_requests))
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Month Cache Module
+Per-employee LRU of calendar months for the employee dashboard (attendance,
+leave status and holidays per day). The months either side of the one on
+screen are loaded on a worker thread, so paging the calendar is served
+from memory.
+"""
+import calendar
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from config import MONTH_CACHE_SIZE, MONTH_CACHE_MAX_AGE
+from database import Database
+from holiday_calendar import get_holiday_calendar
+
+_caches = {}
+_lock = threading.Lock()
+
+
+def month_bounds(year, month):
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def shift_month(year, month, delta):
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def load_month(db, employee_id, year, month):
+    """Query one month of calendar data for an employee"""
+    first_day, last_day = month_bounds(year, month)
+    rows = db.execute_query("""
+        SELECT DATE(date) as date, status, clock_in, clock_out
+        FROM attendance
+        WHERE employee_id = %s AND date >= %s AND date < %s + INTERVAL 1 DAY
+    """, (employee_id, first_day, last_day), fetch=True) or []
+
+    return {
+        'loaded_at': time.monotonic(),
+        'attendance': {row['date']: row for row in rows},
+        'leaves': db.get_leave_calendar(employee_id, first_day, last_day),
+        'holidays': dict(get_holiday_calendar(db).between(first_day, last_day)),
+    }
+
+
+class MonthCache:
+    def __init__(self, employee_id, size=MONTH_CACHE_SIZE):
+        self.employee_id = employee_id
+        self.size = size
+        self.months = OrderedDict()  # (year, month) -> month data, oldest first
+        self.loading = set()         # months a prefetch worker is fetching
+        self.lock = threading.Lock()
+
+    def _fresh(self, key):
+        data = self.months.get(key)
+        if data is not None and time.monotonic() - data['loaded_at'] < MONTH_CACHE_MAX_AGE:
+            return data
+        return None
+
+    def _store(self, key, data):
+        with self.lock:
+            self.months[key] = data
+            self.months.move_to_end(key)
+            while len(self.months) > self.size:
+                self.months.popitem(last=False)
+
+    def get(self, db, year, month):
+        """Month data from the cache, querying on a miss"""
+        key = (year, month)
+        with self.lock:
+            data = self._fresh(key)
+            if data is not None:
+                self.months.move_to_end(key)
+                return data
+        data = load_month(db, self.employee_id, year, month)
+        self._store(key, data)
+        return data
+
+    def prefetch(self, year, month, radius=1):
+        """Load the months around (year, month) in the background"""
+        keys = []
+        with self.lock:
+            for delta in range(-radius, radius + 1):
+                key = shift_month(year, month, delta)
+                if delta and key not in self.loading and self._fresh(key) is None:
+                    self.loading.add(key)
+                    keys.append(key)
+        if keys:
+            threading.Thread(target=self._load_in_background, args=(keys,), daemon=True).start()
+
+    def _load_in_background(self, keys):
+        """Worker thread: fetch on its own pooled connection"""
+        db = Database()
+        try:
+            if db.connect():
+                for key in keys:
+                    self._store(key, load_month(db, self.employee_id, *key))
+        except Exception as e:
+            print(f"Error prefetching calendar months: {e}")
+        finally:
+            with self.lock:
+                self.loading.difference_update(keys)
+            db.disconnect()
+
+    def invalidate(self, year=None, month=None):
+        """Forget one month (e.g. after a clock in/out) or all of them"""
+        with self.lock:
+            if year is None:
+                self.months.clear()
+            else:
+                self.months.pop((year, month), None)
+
+
+def get_month_cache(employee_id):
+    """Return the shared month cache for an employee"""
+    with _lock:
+        cache = _caches.get(employee_id)
+        if cache is None:
+            cache = _caches[employee_id] = MonthCache(employee_id)
+        return cache
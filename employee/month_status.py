@@ -0,0 +1,100 @@
+"""
+Month Status Module
+Per-day attendance status and the month's KPIs for one employee, computed
+in a single pass from one month of attendance, leave and holiday data.
+The dashboard calendar and KPI cards both read the same result, so a day
+is never counted differently in the two.
+
+This stays plain Python: a month is at most 31 days, too small for NumPy
+(an optional dependency, used by the whole-table admin analytics and the
+payroll export) to pay for itself.
+"""
+import calendar
+from datetime import date
+
+# Calendar label, background and text colour per day status
+STATUS_STYLES = {
+    'rest': ("Rest Day", "#F3F4F6", "#6B7280"),
+    'holiday': ("Holiday", "#E0E7FF", "#3730A3"),
+    'leave': ("On Leave", "#F3E8FF", "#6B21A8"),
+    'pending': ("Pending REQ", "#FEF3C7", "#92400E"),
+    'rejected': ("Rejected", "#FEE2E2", "#991B1B"),
+    'present': ("Present", "#DBEAFE", "#1E40AF"),
+    'late': ("Late", "#FEF3C7", "#92400E"),
+    'absent': ("Absent", "#FEE2E2", "#991B1B"),
+}
+
+LEAVE_STATUSES = {'Approved': 'leave', 'Pending': 'pending', 'Rejected': 'rejected'}
+
+
+class MonthStatus:
+    def __init__(self, year, month, attendance, leaves, holidays, hire_date=None, today=None):
+        """
+        Args:
+            attendance: {date: attendance row} for the month
+            leaves: {date: {'status', 'leave_type'}} from Database.get_leave_calendar
+            holidays: holiday dates in the month (a set or a {date: holiday} dict)
+            hire_date: days before it get no status and are not counted
+        """
+        today = today or date.today()
+        self.year = year
+        self.month = month
+        self.statuses = []  # one per day of the month, None where nothing is shown
+        self.present = 0
+        self.late = 0
+        self.absent = 0
+        self.leave = 0
+        self.working_days = 0
+        self.hours = 0.0
+
+        for day in range(1, calendar.monthrange(year, month)[1] + 1):
+            day_date = date(year, month, day)
+            status = None
+
+            if hire_date and day_date < hire_date:
+                pass
+            elif day_date.weekday() == 6:
+                status = 'rest'
+            elif day_date in holidays:
+                # Shown for future dates too
+                status = 'holiday'
+            elif day_date <= today:
+                self.working_days += 1
+                row = attendance.get(day_date)
+                leave = leaves.get(day_date)
+
+                if row and row['clock_in'] and row['clock_out']:
+                    self.hours += (row['clock_out'] - row['clock_in']).total_seconds() / 3600
+
+                if leave and leave['status'] == 'Approved':
+                    status = 'leave'
+                    self.leave += 1
+                else:
+                    # No record for a past working day counts as absent
+                    worked = row['status'] if row else 'absent'
+                    if worked == 'present':
+                        self.present += 1
+                    elif worked == 'late':
+                        self.late += 1
+                    else:
+                        self.absent += 1
+                    if leave:
+                        status = LEAVE_STATUSES.get(leave['status'])
+                    elif worked in STATUS_STYLES:
+                        status = worked
+
+            self.statuses.append(status)
+
+    def style(self, day):
+        """(label, background, foreground) for a day of the month, or None"""
+        return STATUS_STYLES.get(self.statuses[day - 1])
+
+    def kpis(self):
+        return {
+            'present': self.present + self.late,  # Total days present (including late)
+            'late': self.late,
+            'absent': self.absent,
+            'leave': self.leave,
+            'working_days': self.working_days,
+            'hours': self.hours,
+        }
@@ -0,0 +1,215 @@
+"""
+Report Batch Module
+Month-end run: one attendance report per employee for a calendar month.
+
+Everything the reports need is read up front in a handful of set-based
+queries (employees, the month's attendance, the month's leave days and
+the holiday calendar), grouped by employee, and handed to a process pool
+in slices of BATCH_REPORTS_PER_TASK. Workers never touch the database;
+they only lay out PDFs, reusing one set of reportlab styles per process.
+
+Output goes to <out>/attendance_<YYYY-MM>_<run timestamp>/ together with
+a manifest.json listing every report, failures and the throughput.
+"""
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from config import BATCH_REPORTS_PER_TASK, CLI_REPORT_WORKERS
+from holiday_calendar import get_holiday_calendar
+from payroll_export import month_days
+from records import DailyLog
+
+
+def employee_filter(departments=None, employee_ids=None):
+    """WHERE fragment on employees alias `e` for the selected staff, and its params"""
+    clause = ""
+    params = []
+    if departments:
+        clause += f" AND e.department IN ({','.join(['%s'] * len(departments))})"
+        params.extend(departments)
+    if employee_ids:
+        clause += f" AND e.id IN ({','.join(['%s'] * len(employee_ids))})"
+        params.extend(employee_ids)
+    return clause, params
+
+
+def select_employees(db, departments=None, employee_ids=None):
+    clause, params = employee_filter(departments, employee_ids)
+    query = f"""SELECT e.id, e.first_name, e.last_name, e.department, e.hire_date
+                FROM employees e WHERE 1=1{clause} ORDER BY e.id"""
+    return db.execute_query(query, tuple(params), fetch=True) or []
+
+
+def prefetch_month(db, year, month, departments=None, employee_ids=None):
+    """
+    Load one month of report data for the selected employees
+
+    Returns:
+        (employees, logs by employee id, leave dates by employee id), or
+        None if a query failed
+    """
+    first_day, last_day = month_days(year, month)
+    clause, params = employee_filter(departments, employee_ids)
+
+    employees = select_employees(db, departments, employee_ids)
+    logs = db.execute_query(f"""
+        SELECT a.employee_id, DATE(a.date) as date, a.clock_in, a.clock_out, a.status
+        FROM attendance a
+        JOIN employees e ON e.id = a.employee_id
+        WHERE a.date BETWEEN %s AND %s{clause}
+        ORDER BY a.employee_id, a.date DESC
+    """, (first_day, last_day, *params), fetch=True, row_type=DailyLog)
+    leave_rows = db.execute_query(f"""
+        SELECT ld.employee_id, ld.leave_date
+        FROM leave_days ld
+        JOIN employees e ON e.id = ld.employee_id
+        WHERE ld.leave_date BETWEEN %s AND %s{clause}
+    """, (first_day, last_day, *params), fetch=True)
+    if logs is None or leave_rows is None:
+        return None
+
+    logs_by_employee = {}
+    for log in logs:
+        logs_by_employee.setdefault(log.employee_id, []).append(log)
+    leave_by_employee = {}
+    for row in leave_rows:
+        leave_by_employee.setdefault(row['employee_id'], set()).add(row['leave_date'])
+    return employees, logs_by_employee, leave_by_employee
+
+
+# ---- worker side ------------------------------------------------------------
+
+def failed_entry(employee, error):
+    """Manifest entry for an employee whose report was not written"""
+    return {'employee_id': employee['id'],
+            'name': employee.get('full_name') or f"{employee['first_name']} {employee['last_name']}",
+            'department': employee['department'], 'file': None, 'rows': 0, 'error': error}
+
+
+_holidays = None
+
+
+def init_batch_worker(holidays):
+    """Each worker receives the holiday calendar once, not with every task"""
+    global _holidays
+    _holidays = holidays
+
+
+def render_reports(jobs, out_dir, fmt, year, month):
+    """
+    Worker process: write the reports for a slice of employees
+
+    Args:
+        jobs: [(employee, logs, leave_dates), ...] already prefetched
+
+    Returns:
+        list: one manifest entry per employee
+    """
+    from employee.report_builder import (kpis_from, report_records, report_filename,
+                                         write_employee_pdf, write_employee_csv)
+
+    first_day, last_day = month_days(year, month)
+    period = f"{first_day:%B %Y}"
+    results = []
+    for employee, logs, leave_dates in jobs:
+        employee = dict(employee, full_name=f"{employee['first_name']} {employee['last_name']}")
+        entry = failed_entry(employee, None)
+        try:
+            kpis = kpis_from(logs, len(leave_dates), employee, _holidays, first_day, last_day)
+            records = report_records(logs, employee, leave_dates, _holidays, first_day, last_day)
+
+            filename = report_filename(employee, fmt)
+            if fmt == "pdf":
+                write_employee_pdf(os.path.join(out_dir, filename), employee, kpis, records, period)
+            else:
+                write_employee_csv(os.path.join(out_dir, filename), employee, kpis, records, period)
+            entry.update(file=filename, rows=len(records),
+                         kpis=dict(kpis, rate=round(kpis['rate'], 1)))
+        except Exception as e:
+            entry['error'] = str(e)
+        results.append(entry)
+    return results
+
+
+# ---- driver -----------------------------------------------------------------
+
+def generate_month_reports(db, out_root, year, month, departments=None, employee_ids=None,
+                           fmt="pdf", workers=None, progress=None):
+    """
+    Write one report per selected employee for a month
+
+    Args:
+        db: connected Database (used only for the prefetch)
+        out_root: parent of the dated run directory
+        progress: optional callback(done, total, entry) as reports finish
+
+    Returns:
+        dict: the manifest, or None if the prefetch failed
+    """
+    started = time.perf_counter()
+    prefetched = prefetch_month(db, year, month, departments, employee_ids)
+    if prefetched is None:
+        return None
+    employees, logs_by_employee, leave_by_employee = prefetched
+    holidays = get_holiday_calendar(db)
+
+    out_dir = os.path.join(out_root, f"attendance_{year}-{month:02d}_{datetime.now():%Y%m%d-%H%M%S}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    jobs = [(dict(emp), logs_by_employee.get(emp['id'], []), leave_by_employee.get(emp['id'], set()))
+            for emp in employees]
+    slices = [jobs[i:i + BATCH_REPORTS_PER_TASK] for i in range(0, len(jobs), BATCH_REPORTS_PER_TASK)]
+    workers = max(1, min(workers or CLI_REPORT_WORKERS or os.cpu_count() or 1, len(slices) or 1))
+
+    reports = []
+
+    def record(entries):
+        for entry in entries:
+            reports.append(entry)
+            if progress:
+                progress(len(reports), len(jobs), entry)
+
+    def slice_failed(batch, error):
+        return [failed_entry(employee, f"worker failed: {error!r}") for employee, _, _ in batch]
+
+    if slices:
+        # spawn: workers must not inherit the parent's pooled MySQL sockets
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                 initargs=(holidays,),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {}
+            for batch in slices:
+                try:
+                    futures[pool.submit(render_reports, batch, out_dir, fmt, year, month)] = batch
+                except Exception as e:
+                    record(slice_failed(batch, e))
+            for future in as_completed(futures):
+                try:
+                    record(future.result())
+                except Exception as e:
+                    # A worker died (e.g. BrokenProcessPool): its whole slice failed
+                    record(slice_failed(futures[future], e))
+
+    elapsed = time.perf_counter() - started
+    reports.sort(key=lambda entry: entry['employee_id'])
+    failed = sum(1 for entry in reports if entry['error'])
+    manifest = {
+        'month': f"{year}-{month:02d}",
+        'format': fmt,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'directory': out_dir,
+        'workers': workers,
+        'employees': len(jobs),
+        'written': len(reports) - failed,
+        'failed': failed,
+        'elapsed_seconds': round(elapsed, 2),
+        'reports_per_sec': round((len(reports) - failed) / elapsed, 2) if elapsed > 0 else None,
+        'reports': reports,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    return manifest
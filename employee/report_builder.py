@@ -0,0 +1,324 @@
+"""
+Report Builder Module
+Data and file output for the per-employee attendance report: KPIs,
+attendance history with absences filled in, and the PDF/CSV writers.
+Nothing here needs Tk; the Reports screen and the headless CLI (cli.py)
+both build their reports through these functions.
+"""
+import csv
+import re
+from datetime import datetime, timedelta, date
+
+from config import PDF_ROWS_PER_TABLE
+from holiday_calendar import get_holiday_calendar
+
+
+def hire_date_of(employee_data):
+    """Employee hire date as a date, or None"""
+    if not employee_data or not employee_data['hire_date']:
+        return None
+    hire_date = employee_data['hire_date']
+    if isinstance(hire_date, str):
+        return datetime.strptime(hire_date, "%Y-%m-%d").date()
+    return hire_date.date() if hasattr(hire_date, 'date') else hire_date
+
+
+def absence_records(logs, start_date, end_date, leave_dates, holidays):
+    """Absent rows for working days in [start_date, end_date] with no attendance or leave"""
+    attendance_dates = set()
+    for log in logs:
+        log_date = log['date']
+        if isinstance(log_date, str):
+            log_date = datetime.strptime(log_date, "%Y-%m-%d").date()
+        attendance_dates.add(log_date)
+
+    records = []
+    current_date = start_date
+    while current_date <= end_date:
+        # Skip Sundays, holidays, leave days and days already logged
+        if (current_date.weekday() != 6 and current_date not in attendance_dates
+                and current_date not in leave_dates and not holidays.is_holiday(current_date)):
+            records.append({
+                'date': current_date,
+                'clock_in': None,
+                'clock_out': None,
+                'status': 'absent'
+            })
+        current_date += timedelta(days=1)
+    return records
+
+
+def report_filename(employee, fmt):
+    """'12_Jane_Doe.pdf' - id first so names never collide"""
+    name = re.sub(r"[^A-Za-z0-9]+", "_", f"{employee['first_name']}_{employee['last_name']}").strip("_")
+    return f"{employee['id']}_{name}.{fmt}"
+
+
+def format_log_time(value):
+    if not value:
+        return "N/A"
+    if isinstance(value, str):
+        return datetime.strptime(value, "%H:%M:%S").strftime("%I:%M %p")
+    return value.strftime("%I:%M %p")
+
+
+def load_employee_logs(db, employee_id, start_date=None, end_date=None):
+    """Attendance rows (date, clock_in, clock_out, status), newest first"""
+    query = """SELECT DATE(date) as date, clock_in, clock_out, status
+               FROM attendance
+               WHERE employee_id = %s"""
+    params = [employee_id]
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+    query += " ORDER BY date DESC"
+    return db.execute_query(query, tuple(params), fetch=True) or []
+
+
+def calculate_kpis(db, employee_id, logs=None, employee_data=None, start_date=None, end_date=None):
+    """
+    Present/late/absent/leave counts and attendance rate since hire
+
+    Args:
+        logs, employee_data: already loaded rows (queried when omitted)
+        start_date, end_date: limit the KPIs to this period
+    """
+    try:
+        if logs is None:
+            logs = load_employee_logs(db, employee_id, start_date, end_date)
+        if employee_data is None:
+            employee_data = db.get_employee_by_id(employee_id)
+
+        leave_days = db.count_leave_days(employee_id, start_date, end_date)
+        return kpis_from(logs, leave_days, employee_data, get_holiday_calendar(db), start_date, end_date)
+    except Exception as e:
+        print(f"Error calculating KPIs: {e}")
+        import traceback
+        traceback.print_exc()
+        return {'present': 0, 'late': 0, 'absent': 0, 'leave': 0, 'rate': 0}
+
+
+def kpis_from(logs, leave_days, employee_data, holidays, start_date=None, end_date=None):
+    """KPIs from already loaded rows; working days run from hire (or start_date) to today (or end_date)"""
+    present_days = sum(1 for log in logs if log['status'].lower().strip() == 'present')
+    late_days = sum(1 for log in logs if log['status'].lower().strip() == 'late')
+
+    today = date.today()
+    last_day = min(end_date, today) if end_date else today
+    first_day = hire_date_of(employee_data) or today
+    if start_date and start_date > first_day:
+        first_day = start_date
+
+    current_date = first_day
+    working_days = 0
+    while current_date <= last_day:
+        if current_date.weekday() != 6 and not holidays.is_holiday(current_date):
+            working_days += 1
+        current_date += timedelta(days=1)
+
+    absent_days = max(0, working_days - present_days - late_days - leave_days)
+    attendance_rate = ((present_days + late_days) / working_days * 100) if working_days > 0 else 0
+
+    return {
+        'present': present_days,
+        'late': late_days,
+        'absent': absent_days,
+        'leave': leave_days,
+        'rate': attendance_rate
+    }
+
+
+def report_records(logs, employee_data, leave_dates, holidays, start_date=None, end_date=None):
+    """Logs plus an absent row for every unexplained working day since hire, newest first"""
+    records = list(logs)
+    first_day = hire_date_of(employee_data)
+    if first_day:
+        if start_date and start_date > first_day:
+            first_day = start_date
+        last_day = min(end_date, date.today()) if end_date else date.today()
+        records.extend(absence_records(logs, first_day, last_day, leave_dates, holidays))
+        records.sort(key=lambda x: x['date'], reverse=True)
+    return records
+
+
+# ---- writers ----------------------------------------------------------------
+
+_pdf_styles = None
+
+
+def pdf_styles():
+    """Paragraph and table styles, built once per process and shared by every report"""
+    global _pdf_styles
+    if _pdf_styles is not None:
+        return _pdf_styles
+
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+
+    styles = getSampleStyleSheet()
+    _pdf_styles = {
+        'heading': styles['Heading2'],
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        'info': ParagraphStyle(
+            'InfoStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor('#2c3e50'),
+            spaceAfter=6
+        ),
+        'kpi_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#2c3e50')),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+        ]),
+        'attendance_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#2c3e50')),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+        ]),
+    }
+    return _pdf_styles
+
+
+def pdf_summary_elements(employee, kpis, period):
+    """Title, employee info and KPI summary at the top of the report"""
+    from reportlab.platypus import Table, Paragraph, Spacer
+    from reportlab.lib.units import inch
+
+    elements = []
+    styles = pdf_styles()
+    info_style = styles['info']
+
+    elements.append(Paragraph(f"Attendance Report", styles['title']))
+    elements.append(Spacer(1, 0.2*inch))
+
+    # Employee Info
+    employee_name = employee.get('full_name') or employee.get('username') or 'N/A'
+    employee_id = employee.get('id', 'N/A')
+
+    elements.append(Paragraph(f"<b>Employee Name:</b> {employee_name}", info_style))
+    elements.append(Paragraph(f"<b>Employee ID:</b> {employee_id}", info_style))
+    elements.append(Paragraph(f"<b>Report Period:</b> {period}", info_style))
+    elements.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", info_style))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # KPI Summary
+    kpi_data = [
+        ['Metric', 'Value'],
+        ['Total Present', str(kpis['present'])],
+        ['Total Late', str(kpis['late'])],
+        ['Total Absent', str(kpis['absent'])],
+        ['Total Leave', str(kpis['leave'])],
+        ['Attendance Rate', f"{kpis['rate']:.1f}%"]
+    ]
+
+    kpi_table = Table(kpi_data, colWidths=[3*inch, 2*inch])
+    kpi_table.setStyle(styles['kpi_table'])
+
+    elements.append(Paragraph("<b>Summary Statistics</b>", styles['heading']))
+    elements.append(Spacer(1, 0.1*inch))
+    elements.append(kpi_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Attendance History
+    elements.append(Paragraph("<b>Attendance History</b>", styles['heading']))
+    elements.append(Spacer(1, 0.1*inch))
+    return elements
+
+
+def pdf_attendance_table(records):
+    """One chunk of the attendance history, with its own header row"""
+    from reportlab.platypus import Table
+    from reportlab.lib.units import inch
+
+    attendance_data = [['Date', 'Clock In', 'Clock Out', 'Status']]
+    for log in records:
+        attendance_data.append([
+            str(log['date']),
+            format_log_time(log['clock_in']),
+            format_log_time(log['clock_out']),
+            log['status'].capitalize()
+        ])
+
+    attendance_table = Table(attendance_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch],
+                             repeatRows=1)
+    attendance_table.setStyle(pdf_styles()['attendance_table'])
+    return attendance_table
+
+
+def write_employee_pdf(filename, employee, kpis, records, period, progress=None):
+    """
+    Write the report PDF, one page-sized table per PDF_ROWS_PER_TABLE records
+
+    Args:
+        progress: optional callback(done, total) called as flowables are laid out
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(filename, pagesize=letter)
+    elements = pdf_summary_elements(employee, kpis, period)
+
+    # One table per page-sized chunk: platypus never has to split
+    # (and re-measure) a multi-year table, and each page is laid out
+    # from a small row list
+    for i in range(0, len(records), PDF_ROWS_PER_TABLE):
+        elements.append(pdf_attendance_table(records[i:i + PDF_ROWS_PER_TABLE]))
+
+    if progress:
+        total = len(elements)
+        done = [0]
+
+        def after_flowable(flowable):
+            done[0] += 1
+            if done[0] % 10 == 0:
+                progress(min(done[0], total), total)
+
+        doc.afterFlowable = after_flowable
+    doc.build(elements)
+
+
+def write_employee_csv(filename, employee, kpis, records, period):
+    """Same report as CSV: a short summary block, then the attendance history"""
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Employee', employee.get('full_name') or employee.get('username') or 'N/A'])
+        writer.writerow(['Employee ID', employee.get('id', 'N/A')])
+        writer.writerow(['Report Period', period])
+        writer.writerow(['Present', kpis['present'], 'Late', kpis['late'], 'Absent', kpis['absent'],
+                         'Leave', kpis['leave'], 'Rate', f"{kpis['rate']:.1f}%"])
+        writer.writerow([])
+        writer.writerow(['Date', 'Clock In', 'Clock Out', 'Status'])
+        writer.writerows([str(log['date']), format_log_time(log['clock_in']),
+                          format_log_time(log['clock_out']), log['status'].capitalize()]
+                         for log in records)
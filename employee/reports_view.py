@@ -1,15 +1,15 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from config import COLORS
+from config import COLORS, PDF_POLL_MS
+from database import Database
 from datetime import datetime, timedelta, date
 from collections import defaultdict
 import calendar
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from holiday_calendar import get_holiday_calendar
+from employee.report_builder import (calculate_kpis, hire_date_of, absence_records,
+                                     report_records, write_employee_pdf)
 
 class ReportsView:
     def __init__(self, parent_frame, db, employee):
@@ -17,6 +17,11 @@ class ReportsView:
         self.db = db
         self.employee = employee
         self.current_filter = "All Time"
+        self.kpis = None
+        self.logs = []
+        self.employee_data = None
+        self.pdf_thread = None
+        self.pdf_queue = None
         
         for widget in self.parent_frame.winfo_children():
             widget.destroy()
@@ -25,77 +30,7 @@ class ReportsView:
     
     def calculate_kpis(self):
         """Calculate KPI metrics"""
-        try:
-            cursor = self.db.connection.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT DATE(date) as date, status FROM attendance 
-                WHERE employee_id = %s
-            """, (self.employee['id'],))
-            logs = cursor.fetchall()
-            
-            cursor.execute("""
-                SELECT * FROM leave_requests 
-                WHERE employee_id = %s AND status = 'approved'
-            """, (self.employee['id'],))
-            approved_leaves = cursor.fetchall()
-            
-            cursor.execute("""
-                SELECT hire_date FROM employees WHERE id = %s
-            """, (self.employee['id'],))
-            employee_data = cursor.fetchone()
-            cursor.close()
-            
-            present_days = sum(1 for log in logs if log['status'].lower().strip() == 'present')
-            late_days = sum(1 for log in logs if log['status'].lower().strip() == 'late')
-            leave_days = len(approved_leaves)
-            
-            today = date.today()
-            
-            if employee_data and employee_data['hire_date']:
-                hire_date = employee_data['hire_date']
-                if isinstance(hire_date, str):
-                    employee_start_date = datetime.strptime(hire_date, "%Y-%m-%d").date()
-                else:
-                    employee_start_date = hire_date.date() if hasattr(hire_date, 'date') else hire_date
-            else:
-                employee_start_date = today
-            
-            current_date = employee_start_date
-            working_days = 0
-            
-            while current_date <= today:
-                if current_date.weekday() == 6:
-                    current_date += timedelta(days=1)
-                    continue
-                
-                cursor = self.db.connection.cursor(dictionary=True)
-                cursor.execute("""
-                    SELECT COUNT(*) as count FROM holidays
-                    WHERE holiday_date = %s
-                """, (current_date,))
-                is_holiday = cursor.fetchone()['count'] > 0
-                cursor.close()
-                
-                if not is_holiday:
-                    working_days += 1
-                
-                current_date += timedelta(days=1)
-            
-            absent_days = max(0, working_days - present_days - late_days - leave_days)
-            attendance_rate = ((present_days + late_days) / working_days * 100) if working_days > 0 else 0
-            
-            return {
-                'present': present_days,
-                'late': late_days,
-                'absent': absent_days,
-                'leave': leave_days,
-                'rate': attendance_rate
-            }
-        except Exception as e:
-            print(f"Error calculating KPIs: {e}")
-            import traceback
-            traceback.print_exc()
-            return {'present': 0, 'late': 0, 'absent': 0, 'leave': 0, 'rate': 0}
+        return calculate_kpis(self.db, self.employee['id'])
     
     def get_week_label(self, date_obj):
         """Get week label in format 'Nov 24 - 30'"""
@@ -266,108 +201,23 @@ class ReportsView:
                 start_date = datetime.strptime(start_str, '%b %d %Y').date()
                 end_date = start_date + timedelta(days=6)
             
-            # Get employee hire date
-            if employee_data and employee_data['hire_date']:
-                hire_date = employee_data['hire_date']
-                if isinstance(hire_date, str):
-                    hire_date = datetime.strptime(hire_date, "%Y-%m-%d").date()
-                else:
-                    hire_date = hire_date.date() if hasattr(hire_date, 'date') else hire_date
-                
-                # Adjust start date to not be before hire date
-                if start_date < hire_date:
-                    start_date = hire_date
+            # Adjust start date to not be before hire date
+            hire_date = hire_date_of(employee_data)
+            if hire_date and start_date < hire_date:
+                start_date = hire_date
             
             # Don't show future dates
             today = date.today()
             if end_date > today:
                 end_date = today
             
-            # Create a set of dates that have attendance records
-            attendance_dates = set()
-            for log in existing_logs:
-                log_date = log['date']
-                if isinstance(log_date, str):
-                    log_date = datetime.strptime(log_date, "%Y-%m-%d").date()
-                attendance_dates.add(log_date)
-            
-            # Get approved leave dates - Try different column name variations
-            cursor = self.db.connection.cursor(dictionary=True)
-            
-            # First, check what columns exist in leave_requests table
-            try:
-                cursor.execute("DESCRIBE leave_requests")
-                columns_info = cursor.fetchall()
-                column_names = [col['Field'] for col in columns_info]
-                
-                # Determine the correct column names
-                start_col = None
-                end_col = None
-                
-                for col in column_names:
-                    if 'start' in col.lower():
-                        start_col = col
-                    if 'end' in col.lower():
-                        end_col = col
-                
-                if start_col and end_col:
-                    cursor.execute(f"""
-                        SELECT {start_col}, {end_col} FROM leave_requests 
-                        WHERE employee_id = %s AND status = 'approved'
-                    """, (self.employee['id'],))
-                    leave_requests = cursor.fetchall()
-                    
-                    leave_dates = set()
-                    for leave in leave_requests:
-                        leave_start = leave[start_col]
-                        leave_end = leave[end_col]
-                        
-                        if isinstance(leave_start, str):
-                            leave_start = datetime.strptime(leave_start, "%Y-%m-%d").date()
-                        elif hasattr(leave_start, 'date'):
-                            leave_start = leave_start.date()
-                            
-                        if isinstance(leave_end, str):
-                            leave_end = datetime.strptime(leave_end, "%Y-%m-%d").date()
-                        elif hasattr(leave_end, 'date'):
-                            leave_end = leave_end.date()
-                        
-                        current = leave_start
-                        while current <= leave_end:
-                            leave_dates.add(current)
-                            current += timedelta(days=1)
-                else:
-                    leave_dates = set()
-            except Exception as e:
-                print(f"Error getting leave dates: {e}")
-                leave_dates = set()
+            # Approved leave days in range (one indexed lookup on leave_days)
+            leave_dates = self.db.get_leave_dates(self.employee['id'], start_date, end_date)
             
             # Generate absent records
             all_records = list(existing_logs)
-            current_date = start_date
-            
-            while current_date <= end_date:
-                # Skip Sundays
-                if current_date.weekday() != 6:
-                    # Check if it's a holiday
-                    cursor.execute("""
-                        SELECT COUNT(*) as count FROM holidays
-                        WHERE holiday_date = %s
-                    """, (current_date,))
-                    is_holiday = cursor.fetchone()['count'] > 0
-                    
-                    # If not a holiday, not on leave, and no attendance record, mark as absent
-                    if not is_holiday and current_date not in leave_dates and current_date not in attendance_dates:
-                        all_records.append({
-                            'date': current_date,
-                            'clock_in': None,
-                            'clock_out': None,
-                            'status': 'absent'
-                        })
-                
-                current_date += timedelta(days=1)
-            
-            cursor.close()
+            all_records.extend(absence_records(existing_logs, start_date, end_date, leave_dates,
+                                                    get_holiday_calendar(self.db)))
             
             # Sort by date descending
             all_records.sort(key=lambda x: x['date'], reverse=True)
@@ -380,7 +230,10 @@ class ReportsView:
             return existing_logs
     
     def generate_pdf_report(self):
-        """Generate PDF report of attendance"""
+        """Ask where to save the PDF, then build it on a worker thread"""
+        if self.pdf_thread and self.pdf_thread.is_alive():
+            return
+        
         try:
             # Ask user where to save the PDF
             filename = filedialog.asksaveasfilename(
@@ -392,237 +245,24 @@ class ReportsView:
             if not filename:
                 return
             
-            # Create PDF
-            doc = SimpleDocTemplate(filename, pagesize=letter)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#2c3e50'),
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-            
-            elements.append(Paragraph(f"Attendance Report", title_style))
-            elements.append(Spacer(1, 0.2*inch))
-            
-            # Employee Info
-            info_style = ParagraphStyle(
-                'InfoStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                textColor=colors.HexColor('#2c3e50'),
-                spaceAfter=6
-            )
-            
-            employee_name = self.employee.get('full_name') or self.employee.get('username') or 'N/A'
-            employee_id = self.employee.get('id', 'N/A')
-            
-            elements.append(Paragraph(f"<b>Employee Name:</b> {employee_name}", info_style))
-            elements.append(Paragraph(f"<b>Employee ID:</b> {employee_id}", info_style))
-            elements.append(Paragraph(f"<b>Report Period:</b> {self.current_filter}", info_style))
-            elements.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", info_style))
-            elements.append(Spacer(1, 0.3*inch))
-            
-            # KPI Summary
-            kpis = self.calculate_kpis()
-            
-            kpi_data = [
-                ['Metric', 'Value'],
-                ['Total Present', str(kpis['present'])],
-                ['Total Late', str(kpis['late'])],
-                ['Total Absent', str(kpis['absent'])],
-                ['Total Leave', str(kpis['leave'])],
-                ['Attendance Rate', f"{kpis['rate']:.1f}%"]
-            ]
-            
-            kpi_table = Table(kpi_data, colWidths=[3*inch, 2*inch])
-            kpi_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#2c3e50')),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(Paragraph("<b>Summary Statistics</b>", styles['Heading2']))
-            elements.append(Spacer(1, 0.1*inch))
-            elements.append(kpi_table)
-            elements.append(Spacer(1, 0.3*inch))
-            
-            # Attendance History
-            elements.append(Paragraph("<b>Attendance History</b>", styles['Heading2']))
-            elements.append(Spacer(1, 0.1*inch))
-            
-            # Get ALL data for PDF (ignore current filter for comprehensive report)
-            cursor = self.db.connection.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT DATE(date) as date, clock_in, clock_out, status
-                FROM attendance
-                WHERE employee_id = %s
-                ORDER BY date DESC
-            """, (self.employee['id'],))
-            logs = cursor.fetchall()
-            
-            cursor.execute("""
-                SELECT hire_date FROM employees WHERE id = %s
-            """, (self.employee['id'],))
-            employee_data = cursor.fetchone()
-            
-            # Get all months from hire date to now for comprehensive absent records
-            if employee_data and employee_data['hire_date']:
-                hire_date = employee_data['hire_date']
-                if isinstance(hire_date, str):
-                    start_date = datetime.strptime(hire_date, "%Y-%m-%d").date()
-                else:
-                    start_date = hire_date.date() if hasattr(hire_date, 'date') else hire_date
-                
-                # Generate comprehensive attendance including all absences
-                all_records = []
-                current_date = start_date
-                today = date.today()
-                
-                # Create a set of dates with attendance
-                attendance_dates = set()
-                for log in logs:
-                    log_date = log['date']
-                    if isinstance(log_date, str):
-                        log_date = datetime.strptime(log_date, "%Y-%m-%d").date()
-                    attendance_dates.add(log_date)
-                
-                # Get leave dates
-                try:
-                    cursor.execute("DESCRIBE leave_requests")
-                    columns_info = cursor.fetchall()
-                    column_names = [col['Field'] for col in columns_info]
-                    
-                    start_col = None
-                    end_col = None
-                    for col in column_names:
-                        if 'start' in col.lower():
-                            start_col = col
-                        if 'end' in col.lower():
-                            end_col = col
-                    
-                    leave_dates = set()
-                    if start_col and end_col:
-                        cursor.execute(f"""
-                            SELECT {start_col}, {end_col} FROM leave_requests 
-                            WHERE employee_id = %s AND status = 'approved'
-                        """, (self.employee['id'],))
-                        leave_requests = cursor.fetchall()
-                        
-                        for leave in leave_requests:
-                            leave_start = leave[start_col]
-                            leave_end = leave[end_col]
-                            
-                            if isinstance(leave_start, str):
-                                leave_start = datetime.strptime(leave_start, "%Y-%m-%d").date()
-                            elif hasattr(leave_start, 'date'):
-                                leave_start = leave_start.date()
-                                
-                            if isinstance(leave_end, str):
-                                leave_end = datetime.strptime(leave_end, "%Y-%m-%d").date()
-                            elif hasattr(leave_end, 'date'):
-                                leave_end = leave_end.date()
-                            
-                            current = leave_start
-                            while current <= leave_end:
-                                leave_dates.add(current)
-                                current += timedelta(days=1)
-                except:
-                    leave_dates = set()
-                
-                # Add all attendance records
-                all_records.extend(logs)
-                
-                # Generate absent records for all working days
-                while current_date <= today:
-                    if current_date.weekday() != 6:  # Not Sunday
-                        # Check if holiday
-                        cursor.execute("""
-                            SELECT COUNT(*) as count FROM holidays
-                            WHERE holiday_date = %s
-                        """, (current_date,))
-                        is_holiday = cursor.fetchone()['count'] > 0
-                        
-                        if not is_holiday and current_date not in leave_dates and current_date not in attendance_dates:
-                            all_records.append({
-                                'date': current_date,
-                                'clock_in': None,
-                                'clock_out': None,
-                                'status': 'absent'
-                            })
-                    
-                    current_date += timedelta(days=1)
-                
-                # Sort by date descending
-                all_records.sort(key=lambda x: x['date'], reverse=True)
-            else:
-                all_records = logs
-            
-            cursor.close()
-            
-            # Create attendance table
-            attendance_data = [['Date', 'Clock In', 'Clock Out', 'Status']]
-            
-            for log in all_records:
-                if log['clock_in']:
-                    if isinstance(log['clock_in'], str):
-                        clock_in = datetime.strptime(log['clock_in'], "%H:%M:%S").strftime("%I:%M %p")
-                    else:
-                        clock_in = log['clock_in'].strftime("%I:%M %p") if log['clock_in'] else "N/A"
-                else:
-                    clock_in = "N/A"
-                
-                if log['clock_out']:
-                    if isinstance(log['clock_out'], str):
-                        clock_out = datetime.strptime(log['clock_out'], "%H:%M:%S").strftime("%I:%M %p")
-                    else:
-                        clock_out = log['clock_out'].strftime("%I:%M %p") if log['clock_out'] else "N/A"
-                else:
-                    clock_out = "N/A"
-                
-                attendance_data.append([
-                    str(log['date']),
-                    clock_in,
-                    clock_out,
-                    log['status'].capitalize()
-                ])
-            
-            attendance_table = Table(attendance_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-            attendance_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#2c3e50')),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            elements.append(attendance_table)
-            
-            # Build PDF
-            doc.build(elements)
-            
-            messagebox.showinfo("Success", f"PDF report generated successfully!\n\nSaved to: {filename}")
+            # The worker reuses what the screen already loaded; only the
+            # leave lookup needs the database, on its own pooled connection
+            kpis = self.kpis or self.calculate_kpis()
+            holidays = get_holiday_calendar(self.db)
+            
+            self.pdf_queue = queue.Queue()
+            self.export_btn.config(state=tk.DISABLED, text="Exporting...")
+            self.pdf_status.config(text="Preparing report...")
+            self.pdf_status.pack(side=tk.RIGHT, padx=(0, 10))
+            self.pdf_progress['value'] = 0
+            self.pdf_progress.pack(side=tk.RIGHT, padx=(0, 10))
+            
+            self.pdf_thread = threading.Thread(
+                target=self.build_pdf_report,
+                args=(filename, kpis, list(self.logs), self.employee_data, holidays, self.current_filter),
+                daemon=True)
+            self.pdf_thread.start()
+            self.parent_frame.after(PDF_POLL_MS, self.poll_pdf_report)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate PDF report:\n{str(e)}")
@@ -630,6 +270,55 @@ class ReportsView:
             import traceback
             traceback.print_exc()
     
+    def build_pdf_report(self, filename, kpis, logs, employee_data, holidays, period):
+        """Worker thread: add absences since hire and write the PDF in page-sized tables"""
+        db = Database()
+        try:
+            # Comprehensive report: all logs plus every absence since hire
+            leave_dates = set()
+            start_date = hire_date_of(employee_data)
+            if start_date:
+                if not db.connect():
+                    raise Exception("Database unavailable")
+                leave_dates = db.get_leave_dates(self.employee['id'], start_date, date.today())
+            records = report_records(logs, employee_data, leave_dates, holidays)
+            
+            write_employee_pdf(filename, self.employee, kpis, records, period,
+                               progress=lambda done, total: self.pdf_queue.put(('progress', done, total)))
+            self.pdf_queue.put(('done', filename))
+        except Exception as e:
+            print(f"Error generating PDF: {e}")
+            import traceback
+            traceback.print_exc()
+            self.pdf_queue.put(('error', str(e)))
+        finally:
+            db.disconnect()
+    
+    def poll_pdf_report(self):
+        """Show worker progress on the Tk thread until the export finishes"""
+        if not self.export_btn.winfo_exists():
+            return  # view was closed; the worker finishes on its own
+        try:
+            while True:
+                message = self.pdf_queue.get_nowait()
+                if message[0] == 'progress':
+                    _, done, total = message
+                    self.pdf_progress['value'] = done * 100 / total
+                    self.pdf_status.config(text=f"Writing PDF... {done * 100 // total}%")
+                    continue
+                
+                self.export_btn.config(state=tk.NORMAL, text="Export to PDF")
+                self.pdf_progress.pack_forget()
+                self.pdf_status.pack_forget()
+                if message[0] == 'done':
+                    messagebox.showinfo("Success", f"PDF report generated successfully!\n\nSaved to: {message[1]}")
+                else:
+                    messagebox.showerror("Error", f"Failed to generate PDF report:\n{message[1]}")
+                return
+        except queue.Empty:
+            pass
+        self.parent_frame.after(PDF_POLL_MS, self.poll_pdf_report)
+    
     def create_kpi_card(self, parent, title, value, accent_color):
         """Create a minimal KPI card with left-aligned number and color accent"""
         card = tk.Frame(parent, bg='white', highlightbackground='#e0e0e0', 
@@ -848,17 +537,22 @@ class ReportsView:
                     bg=COLORS['bg_main']).pack(side=tk.LEFT)
             
             # Export PDF Button
-            export_btn = tk.Button(header_frame, text="Export to PDF",
+            self.export_btn = tk.Button(header_frame, text="Export to PDF",
                                   font=("Arial", 11, "bold"),
                                   bg='#3498db', fg='white',
                                   padx=20, pady=8,
                                   relief=tk.FLAT,
                                   cursor='hand2',
                                   command=self.generate_pdf_report)
-            export_btn.pack(side=tk.RIGHT)
+            self.export_btn.pack(side=tk.RIGHT)
+            
+            # Export progress (shown while the PDF worker runs)
+            self.pdf_progress = ttk.Progressbar(header_frame, length=160, mode='determinate', maximum=100)
+            self.pdf_status = tk.Label(header_frame, text="", font=("Arial", 10),
+                                      fg='#7f8c8d', bg=COLORS['bg_main'])
             
             # KPI Cards
-            kpis = self.calculate_kpis()
+            kpis = self.kpis = self.calculate_kpis()
             kpi_container = tk.Frame(self.parent_frame, bg=COLORS['bg_main'])
             kpi_container.pack(fill=tk.X, pady=(0, 20))
             
@@ -949,13 +643,13 @@ class ReportsView:
                 WHERE employee_id = %s
                 ORDER BY date DESC
             """, (self.employee['id'],))
-            logs = cursor.fetchall()
+            logs = self.logs = cursor.fetchall()
             
             # Get employee hire date for absent record generation
             cursor.execute("""
                 SELECT hire_date FROM employees WHERE id = %s
             """, (self.employee['id'],))
-            employee_data = cursor.fetchone()
+            employee_data = self.employee_data = cursor.fetchone()
             cursor.close()
             
             # Add empty state label (hidden by default)
@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import messagebox
 from database import Database
 from config import COLORS
+from view_manager import ViewManager
 
 # Import separate modules
 from employee.dashboard_view import DashboardView
@@ -12,14 +13,15 @@ from employee.leave_request_view import LeaveRequestView
 from employee.late_fees_view import EmployeeLateFeesView  # <--- NEW IMPORT
 
 class EmployeeDashboard:
-    def __init__(self, user_data):
-        self.window = tk.Tk()
-        self.window.title("Employee Dashboard - Attendance System")
-        self.window.geometry("1100x650")
-        self.window.configure(bg=COLORS['bg_main'])
+    def __init__(self, user_data, root=None, db=None):
+        # main.py passes a shared root/db so the dashboard can be reused
+        # across logins; standalone use still owns its own window
+        self.owns_window = root is None
+        self.owns_db = db is None
+        self.window = root if root is not None else tk.Tk()
         
         self.user_data = user_data
-        self.db = Database()
+        self.db = db if db is not None else Database()
         self.db.connect()
         
         self.employee = self.db.get_employee_by_id(user_data['employee_id'])
@@ -27,9 +29,29 @@ class EmployeeDashboard:
         self.setup_ui()
         self.show_dashboard()
         
+    def prepare_window(self):
+        self.window.title("Employee Dashboard - Attendance System")
+        self.window.geometry("1100x650")
+        self.window.resizable(True, True)
+        self.window.configure(bg=COLORS['bg_main'])
+        
+    def welcome_text(self):
+        return f"Welcome, {self.employee['first_name']} {self.employee['last_name']}"
+    
+    def switch_user(self, user_data):
+        """Reuse this dashboard for another user of the same role"""
+        self.user_data = user_data
+        self.db.connect()
+        self.employee = self.db.get_employee_by_id(user_data['employee_id'])
+        self.welcome_label.config(text=self.welcome_text())
+        self.views.clear()
+        self.show_dashboard()
+        
     def setup_ui(self):
+        self.container = tk.Frame(self.window, bg=COLORS['bg_main'])
+        
         # Top Header
-        header = tk.Frame(self.window, bg=COLORS['success'], height=70)
+        header = tk.Frame(self.container, bg=COLORS['success'], height=70)
         header.pack(fill=tk.X)
         header.pack_propagate(False)
         
@@ -38,13 +60,14 @@ class EmployeeDashboard:
                 bg=COLORS['success'], 
                 fg="white").pack(side=tk.LEFT, padx=30, pady=20)
         
-        tk.Label(header, text=f"Welcome, {self.employee['first_name']} {self.employee['last_name']}", 
+        self.welcome_label = tk.Label(header, text=self.welcome_text(), 
                 font=("Arial", 11),
                 bg=COLORS['success'], 
-                fg="white").pack(side=tk.RIGHT, padx=30)
+                fg="white")
+        self.welcome_label.pack(side=tk.RIGHT, padx=30)
         
         # Main Container
-        main_container = tk.Frame(self.window, bg=COLORS['bg_main'])
+        main_container = tk.Frame(self.container, bg=COLORS['bg_main'])
         main_container.pack(fill=tk.BOTH, expand=True)
         
         # Sidebar
@@ -105,37 +128,40 @@ class EmployeeDashboard:
         self.content_frame = tk.Frame(main_container, bg=COLORS['bg_main'])
         self.content_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-    def clear_content(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Views are built once and kept (hidden) between menu clicks
+        self.views = ViewManager(self.content_frame, self.db)
     
     def show_dashboard(self):
-        self.clear_content()
-        DashboardView(self.content_frame, self.db, self.employee)
+        self.views.show('DashboardView', lambda parent: DashboardView(parent, self.db, self.employee))
     
     def show_attendance(self):
-        self.clear_content()
-        AttendanceView(self.content_frame, self.db, self.employee)
+        self.views.show('AttendanceView', lambda parent: AttendanceView(parent, self.db, self.employee))
 
     def show_late_fees(self):  # <--- NEW FUNCTION
         """Display Employee Late Fees View"""
-        self.clear_content()
         # We pass self.user_data because it contains the 'employee_id' 
         # that the view expects to find.
-        EmployeeLateFeesView(self.content_frame, self.db, self.user_data)
+        self.views.show('EmployeeLateFeesView', lambda parent: EmployeeLateFeesView(parent, self.db, self.user_data))
     
     def show_leave_request(self):
-        self.clear_content()
-        LeaveRequestView(self.content_frame, self.db, self.employee)
+        self.views.show('LeaveRequestView', lambda parent: LeaveRequestView(parent, self.db, self.employee))
     
     def show_reports(self):
-        self.clear_content()
-        ReportsView(self.content_frame, self.db, self.employee)
+        self.views.show('ReportsView', lambda parent: ReportsView(parent, self.db, self.employee))
     
     def logout(self):
+        """Logout and hand control back to the login screen"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-            self.db.disconnect()
-            self.window.destroy()
+            if self.owns_db:
+                self.db.disconnect()
+            if self.owns_window:
+                self.window.destroy()
+            else:
+                self.container.pack_forget()
+                self.window.quit()
     
     def run(self):
-        self.window.mainloop()
\ No newline at end of file
+        """Run the dashboard until logout"""
+        self.prepare_window()
+        self.container.pack(fill=tk.BOTH, expand=True)
+        self.window.mainloop()
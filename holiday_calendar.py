@@ -0,0 +1,139 @@
+"""
+Holiday Calendar Module
+Loads the holidays table once per process into sorted per-year lists and
+answers is-holiday, range, count and next-N questions in memory.
+Recurring holidays repeat every year on the same month and day, starting
+from the year of their stored date.
+"""
+import bisect
+import threading
+from datetime import date
+
+from records import Holiday
+
+_calendar = None
+_lock = threading.Lock()
+
+HOLIDAYS_QUERY = """
+    SELECT id, name, holiday_date, {recurring}, created_at
+    FROM holidays
+    ORDER BY holiday_date ASC
+"""
+
+
+class HolidayCalendar:
+    def __init__(self, rows):
+        """
+        Args:
+            rows: records from the holidays table (id, name, holiday_date, is_recurring)
+        """
+        self.rows = sorted(rows or [], key=lambda r: r['holiday_date'])
+        self.fixed = [r for r in self.rows if not r.get('is_recurring')]
+        self.recurring = [r for r in self.rows if r.get('is_recurring')]
+        self._years = {}  # year -> (sorted dates, holiday per date)
+
+    def _year(self, year):
+        """Holidays falling in one year, expanded on first use"""
+        cached = self._years.get(year)
+        if cached is not None:
+            return cached
+
+        by_date = {}
+        for row in self.recurring:
+            start = row['holiday_date']
+            if year < start.year:
+                continue
+            try:
+                by_date.setdefault(start.replace(year=year), row)
+            except ValueError:
+                continue  # Feb 29 outside a leap year
+        for row in self.fixed:
+            if row['holiday_date'].year == year:
+                by_date[row['holiday_date']] = row
+
+        cached = (sorted(by_date), by_date)
+        self._years[year] = cached
+        return cached
+
+    def get(self, day):
+        """The holiday on this date, or None"""
+        return self._year(day.year)[1].get(day)
+
+    def is_holiday(self, day):
+        return day in self._year(day.year)[1]
+
+    def between(self, start_date, end_date):
+        """[(date, holiday), ...] for every holiday in [start_date, end_date], in date order"""
+        result = []
+        for year in range(start_date.year, end_date.year + 1):
+            dates, by_date = self._year(year)
+            lo = bisect.bisect_left(dates, start_date)
+            hi = bisect.bisect_right(dates, end_date)
+            result.extend((day, by_date[day]) for day in dates[lo:hi])
+        return result
+
+    def dates_between(self, start_date, end_date):
+        """Set of holiday dates in [start_date, end_date]"""
+        return {day for day, _ in self.between(start_date, end_date)}
+
+    def count_between(self, start_date, end_date, skip_sundays=False):
+        """Number of holidays in [start_date, end_date] (optionally ignoring ones on a Sunday)"""
+        return sum(1 for day, _ in self.between(start_date, end_date)
+                   if not (skip_sundays and day.weekday() == 6))
+
+    def upcoming(self, limit=5, from_date=None):
+        """Next `limit` holidays from from_date (default today) as [(date, holiday), ...]"""
+        from_date = from_date or date.today()
+        result = []
+        # Recurring rules all come round within a year of from_date
+        last_year = max([from_date.year + (1 if self.recurring else 0)] +
+                        [r['holiday_date'].year for r in self.fixed])
+        for year in range(from_date.year, last_year + 1):
+            dates, by_date = self._year(year)
+            for day in dates[bisect.bisect_left(dates, from_date):]:
+                result.append((day, by_date[day]))
+                if len(result) >= limit:
+                    return result
+        return result
+
+    def next_occurrence(self, holiday, from_date=None):
+        """Next date this holiday falls on (its stored date unless it recurs)"""
+        from_date = from_date or date.today()
+        stored = holiday['holiday_date']
+        if not holiday.get('is_recurring') or stored >= from_date:
+            return stored
+        for year in range(from_date.year, from_date.year + 9):
+            try:
+                day = stored.replace(year=year)
+            except ValueError:
+                continue
+            if day >= from_date:
+                return day
+        return stored
+
+
+def get_holiday_calendar(db, force=False):
+    """Return the shared calendar, loading it from the database on first use"""
+    global _calendar
+    with _lock:
+        if force or _calendar is None:
+            rows = db.execute_query(HOLIDAYS_QUERY.format(recurring="is_recurring"),
+                                    fetch=True, row_type=Holiday)
+            if rows is None:
+                # Schema predates db_setup.py's is_recurring column: load every
+                # holiday as a one-off rather than dropping them all
+                print("WARNING - holidays.is_recurring unavailable; run db_setup.py. "
+                      "Treating all holidays as non-recurring.")
+                rows = db.execute_query(HOLIDAYS_QUERY.format(recurring="0 AS is_recurring"),
+                                        fetch=True, row_type=Holiday)
+            if rows is None:
+                raise RuntimeError("Could not load the holidays table")
+            _calendar = HolidayCalendar(rows)
+        return _calendar
+
+
+def invalidate_holiday_calendar():
+    """Drop the cached calendar after holidays are added, edited or deleted"""
+    global _calendar
+    with _lock:
+        _calendar = None
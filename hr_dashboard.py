@@ -4,16 +4,19 @@ from tkinter import messagebox, ttk
 from datetime import datetime
 from database import Database
 from config import COLORS
+from tick_scheduler import get_tick_scheduler
+from view_manager import ViewManager
 
 class HRDashboard:
-    def __init__(self, user_data):
-        self.window = tk.Tk()
-        self.window.title("HR Manager Dashboard - Attendance System")
-        self.window.geometry("1200x700")
-        self.window.configure(bg=COLORS['bg_main'])
+    def __init__(self, user_data, root=None, db=None):
+        # main.py passes a shared root/db so the dashboard can be reused
+        # across logins; standalone use still owns its own window
+        self.owns_window = root is None
+        self.owns_db = db is None
+        self.window = root if root is not None else tk.Tk()
         
         self.user_data = user_data
-        self.db = Database()
+        self.db = db if db is not None else Database()
         self.db.connect()
         
         self.employee = self.db.get_employee_by_id(user_data['employee_id'])
@@ -21,9 +24,29 @@ class HRDashboard:
         self.setup_ui()
         self.show_dashboard()
         
+    def prepare_window(self):
+        self.window.title("HR Manager Dashboard - Attendance System")
+        self.window.geometry("1200x700")
+        self.window.resizable(True, True)
+        self.window.configure(bg=COLORS['bg_main'])
+        
+    def welcome_text(self):
+        return f"Welcome, {self.employee['first_name']} {self.employee['last_name']}"
+    
+    def switch_user(self, user_data):
+        """Reuse this dashboard for another user of the same role"""
+        self.user_data = user_data
+        self.db.connect()
+        self.employee = self.db.get_employee_by_id(user_data['employee_id'])
+        self.welcome_label.config(text=self.welcome_text())
+        self.views.clear()
+        self.show_dashboard()
+        
     def setup_ui(self):
+        self.container = tk.Frame(self.window, bg=COLORS['bg_main'])
+        
         # Top Header
-        header = tk.Frame(self.window, bg=COLORS['secondary'], height=70)
+        header = tk.Frame(self.container, bg=COLORS['secondary'], height=70)
         header.pack(fill=tk.X)
         header.pack_propagate(False)
         
@@ -32,13 +55,14 @@ class HRDashboard:
                 bg=COLORS['secondary'], 
                 fg="white").pack(side=tk.LEFT, padx=30, pady=20)
         
-        tk.Label(header, text=f"Welcome, {self.employee['first_name']} {self.employee['last_name']}", 
+        self.welcome_label = tk.Label(header, text=self.welcome_text(), 
                 font=("Arial", 11),
                 bg=COLORS['secondary'], 
-                fg="white").pack(side=tk.RIGHT, padx=30)
+                fg="white")
+        self.welcome_label.pack(side=tk.RIGHT, padx=30)
         
         # Main Container
-        main_container = tk.Frame(self.window, bg=COLORS['bg_main'])
+        main_container = tk.Frame(self.container, bg=COLORS['bg_main'])
         main_container.pack(fill=tk.BOTH, expand=True)
         
         # Sidebar
@@ -79,20 +103,33 @@ class HRDashboard:
         self.content_frame = tk.Frame(main_container, bg=COLORS['bg_main'])
         self.content_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-    def clear_content(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Screens are built once and kept (hidden) between menu clicks
+        self.views = ViewManager(self.content_frame, self.db)
     
     def show_dashboard(self):
-        self.clear_content()
+        self.views.show('dashboard', self.build_dashboard)
+    
+    def show_employees(self):
+        self.views.show('employees', self.build_employees)
+    
+    def show_attendance_logs(self):
+        self.views.show('attendance_logs', self.build_attendance_logs)
+    
+    def show_reports(self):
+        self.views.show('reports', self.build_reports)
+    
+    def show_my_attendance(self, rebuild=False):
+        self.views.show('my_attendance', self.build_my_attendance, rebuild=rebuild)
+    
+    def build_dashboard(self, parent):
         
-        tk.Label(self.content_frame, text="HR Dashboard Overview", 
+        tk.Label(parent, text="HR Dashboard Overview", 
                 font=("Arial", 22, "bold"), 
                 fg=COLORS['text_dark'], 
                 bg=COLORS['bg_main']).pack(anchor=tk.W, pady=(0, 20))
         
         # Stats Cards
-        stats_container = tk.Frame(self.content_frame, bg=COLORS['bg_main'])
+        stats_container = tk.Frame(parent, bg=COLORS['bg_main'])
         stats_container.pack(fill=tk.X, pady=(0, 30))
         
         stats = self.db.get_dashboard_stats()
@@ -130,12 +167,12 @@ class HRDashboard:
                     bg=COLORS['bg_white']).pack()
         
         # Recent Attendance
-        tk.Label(self.content_frame, text="Recent Attendance Activity", 
+        tk.Label(parent, text="Recent Attendance Activity", 
                 font=("Arial", 16, "bold"), 
                 fg=COLORS['text_dark'], 
                 bg=COLORS['bg_main']).pack(anchor=tk.W, pady=(20, 15))
         
-        table_container = tk.Frame(self.content_frame, bg=COLORS['bg_white'],
+        table_container = tk.Frame(parent, bg=COLORS['bg_white'],
                                   highlightbackground=COLORS['border'], 
                                   highlightthickness=1)
         table_container.pack(fill=tk.BOTH, expand=True)
@@ -177,15 +214,14 @@ class HRDashboard:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         tree.pack(fill=tk.BOTH, expand=True)
     
-    def show_employees(self):
-        self.clear_content()
+    def build_employees(self, parent):
         
-        tk.Label(self.content_frame, text="All Employees", 
+        tk.Label(parent, text="All Employees", 
                 font=("Arial", 22, "bold"), 
                 fg=COLORS['text_dark'], 
                 bg=COLORS['bg_main']).pack(anchor=tk.W, pady=(0, 20))
         
-        table_container = tk.Frame(self.content_frame, bg=COLORS['bg_white'],
+        table_container = tk.Frame(parent, bg=COLORS['bg_white'],
                                   highlightbackground=COLORS['border'], 
                                   highlightthickness=1)
         table_container.pack(fill=tk.BOTH, expand=True)
@@ -215,15 +251,14 @@ class HRDashboard:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         tree.pack(fill=tk.BOTH, expand=True)
     
-    def show_attendance_logs(self):
-        self.clear_content()
+    def build_attendance_logs(self, parent):
         
-        tk.Label(self.content_frame, text="Attendance Logs", 
+        tk.Label(parent, text="Attendance Logs", 
                 font=("Arial", 22, "bold"), 
                 fg=COLORS['text_dark'], 
                 bg=COLORS['bg_main']).pack(anchor=tk.W, pady=(0, 20))
         
-        table_container = tk.Frame(self.content_frame, bg=COLORS['bg_white'],
+        table_container = tk.Frame(parent, bg=COLORS['bg_white'],
                                   highlightbackground=COLORS['border'], 
                                   highlightthickness=1)
         table_container.pack(fill=tk.BOTH, expand=True)
@@ -254,15 +289,14 @@ class HRDashboard:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         tree.pack(fill=tk.BOTH, expand=True)
     
-    def show_reports(self):
-        self.clear_content()
+    def build_reports(self, parent):
         
-        tk.Label(self.content_frame, text="HR Reports & Analytics", 
+        tk.Label(parent, text="HR Reports & Analytics", 
                 font=("Arial", 22, "bold"), 
                 fg=COLORS['text_dark'], 
                 bg=COLORS['bg_main']).pack(anchor=tk.W, pady=(0, 20))
         
-        report_container = tk.Frame(self.content_frame, bg=COLORS['bg_white'],
+        report_container = tk.Frame(parent, bg=COLORS['bg_white'],
                                    highlightbackground=COLORS['border'], 
                                    highlightthickness=1)
         report_container.pack(fill=tk.BOTH, expand=True, padx=50, pady=20)
@@ -291,15 +325,14 @@ class HRDashboard:
                     fg=COLORS['secondary'], 
                     bg=COLORS['bg_white']).grid(row=i, column=1, sticky=tk.W, pady=15)
     
-    def show_my_attendance(self):
-        self.clear_content()
+    def build_my_attendance(self, parent):
         
-        tk.Label(self.content_frame, text="My Attendance Clock In/Out", 
+        tk.Label(parent, text="My Attendance Clock In/Out", 
                 font=("Arial", 22, "bold"), 
                 fg=COLORS['text_dark'], 
                 bg=COLORS['bg_main']).pack(anchor=tk.W, pady=(0, 20))
         
-        clock_container = tk.Frame(self.content_frame, bg=COLORS['bg_white'],
+        clock_container = tk.Frame(parent, bg=COLORS['bg_white'],
                                   highlightbackground=COLORS['border'], 
                                   highlightthickness=1)
         clock_container.pack(fill=tk.BOTH, expand=True)
@@ -319,7 +352,7 @@ class HRDashboard:
                                    bg=COLORS['bg_white'])
         self.date_label.pack(pady=(0, 30))
         
-        self.update_time()
+        get_tick_scheduler(self.time_label).subscribe(self.time_label, self.update_time)
         
         today_status = self.db.get_today_attendance_status(self.employee['id'])
         
@@ -373,22 +406,19 @@ class HRDashboard:
                      padx=50, 
                      pady=15).pack()
     
-    def update_time(self):
-        now = datetime.now()
+    def update_time(self, now):
         current_time = now.strftime("%I:%M:%S %p")
         current_date = now.strftime("%A, %B %d, %Y")
         
         self.time_label.config(text=current_time)
         self.date_label.config(text=current_date)
-        
-        self.time_label.after(1000, self.update_time)
     
     def clock_in(self):
         success, message = self.db.clock_in(self.employee['id'])
         
         if success:
             messagebox.showinfo("Success", message)
-            self.show_my_attendance()
+            self.show_my_attendance(rebuild=True)
         else:
             messagebox.showerror("Error", message)
     
@@ -397,14 +427,23 @@ class HRDashboard:
         
         if success:
             messagebox.showinfo("Success", message)
-            self.show_my_attendance()
+            self.show_my_attendance(rebuild=True)
         else:
             messagebox.showerror("Error", message)
     
     def logout(self):
+        """Logout and hand control back to the login screen"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-            self.db.disconnect()
-            self.window.destroy()
+            if self.owns_db:
+                self.db.disconnect()
+            if self.owns_window:
+                self.window.destroy()
+            else:
+                self.container.pack_forget()
+                self.window.quit()
     
     def run(self):
-        self.window.mainloop()
\ No newline at end of file
+        """Run the dashboard until logout"""
+        self.prepare_window()
+        self.container.pack(fill=tk.BOTH, expand=True)
+        self.window.mainloop()
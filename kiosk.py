@@ -0,0 +1,192 @@
+# kiosk.py
+"""
+Kiosk clock-in mode
+Employees scan a badge (or type their employee ID / username) and are
+clocked in or out immediately, without logging in to the dashboard.
+"""
+
+import queue
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+from database import Database
+from config import COLORS, KIOSK_RESET_MS, KIOSK_POLL_MS, KIOSK_RATE_WINDOW
+
+
+class KioskWindow:
+    def __init__(self, root=None):
+        self.owns_window = root is None
+        self.window = root if root is not None else tk.Tk()
+        self.window.title("Kiosk - Attendance System")
+        self.window.geometry("700x500")
+        self.window.configure(bg=COLORS['bg_main'])
+
+        # Scans go to a worker thread with its own pooled connection so the
+        # entry is ready for the next badge while the previous punch is saved
+        self.scan_queue = queue.Queue()
+        self.result_queue = queue.Queue()
+        self.punch_times = deque()
+        self.reset_job = None
+        self.running = True
+
+        self.worker = threading.Thread(target=self.process_scans, daemon=True)
+        self.worker.start()
+
+        self.setup_ui()
+        self.poll_results()
+
+    def setup_ui(self):
+        main = tk.Frame(self.window, bg=COLORS['bg_main'])
+        main.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
+
+        tk.Label(main, text="Scan Badge or Enter Employee ID",
+                font=("Arial", 20, "bold"),
+                fg=COLORS['text_dark'], bg=COLORS['bg_main']).pack(pady=(0, 20))
+
+        entry_frame = tk.Frame(main, bg=COLORS['bg_white'],
+                              highlightbackground=COLORS['border'],
+                              highlightthickness=1)
+        entry_frame.pack(fill=tk.X, pady=(0, 20))
+
+        self.badge_entry = tk.Entry(entry_frame, font=("Arial", 24), justify=tk.CENTER,
+                                    bg=COLORS['bg_white'], fg=COLORS['text_dark'], bd=0)
+        self.badge_entry.pack(fill=tk.X, padx=12, pady=12)
+        self.badge_entry.bind('<Return>', self.on_scan)
+        self.badge_entry.focus_set()
+
+        self.result_card = tk.Frame(main, bg=COLORS['bg_white'],
+                                   highlightbackground=COLORS['border'],
+                                   highlightthickness=1)
+        self.result_card.pack(fill=tk.BOTH, expand=True)
+
+        self.result_title = tk.Label(self.result_card, text="",
+                                     font=("Arial", 26, "bold"),
+                                     bg=COLORS['bg_white'], fg=COLORS['text_dark'])
+        self.result_title.pack(pady=(40, 10))
+
+        self.result_detail = tk.Label(self.result_card, text="",
+                                      font=("Arial", 14),
+                                      bg=COLORS['bg_white'], fg=COLORS['text_gray'])
+        self.result_detail.pack()
+
+        # Throughput monitor
+        stats = tk.Frame(main, bg=COLORS['bg_main'])
+        stats.pack(fill=tk.X, pady=(15, 0))
+
+        self.queue_label = tk.Label(stats, text="", font=("Arial", 10),
+                                    fg=COLORS['text_gray'], bg=COLORS['bg_main'])
+        self.queue_label.pack(side=tk.LEFT)
+
+        self.rate_label = tk.Label(stats, text="", font=("Arial", 10),
+                                   fg=COLORS['text_gray'], bg=COLORS['bg_main'])
+        self.rate_label.pack(side=tk.RIGHT)
+
+        self.show_idle()
+        self.update_stats()
+
+    def on_scan(self, event=None):
+        badge = self.badge_entry.get().strip()
+        self.badge_entry.delete(0, tk.END)
+        if badge:
+            self.scan_queue.put(badge)
+            self.update_stats()
+
+    def process_scans(self):
+        """Worker thread: resolve each badge and toggle its attendance"""
+        db = Database()
+        while self.running:
+            badge = self.scan_queue.get()
+            if badge is None:
+                break
+            try:
+                if not db.connect():
+                    result = {'success': False, 'message': "Database unavailable"}
+                else:
+                    employee = db.get_employee_by_badge(badge)
+                    if employee:
+                        result = db.toggle_clock(employee['id'])
+                        result['employee'] = employee
+                    else:
+                        result = {'success': False, 'message': f"Unknown badge: {badge}"}
+            except Exception as e:
+                print(f"Kiosk punch error: {e}")
+                result = {'success': False, 'message': f"Error: {e}"}
+            self.result_queue.put(result)
+        db.disconnect()
+
+    def poll_results(self):
+        """Drain finished punches on the Tk thread"""
+        if not self.running:
+            return
+        try:
+            while True:
+                self.show_result(self.result_queue.get_nowait())
+        except queue.Empty:
+            pass
+        self.update_stats()
+        self.window.after(KIOSK_POLL_MS, self.poll_results)
+
+    def show_result(self, result):
+        if result['success']:
+            self.punch_times.append(time.monotonic())
+            employee = result['employee']
+            name = f"{employee['first_name']} {employee['last_name']}"
+            now = datetime.now().strftime("%I:%M %p")
+            late_result = result.get('late_result')
+
+            if result['action'] == 'out':
+                bg, title, detail = COLORS['info'], f"Goodbye, {name}", f"Clocked out at {now}"
+            elif late_result and late_result.get('minutes_late', 0) > 0:
+                bg, title = COLORS['warning'], f"{name} - LATE"
+                detail = (f"Clocked in at {now}\n"
+                          f"{late_result['minutes_late']} minutes late • Fee: ₱{late_result['late_fee']:.2f}")
+            else:
+                bg, title, detail = COLORS['success'], f"Welcome, {name}", f"Clocked in at {now} • On time"
+        else:
+            bg, title, detail = COLORS['danger'], "Not Recorded", result['message']
+
+        self.result_card.config(bg=bg)
+        self.result_title.config(text=title, bg=bg, fg="white")
+        self.result_detail.config(text=detail, bg=bg, fg="white")
+
+        if self.reset_job:
+            self.window.after_cancel(self.reset_job)
+        self.reset_job = self.window.after(KIOSK_RESET_MS, self.show_idle)
+
+    def show_idle(self):
+        self.reset_job = None
+        self.result_card.config(bg=COLORS['bg_white'])
+        self.result_title.config(text="Ready", bg=COLORS['bg_white'], fg=COLORS['text_dark'])
+        self.result_detail.config(text=datetime.now().strftime("%A, %B %d, %Y"),
+                                  bg=COLORS['bg_white'], fg=COLORS['text_gray'])
+        self.badge_entry.focus_set()
+
+    def update_stats(self):
+        cutoff = time.monotonic() - KIOSK_RATE_WINDOW
+        while self.punch_times and self.punch_times[0] < cutoff:
+            self.punch_times.popleft()
+        per_minute = len(self.punch_times) * 60 / KIOSK_RATE_WINDOW
+
+        self.queue_label.config(text=f"Queue: {self.scan_queue.qsize()}")
+        self.rate_label.config(text=f"Punches/min: {per_minute:.0f}")
+
+    def close(self):
+        self.running = False
+        self.scan_queue.put(None)
+        if self.owns_window:
+            self.window.destroy()
+
+    def run(self):
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.window.mainloop()
+
+
+def main():
+    print("Starting kiosk clock-in mode...")
+    KioskWindow().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,14 @@ Handles all late fee calculations and related operations
 from datetime import datetime, time, timedelta
 from decimal import Decimal
 
+from admin.attendance_analytics import invalidate_attendance_analytics
+from admin.fee_summary_index import invalidate_fee_summary_index
+
+
+def _quiet(*args, **kwargs):
+    """Stand-in for print() when DEBUG output is switched off"""
+
+
 class LateFeeCalculator:
     def __init__(self, db):
         """Initialize with database connection"""
@@ -17,29 +25,31 @@ class LateFeeCalculator:
         result = self.db.execute_query(query, fetch=True)
         return result[0] if result else None
     
-    def calculate_minutes_late(self, clock_in_time, settings=None):
+    def calculate_minutes_late(self, clock_in_time, settings=None, verbose=True):
         """
         Calculate how many minutes late an employee is
         
         Args:
             clock_in_time: datetime object of when employee clocked in
             settings: late fee settings (optional, will fetch if not provided)
+            verbose: print DEBUG lines (batch recalculation turns them off)
         
         Returns:
             int: minutes late (0 if not late)
         """
+        debug = print if verbose else _quiet
         if settings is None:
             settings = self.get_late_fee_settings()
         
         if not settings:
-            print("DEBUG - No settings found!")
+            debug("DEBUG - No settings found!")
             return 0
         
         # Get standard start time
         standard_start_time = settings['standard_shift_start']
         
-        print(f"DEBUG - Standard start time: {standard_start_time}, type: {type(standard_start_time)}")
-        print(f"DEBUG - Clock in time: {clock_in_time}")
+        debug(f"DEBUG - Standard start time: {standard_start_time}, type: {type(standard_start_time)}")
+        debug(f"DEBUG - Clock in time: {clock_in_time}")
         
         # FIXED: Handle timedelta (MySQL TIME columns return as timedelta)
         if isinstance(standard_start_time, timedelta):
@@ -58,37 +68,38 @@ class LateFeeCalculator:
         else:
             standard_datetime = standard_start_time
         
-        print(f"DEBUG - Standard datetime: {standard_datetime}")
+        debug(f"DEBUG - Standard datetime: {standard_datetime}")
         
         # Calculate difference
         if clock_in_time > standard_datetime:
             time_diff = clock_in_time - standard_datetime
             minutes_late = int(time_diff.total_seconds() / 60)
             
-            print(f"DEBUG - Raw minutes late: {minutes_late}")
+            debug(f"DEBUG - Raw minutes late: {minutes_late}")
             
             # Apply grace period
             grace_period = settings.get('grace_period_minutes', 0)
-            print(f"DEBUG - Grace period: {grace_period}")
+            debug(f"DEBUG - Grace period: {grace_period}")
             
             if minutes_late <= grace_period:
-                print(f"DEBUG - Within grace period, returning 0")
+                debug(f"DEBUG - Within grace period, returning 0")
                 return 0
             
             result = minutes_late - grace_period
-            print(f"DEBUG - Final minutes late (after grace): {result}")
+            debug(f"DEBUG - Final minutes late (after grace): {result}")
             return result
         
-        print(f"DEBUG - Not late, clock in time <= standard time")
+        debug(f"DEBUG - Not late, clock in time <= standard time")
         return 0
     
-    def calculate_late_fee(self, minutes_late, settings=None):
+    def calculate_late_fee(self, minutes_late, settings=None, verbose=True):
         """
         Calculate the late fee amount based on minutes late
         
         Args:
             minutes_late: int, number of minutes late
             settings: late fee settings (optional)
+            verbose: print DEBUG lines
         
         Returns:
             Decimal: late fee amount
@@ -103,18 +114,19 @@ class LateFeeCalculator:
             return Decimal('0.00')
         
         fee_type = settings.get('fee_type', 'fixed')
+        debug = print if verbose else _quiet
         
-        print(f"DEBUG - Calculating fee: {minutes_late} mins, type: {fee_type}")
+        debug(f"DEBUG - Calculating fee: {minutes_late} mins, type: {fee_type}")
         
         if fee_type == 'fixed':
             fee = Decimal(str(settings.get('fixed_fee_amount', 50.00)))
-            print(f"DEBUG - Fixed fee: {fee}")
+            debug(f"DEBUG - Fixed fee: {fee}")
             return fee
         
         elif fee_type == 'per_minute':
             per_minute = Decimal(str(settings.get('per_minute_fee', 5.00)))
             fee = per_minute * Decimal(minutes_late)
-            print(f"DEBUG - Per minute fee: {fee}")
+            debug(f"DEBUG - Per minute fee: {fee}")
             return fee
         
         elif fee_type == 'tiered':
@@ -175,14 +187,17 @@ class LateFeeCalculator:
             late_fee = self.calculate_late_fee(minutes_late, settings)
             print(f"Late fee calculated: {late_fee}")
             
-            # Update attendance record
+            # Update attendance record and the employee's ledger together
             if minutes_late > 0:
                 query = """UPDATE attendance 
                            SET minutes_late = %s, 
                                late_fee_amount = %s,
                                status = 'late'
                            WHERE id = %s"""
-                result = self.db.execute_query(query, (minutes_late, float(late_fee), attendance_id))
+                statements = [(query, (minutes_late, float(late_fee), attendance_id))]
+                if late_fee > 0:
+                    statements.append(self.db.ledger_charge_statement(employee_id, late_fee))
+                result = self.db.execute_transaction(statements)
                 print(f"Update result: {result}")
                 
                 return {
@@ -204,6 +219,9 @@ class LateFeeCalculator:
             print(f"ERROR processing late attendance: {e}")
             import traceback
             traceback.print_exc()
+            if self.db.transaction_depth:
+                # Let the caller's transaction() roll back the clock-in too
+                raise
             return {
                 'success': False,
                 'minutes_late': 0,
@@ -211,35 +229,69 @@ class LateFeeCalculator:
                 'message': f'Error: {str(e)}'
             }
     
-    def get_employee_late_fee_summary(self, employee_id):
-        """Get summary of late fees for an employee"""
-        query = """SELECT 
-                    COUNT(CASE WHEN late_fee_amount > 0 THEN 1 END) as total_late_instances,
-                    SUM(late_fee_amount) as total_late_fees,
-                    SUM(CASE WHEN late_fee_paid = 1 THEN late_fee_amount ELSE 0 END) as total_paid,
-                    SUM(CASE WHEN late_fee_paid = 0 THEN late_fee_amount ELSE 0 END) as total_unpaid
-                   FROM attendance 
-                   WHERE employee_id = %s"""
-        result = self.db.execute_query(query, (employee_id,), fetch=True)
+    def recalculate_late_fees(self, start_date=None, end_date=None, dry_run=False):
+        """
+        Re-run minutes-late and fee calculation over unpaid attendance rows
+        with the current settings, then rebuild the ledger from the result
         
-        if result:
-            row = result[0]
-            # Handle both dict and tuple results
-            if isinstance(row, dict):
-                return {
-                    'total_late_instances': row['total_late_instances'] or 0,
-                    'total_late_fees': float(row['total_late_fees'] or 0),
-                    'total_paid': float(row['total_paid'] or 0),
-                    'total_unpaid': float(row['total_unpaid'] or 0)
-                }
-            elif isinstance(row, tuple):
-                return {
-                    'total_late_instances': row[0] or 0,
-                    'total_late_fees': float(row[1] or 0),
-                    'total_paid': float(row[2] or 0),
-                    'total_unpaid': float(row[3] or 0)
-                }
-        return None
+        Paid fees are never touched.
+        
+        Returns:
+            list: (attendance_id, minutes_late, fee, status) for every row that changed,
+                  or None when no late fee settings are configured
+        """
+        settings = self.get_late_fee_settings()
+        if not settings:
+            print("ERROR - Late fee settings not configured")
+            return None
+        
+        query = """SELECT id, clock_in, status,
+                          COALESCE(minutes_late, 0) as minutes_late,
+                          COALESCE(late_fee_amount, 0) as late_fee_amount
+                   FROM attendance
+                   WHERE COALESCE(late_fee_paid, 0) = 0
+                     AND status IN ('present', 'late')
+                     AND clock_in IS NOT NULL"""
+        params = []
+        if start_date:
+            query += " AND date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= %s"
+            params.append(end_date)
+        rows = self.db.execute_query(query, tuple(params), fetch=True) or []
+        
+        changes = []
+        for row in rows:
+            minutes_late = self.calculate_minutes_late(row['clock_in'], settings, verbose=False)
+            fee = self.calculate_late_fee(minutes_late, settings, verbose=False)
+            status = 'late' if minutes_late > 0 else 'present'
+            if (minutes_late != row['minutes_late'] or fee != Decimal(str(row['late_fee_amount']))
+                    or status != row['status']):
+                changes.append((row['id'], minutes_late, float(fee), status))
+        
+        if changes and not dry_run:
+            update = """UPDATE attendance
+                        SET minutes_late = %s, late_fee_amount = %s, status = %s
+                        WHERE id = %s"""
+            # Fees and ledger commit together; a failed ledger rebuild rolls back the fees
+            with self.db.transaction():
+                self.db.execute_many(update, [(minutes, fee, status, attendance_id)
+                                              for attendance_id, minutes, fee, status in changes])
+                self.db.reconcile_fee_ledger(fix=True)
+            invalidate_fee_summary_index()
+            invalidate_attendance_analytics()
+        return changes
+    
+    def get_employee_late_fee_summary(self, employee_id):
+        """Get summary of late fees for an employee (single ledger row lookup)"""
+        ledger = self.db.get_fee_ledger(employee_id)
+        return {
+            'total_late_instances': ledger['late_count'],
+            'total_late_fees': ledger['total_fees'],
+            'total_paid': ledger['paid_amount'],
+            'total_unpaid': ledger['unpaid_amount']
+        }
     
     def mark_late_fee_paid(self, attendance_id, payment_method='Cash', notes=''):
         """Mark a late fee as paid"""
@@ -261,20 +313,8 @@ class LateFeeCalculator:
             else:
                 return False
             
-            # Update attendance
-            update_query = "UPDATE attendance SET late_fee_paid = 1 WHERE id = %s"
-            self.db.execute_query(update_query, (attendance_id,))
-            
-            # Record payment
-            payment_query = """INSERT INTO late_fee_payments 
-                              (attendance_id, employee_id, amount_paid, payment_date, payment_method, notes, created_at)
-                              VALUES (%s, %s, %s, %s, %s, %s, %s)"""
-            self.db.execute_query(payment_query, (
-                attendance_id, emp_id, amount, datetime.now().date(),
-                payment_method, notes, datetime.now()
-            ))
-            
-            return True
+            return self.db.process_payments_batch(emp_id, [(attendance_id, amount)],
+                                                  payment_method, notes)
         except Exception as e:
             print(f"Error marking late fee as paid: {e}")
             return False
\ No newline at end of file
@@ -1,14 +1,28 @@
 # login.py
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
 from database import Database
-from config import COLORS
+from auth import login_limiter
+from config import COLORS, PASSWORD_HASH_ITERATIONS
 
 class LoginWindow:
-    def __init__(self):
-        self.window = tk.Tk()
+    def __init__(self, root=None, db=None):
+        # A shared root/db (see main.py) survives logout; otherwise we own them
+        self.owns_window = root is None
+        self.window = root if root is not None else tk.Tk()
+        
+        self.db = db if db is not None else Database()
+        self.user_data = None
+        self.verifying = False
+        self.auth_result = None
+        
+        self.setup_ui()
+        
+    def prepare_window(self):
+        """Resize and center the (possibly shared) root window for login"""
         self.window.title("Login - Attendance System")
-        self.window.geometry("450x550")
         self.window.resizable(False, False)
         self.window.configure(bg=COLORS['bg_main'])
         
@@ -18,14 +32,10 @@ class LoginWindow:
         y = (self.window.winfo_screenheight() // 2) - (550 // 2)
         self.window.geometry(f"450x550+{x}+{y}")
         
-        self.db = Database()
-        self.user_data = None
-        
-        self.setup_ui()
-        
     def setup_ui(self):
         # Main container
-        main = tk.Frame(self.window, bg=COLORS['bg_main'])
+        self.container = tk.Frame(self.window, bg=COLORS['bg_main'])
+        main = tk.Frame(self.container, bg=COLORS['bg_main'])
         main.pack(fill=tk.BOTH, expand=True, padx=40, pady=40)
         
         # Login card
@@ -96,7 +106,7 @@ class LoginWindow:
         admin_check.pack(pady=(0, 25))
         
         # Login button
-        login_btn = tk.Button(inner, text="Sign In", 
+        self.login_btn = login_btn = tk.Button(inner, text="Sign In", 
                              font=("Arial", 11, "bold"),
                              bg=COLORS['primary'], 
                              fg="white", 
@@ -108,9 +118,6 @@ class LoginWindow:
                              activebackground=COLORS['primary_dark'])
         login_btn.pack(fill=tk.X, pady=(0, 20))
         
-        # Bind Enter key
-        self.window.bind('<Return>', lambda e: self.login())
-        
         # Demo info
         info = tk.Label(inner, 
                        text="Demo: admin/admin123 or EMP001/pass123", 
@@ -120,6 +127,9 @@ class LoginWindow:
         info.pack()
         
     def login(self):
+        if self.verifying:
+            return
+        
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
         
@@ -127,19 +137,93 @@ class LoginWindow:
             messagebox.showerror("Error", "Please fill in all fields")
             return
         
+        wait = login_limiter.retry_after(username)
+        if wait:
+            messagebox.showerror("Login Locked",
+                                 f"Too many failed attempts.\nPlease try again in {wait} seconds.")
+            return
+        
         if not self.db.connect():
             messagebox.showerror("Error", "Could not connect to database.\nMake sure XAMPP MySQL is running!")
             return
         
-        user = self.db.authenticate_user(username, password)
+        # Password hashing is deliberately slow; keep it off the Tk thread
+        self.verifying = True
+        self.login_btn.config(state=tk.DISABLED, text="Signing In...")
+        self.auth_result = None
+        threading.Thread(target=self.verify_credentials, args=(username, password), daemon=True).start()
+        self.window.after(20, self.finish_login, username)
+    
+    def verify_credentials(self, username, password):
+        """Worker thread: authenticate on a separate pooled connection
+        
+        auth_result is (user, elapsed ms, status) where status is "ok", or
+        "unavailable" if the database could not be asked at all.
+        """
+        start = time.perf_counter()
+        db = Database()
+        user = None
+        status = "ok"
+        try:
+            if db.connect():
+                user = db.authenticate_user(username, password)
+            else:
+                status = "unavailable"
+        except Exception as e:
+            print(f"Login error: {e}")
+            status = "unavailable"
+        finally:
+            db.disconnect()
+        self.auth_result = (user, (time.perf_counter() - start) * 1000, status)
+    
+    def finish_login(self, username):
+        if self.auth_result is None:
+            self.window.after(20, self.finish_login, username)
+            return
         
-        if user:
+        user, elapsed_ms, status = self.auth_result
+        self.verifying = False
+        self.login_btn.config(state=tk.NORMAL, text="Sign In")
+        print(f"Login check for '{username}' took {elapsed_ms:.0f} ms "
+              f"(PBKDF2 {PASSWORD_HASH_ITERATIONS} iterations)")
+        
+        if status == "unavailable":
+            # Not the user's fault: don't count it towards the lockout
+            messagebox.showerror("Database Unavailable",
+                                 "Could not reach the database to check your login.\n"
+                                 "Make sure XAMPP MySQL is running and try again.")
+        elif user:
+            login_limiter.record_success(username)
             self.user_data = user
-            self.window.destroy()
+            self.close()
         else:
+            login_limiter.record_failure(username)
             messagebox.showerror("Login Failed", "Invalid username or password")
             self.password_entry.delete(0, tk.END)
     
+    def close(self):
+        """Hide the login form and hand control back to run()"""
+        self.window.unbind('<Return>')
+        if self.owns_window:
+            self.window.destroy()
+        else:
+            self.container.pack_forget()
+            self.window.quit()
+    
     def run(self):
+        """Show the login form and block until someone signs in or the window closes"""
+        self.user_data = None
+        self.username_entry.delete(0, tk.END)
+        self.password_entry.delete(0, tk.END)
+        self.is_admin_var.set(False)
+        
+        self.prepare_window()
+        self.container.pack(fill=tk.BOTH, expand=True)
+        self.window.deiconify()
+        self.username_entry.focus_set()
+        
+        # Bind Enter key
+        self.window.bind('<Return>', lambda e: self.login())
+        
         self.window.mainloop()
         return self.user_data
\ No newline at end of file
@@ -5,15 +5,35 @@ Main application entry point
 """
 
 import sys
+import tkinter as tk
+from database import Database
 from login import LoginWindow
 from admin_dashboard import AdminDashboard
 from employee_dashboard import EmployeeDashboard
 from hr_dashboard import HRDashboard
 from config import ROLE_ADMIN, ROLE_EMPLOYEE, ROLE_HR
 
+DASHBOARDS = {
+    ROLE_ADMIN: ("Admin Dashboard", AdminDashboard),
+    ROLE_EMPLOYEE: ("Employee Dashboard", EmployeeDashboard),
+    ROLE_HR: ("HR Manager Dashboard", HRDashboard),
+}
+
+def root_alive(root):
+    """True until the user closes the main window"""
+    try:
+        return bool(root.winfo_exists())
+    except tk.TclError:
+        return False
+
 def main():
     """Main application loop"""
     
+    if "--kiosk" in sys.argv:
+        from kiosk import main as kiosk_main
+        kiosk_main()
+        return
+    
     print("=" * 60)
     print("   Employee Attendance Monitoring System")
     print("   Version 2.0 - Light Theme Edition")
@@ -22,10 +42,18 @@ def main():
     print("Make sure XAMPP MySQL is running!")
     print("-" * 60)
     
+    # One Tk root and one pooled database layer live for the whole session;
+    # login and dashboards only swap frames on it.
+    root = tk.Tk()
+    db = Database()
+    login_window = LoginWindow(root, db)
+    
+    # Dashboards are built once per role and re-bound to each new user
+    dashboards = {}
+    
     while True:
         # Show login window
-        login_window = LoginWindow()
-        user_data = login_window.run()
+        user_data = login_window.run() if root_alive(root) else None
         
         # If login was cancelled or failed
         if not user_data:
@@ -36,20 +64,26 @@ def main():
         
         # Route to appropriate dashboard based on role
         try:
-            if user_data['role'] == ROLE_ADMIN:
-                print("Loading Admin Dashboard...")
-                dashboard = AdminDashboard(user_data)
-                dashboard.run()
-                
-            elif user_data['role'] == ROLE_EMPLOYEE:
-                print("Loading Employee Dashboard...")
-                dashboard = EmployeeDashboard(user_data)
-                dashboard.run()
-                
-            elif user_data['role'] == ROLE_HR:
-                print("Loading HR Manager Dashboard...")
-                dashboard = HRDashboard(user_data)
-                dashboard.run()
+            if user_data['role'] not in DASHBOARDS:
+                print(f"Unknown role: {user_data['role']}")
+                continue
+            
+            label, dashboard_class = DASHBOARDS[user_data['role']]
+            dashboard = dashboards.get(user_data['role'])
+            
+            if dashboard is None:
+                print(f"Loading {label}...")
+                dashboard = dashboard_class(user_data, root=root, db=db)
+                dashboards[user_data['role']] = dashboard
+            else:
+                print(f"Switching {label} to {user_data['username']}...")
+                dashboard.switch_user(user_data)
+            
+            dashboard.run()
+            
+            if not root_alive(root):
+                print("\nApplication closed by user.")
+                break
             
             print("\n✓ User logged out successfully.")
             
@@ -59,6 +93,8 @@ def main():
             traceback.print_exc()
             break
     
+    db.disconnect()
+    
     print("\n" + "=" * 60)
     print("Thank you for using the Attendance System!")
     print("=" * 60)
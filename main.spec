@@ -4,6 +4,9 @@ from PyInstaller.utils.hooks import collect_all
 datas = []
 binaries = []
 hiddenimports = ['mysql.connector']
+# Optional, picked up when installed in the build environment:
+#   numpy    - admin report analytics snapshot, .npz payroll export
+#   pyarrow  - Parquet payroll export
 tmp_ret = collect_all('mysql')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 
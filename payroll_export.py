@@ -0,0 +1,256 @@
+"""
+Payroll Export Module
+Writes attendance, monthly late-fee totals and fee payments as columnar
+files, one partition per month:
+
+    <out>/<dataset>/year=2025/month=03/data.parquet   (pyarrow installed)
+    <out>/<dataset>/year=2025/month=03/data.npz       (NumPy fallback)
+
+The layout is Hive-style, so pyarrow.dataset / pandas / Spark readers can
+prune to the months they need. Departments, statuses and payment methods
+are dictionary-encoded: Parquet dictionary columns, or int16 codes (-1 for
+NULL) plus a `<column>__dictionary` array in the .npz. _manifest.json lists
+every partition in the directory: each run merges its partitions into it,
+replacing earlier entries for the same dataset and month.
+
+Usage:
+    python payroll_export.py 2025-01 [2025-06] [--out exports/payroll] [--format npz]
+"""
+import argparse
+import json
+import os
+from datetime import date, datetime, timedelta
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_EXPORT_DIR = os.path.join("exports", "payroll")
+
+# dataset -> (query for one month taking (first_day, last_day), [(column, kind), ...])
+# kinds: int, float, bool, date, timestamp, category (dictionary-encoded string)
+PAYROLL_DATASETS = {
+    'attendance': ("""
+        SELECT a.id, a.employee_id, e.department, a.date, a.clock_in, a.clock_out, a.status,
+               COALESCE(a.minutes_late, 0), COALESCE(a.late_fee_amount, 0), COALESCE(a.late_fee_paid, 0)
+        FROM attendance a
+        JOIN employees e ON e.id = a.employee_id
+        WHERE a.date BETWEEN %s AND %s
+        ORDER BY a.date, a.employee_id, a.id
+    """, [('id', 'int'), ('employee_id', 'int'), ('department', 'category'),
+          ('date', 'date'), ('clock_in', 'timestamp'), ('clock_out', 'timestamp'),
+          ('status', 'category'), ('minutes_late', 'int'), ('late_fee', 'float'),
+          ('fee_paid', 'bool')]),
+    'late_fees': ("""
+        SELECT a.employee_id, e.department,
+               COUNT(*),
+               SUM(a.minutes_late),
+               SUM(COALESCE(a.late_fee_amount, 0)),
+               SUM(CASE WHEN a.late_fee_paid = 1 THEN COALESCE(a.late_fee_amount, 0) ELSE 0 END),
+               SUM(CASE WHEN a.late_fee_paid = 1 THEN 0 ELSE COALESCE(a.late_fee_amount, 0) END)
+        FROM attendance a
+        JOIN employees e ON e.id = a.employee_id
+        WHERE a.date BETWEEN %s AND %s AND a.minutes_late > 0
+        GROUP BY a.employee_id, e.department
+        ORDER BY a.employee_id
+    """, [('employee_id', 'int'), ('department', 'category'), ('late_count', 'int'),
+          ('minutes_late', 'int'), ('total_fees', 'float'), ('paid', 'float'),
+          ('unpaid', 'float')]),
+    'payments': ("""
+        SELECT p.attendance_id, p.employee_id, e.department, p.amount_paid,
+               p.payment_date, p.payment_method, p.created_at
+        FROM late_fee_payments p
+        JOIN employees e ON e.id = p.employee_id
+        WHERE p.payment_date BETWEEN %s AND %s
+        ORDER BY p.payment_date, p.employee_id, p.attendance_id
+    """, [('attendance_id', 'int'), ('employee_id', 'int'), ('department', 'category'),
+          ('amount', 'float'), ('payment_date', 'date'), ('payment_method', 'category'),
+          ('recorded_at', 'timestamp')]),
+}
+
+
+def available_format():
+    """'parquet' when pyarrow is installed, else 'npz' when NumPy is, else None"""
+    if pa is not None:
+        return 'parquet'
+    if np is not None:
+        return 'npz'
+    return None
+
+
+def parse_month(text):
+    """'2025-03' -> (2025, 3)"""
+    parsed = datetime.strptime(text, "%Y-%m")
+    return parsed.year, parsed.month
+
+
+def iter_months(first, last):
+    """(year, month) from first to last inclusive"""
+    year, month = first
+    while (year, month) <= last:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def month_days(year, month):
+    first_day = date(year, month, 1)
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first_day, next_month - timedelta(days=1)
+
+
+def partition_dir(directory, dataset, year, month):
+    return os.path.join(directory, dataset, f"year={year}", f"month={month:02d}")
+
+
+# ---- writers ----------------------------------------------------------------
+
+def arrow_column(values, kind):
+    if kind == 'category':
+        return pa.array(values, pa.string()).dictionary_encode()
+    if kind == 'int':
+        return pa.array([None if v is None else int(v) for v in values], pa.int64())
+    if kind == 'float':
+        return pa.array([None if v is None else float(v) for v in values], pa.float64())
+    if kind == 'bool':
+        return pa.array([bool(v) for v in values], pa.bool_())
+    if kind == 'date':
+        return pa.array(values, pa.date32())
+    return pa.array(values, pa.timestamp('s'))
+
+
+def write_parquet(path, schema, columns):
+    table = pa.table({name: arrow_column(values, kind)
+                      for (name, kind), values in zip(schema, columns)})
+    pq.write_table(table, path)
+
+
+def npz_arrays(name, values, kind):
+    """Arrays stored in the .npz for one column"""
+    if kind == 'category':
+        dictionary = sorted({v for v in values if v is not None})
+        codes = {v: i for i, v in enumerate(dictionary)}
+        return {name: np.array([codes.get(v, -1) for v in values], np.int16),
+                f"{name}__dictionary": np.array(dictionary, dtype=str)}
+    if kind == 'int':
+        return {name: np.array([v or 0 for v in values], np.int64)}
+    if kind == 'float':
+        return {name: np.array([float(v or 0) for v in values], np.float64)}
+    if kind == 'bool':
+        return {name: np.array([bool(v) for v in values], bool)}
+    unit = 'D' if kind == 'date' else 's'
+    return {name: np.array([np.datetime64(v, unit) if v else np.datetime64('NaT', unit)
+                            for v in values], f"datetime64[{unit}]")}
+
+
+def write_npz(path, schema, columns):
+    arrays = {}
+    for (name, kind), values in zip(schema, columns):
+        arrays.update(npz_arrays(name, values, kind))
+    np.savez_compressed(path, **arrays)
+
+
+WRITERS = {'parquet': write_parquet, 'npz': write_npz}
+
+
+# ---- export -----------------------------------------------------------------
+
+def export_payroll(db, directory, first_month, last_month=None, fmt=None, datasets=None, progress=None):
+    """
+    Write every dataset for each month in [first_month, last_month]
+
+    Args:
+        db: connected Database
+        first_month, last_month: (year, month) tuples (last defaults to first)
+        fmt: 'parquet' or 'npz' (default: best available)
+        datasets: dataset names to write (default: all)
+        progress: optional callback(dataset, year, month, rows)
+
+    Returns:
+        dict: this run's manifest (its 'partitions' are the ones just written);
+              <directory>/_manifest.json lists every partition in the directory
+    """
+    fmt = fmt or available_format()
+    if fmt is None:
+        raise RuntimeError("Columnar export needs pyarrow or numpy installed")
+    if fmt == 'parquet' and pa is None:
+        raise RuntimeError("Parquet export needs pyarrow installed")
+    if fmt == 'npz' and np is None:
+        raise RuntimeError("NPZ export needs numpy installed")
+    write = WRITERS[fmt]
+
+    manifest = {'format': fmt, 'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'partitions': []}
+    for year, month in iter_months(first_month, last_month or first_month):
+        first_day, last_day = month_days(year, month)
+        for dataset in datasets or PAYROLL_DATASETS:
+            query, schema = PAYROLL_DATASETS[dataset]
+            columns = db.fetch_columns(query, (first_day, last_day), len(schema))
+            if columns is None:
+                raise RuntimeError(f"Could not read {dataset} for {year}-{month:02d}")
+
+            folder = partition_dir(directory, dataset, year, month)
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, f"data.{fmt}")
+            write(path, schema, columns)
+
+            rows = len(columns[0])
+            manifest['partitions'].append({'dataset': dataset, 'year': year, 'month': month,
+                                           'rows': rows, 'format': fmt,
+                                           'path': os.path.relpath(path, directory)})
+            if progress:
+                progress(dataset, year, month, rows)
+
+    write_manifest(directory, manifest)
+    return manifest
+
+
+def write_manifest(directory, manifest):
+    """Merge this run's partitions into <directory>/_manifest.json, keyed by (dataset, year, month)"""
+    path = os.path.join(directory, "_manifest.json")
+    try:
+        with open(path, encoding='utf-8') as f:
+            previous = json.load(f).get('partitions', [])
+    except (OSError, ValueError):
+        previous = []
+
+    partitions = {(p['dataset'], p['year'], p['month']): p for p in previous}
+    partitions.update({(p['dataset'], p['year'], p['month']): p for p in manifest['partitions']})
+    merged = dict(manifest, partitions=[partitions[key] for key in sorted(partitions)])
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export monthly payroll data as Parquet/NPZ partitions")
+    parser.add_argument("first_month", help="first month, YYYY-MM")
+    parser.add_argument("last_month", nargs="?", help="last month, YYYY-MM (default: first_month)")
+    parser.add_argument("--out", default=DEFAULT_EXPORT_DIR, help="output directory")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="default: parquet if pyarrow is installed")
+    parser.add_argument("--dataset", action="append", choices=sorted(PAYROLL_DATASETS),
+                        help="dataset to export (repeatable; default: all)")
+    args = parser.parse_args()
+
+    from database import Database
+    db = Database()
+    if not db.connect():
+        raise SystemExit("Could not connect to the database")
+    try:
+        manifest = db.export_payroll(args.out, parse_month(args.first_month),
+                                     parse_month(args.last_month) if args.last_month else None,
+                                     fmt=args.format, datasets=args.dataset)
+        total = sum(p['rows'] for p in manifest['partitions'])
+        print(f"Wrote {len(manifest['partitions'])} partitions ({total} rows) to {args.out}")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
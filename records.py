@@ -0,0 +1,93 @@
+"""
+Records Module
+Compact row types for the larger result sets. Each record is a namedtuple
+with __slots__ = () (no per-row dict), built straight from a tuple cursor
+by Database.execute_query(..., row_type=...). Records still answer
+row['column'] and row.get('column'), so code written against dictionary
+cursor rows keeps working unchanged.
+
+The query must select exactly the type's fields (any order); a missing or
+extra column raises ValueError instead of turning into None values.
+Unlike a dict row, `x in record` tests the values (tuple semantics); use
+`'column' in record.keys()` to test for a column.
+"""
+from collections import namedtuple
+from operator import itemgetter
+
+
+def record_type(name, fields):
+    """namedtuple class with dict-style column access; missing columns default to None"""
+    base = namedtuple(name, fields, defaults=(None,) * len(fields))
+
+    class Record(base):
+        __slots__ = ()
+
+        def __getitem__(self, key):
+            if isinstance(key, str):
+                if key not in self._fields:
+                    raise KeyError(key)
+                return getattr(self, key)
+            return base.__getitem__(self, key)
+
+        def get(self, key, default=None):
+            if key in self._fields:
+                return getattr(self, key)
+            return default
+
+        def keys(self):
+            return self._fields
+
+    Record.__name__ = Record.__qualname__ = name
+    return Record
+
+
+Employee = record_type('Employee', (
+    'id', 'first_name', 'last_name', 'email', 'phone',
+    'department', 'position', 'hire_date', 'created_at'))
+
+AttendanceRecord = record_type('AttendanceRecord', (
+    'id', 'employee_id', 'date', 'clock_in', 'clock_out', 'status',
+    'minutes_late', 'late_fee_amount', 'late_fee_paid', 'created_at',
+    'first_name', 'last_name', 'department'))
+
+LeaveRequest = record_type('LeaveRequest', (
+    'id', 'employee_id', 'employee_name', 'leave_date', 'end_date',
+    'leave_type', 'reason', 'status', 'created_at', 'approved_at'))
+
+# Month-end report batch: one employee-day per row
+DailyLog = record_type('DailyLog', (
+    'employee_id', 'date', 'clock_in', 'clock_out', 'status'))
+
+Holiday = record_type('Holiday', (
+    'id', 'name', 'holiday_date', 'is_recurring', 'created_at'))
+
+# Column order matches the (id, name, dept, late_count, total_fees, paid, unpaid)
+# tuples FeeSummaryIndex accepts
+FeeSummary = record_type('FeeSummary', (
+    'id', 'name', 'department', 'late_count', 'total_fees', 'paid', 'unpaid'))
+
+
+def build_records(row_type, columns, rows):
+    """
+    Turn tuple cursor rows into row_type records
+
+    Args:
+        columns: cursor.column_names (any order, but exactly the type's fields)
+        rows: tuples from fetchall()/fetchmany()
+
+    Raises:
+        ValueError: the query and the record type disagree on the columns
+    """
+    make = row_type._make
+    if tuple(columns) == row_type._fields:
+        return list(map(make, rows))
+
+    unknown = [column for column in columns if column not in row_type._fields]
+    missing = [field for field in row_type._fields if field not in columns]
+    if unknown or missing:
+        raise ValueError(f"{row_type.__name__} does not match the query columns "
+                         f"(unknown: {unknown}, missing: {missing})")
+
+    positions = {column: i for i, column in enumerate(columns)}
+    take = itemgetter(*(positions[field] for field in row_type._fields))
+    return [make(take(row)) for row in rows]
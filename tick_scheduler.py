@@ -0,0 +1,94 @@
+"""
+Tick Scheduler Module
+One after() timer per Tk root drives every live clock in the app. Views
+subscribe a callback tied to a widget; the subscription is cancelled when
+the view unsubscribes or the widget is destroyed, and the timer stops
+while nothing is subscribed.
+"""
+import tkinter as tk
+from datetime import datetime
+from config import CLOCK_TICK_MS
+
+_schedulers = {}
+
+
+class TickScheduler:
+    def __init__(self, root, interval_ms=CLOCK_TICK_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.subscribers = {}  # token -> (widget, callback)
+        self.bound = {}        # widget path -> tokens; <Destroy> is bound once per widget
+        self.next_token = 1
+        self.job = None
+
+    def subscribe(self, widget, callback):
+        """
+        Call callback(now) on every tick while `widget` exists
+
+        The callback also runs once straight away so the clock is never blank.
+
+        Returns:
+            int: token for unsubscribe()
+        """
+        token = self.next_token
+        self.next_token += 1
+        self.subscribers[token] = (widget, callback)
+        path = str(widget)
+        if path not in self.bound:
+            # Views re-subscribe on every show; one binding serves all their tokens
+            widget.bind("<Destroy>", lambda e: self.on_destroy(e, path), add="+")
+            self.bound[path] = set()
+        self.bound[path].add(token)
+
+        callback(datetime.now())
+        self.start()
+        return token
+
+    def unsubscribe(self, token):
+        entry = self.subscribers.pop(token, None)
+        if entry is not None:
+            self.bound.get(str(entry[0]), set()).discard(token)
+        if not self.subscribers and self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def on_destroy(self, event, path):
+        if str(event.widget) == path:
+            self.forget_widget(path)
+
+    def forget_widget(self, path):
+        """Drop every subscription on a widget that no longer exists"""
+        for token in self.bound.pop(path, set()):
+            self.unsubscribe(token)
+
+    def start(self):
+        if self.job is None:
+            # Land just after the wall-clock second turns over
+            now = datetime.now()
+            delay = self.interval_ms - (now.microsecond // 1000) % self.interval_ms
+            self.job = self.root.after(delay, self.tick)
+
+    def tick(self):
+        self.job = None
+        now = datetime.now()
+        for token, (widget, callback) in list(self.subscribers.items()):
+            try:
+                if widget.winfo_ismapped():  # skip clocks on hidden views
+                    callback(now)
+            except tk.TclError:
+                # Widget went away without a <Destroy> reaching us
+                self.forget_widget(str(widget))
+            except Exception as e:
+                # One broken clock must not stop the others; keep it subscribed
+                print(f"Error in clock tick callback: {e}")
+        if self.subscribers:
+            self.start()
+
+
+def get_tick_scheduler(widget):
+    """Return the scheduler for the Tk root that `widget` belongs to"""
+    root = widget.nametowidget(".")
+    scheduler = _schedulers.get(root)
+    if scheduler is None:
+        scheduler = _schedulers[root] = TickScheduler(root)
+    return scheduler
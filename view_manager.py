@@ -0,0 +1,119 @@
+"""
+View Manager Module
+Keeps the views behind a dashboard's sidebar alive between menu clicks.
+Every view is built once into its own frame inside the content area;
+switching tabs hides the current frame with pack_forget() and shows the
+cached one instead of destroying and rebuilding the widget tree.
+
+Views may define any of these hooks:
+    on_show()  - the view is visible again (re-arm timers, ...)
+    on_hide()  - another view replaced it (cancel timers, ...)
+    refresh()  - reload data in place when the view has gone stale
+A stale view without refresh() is rebuilt.
+"""
+import time
+import tkinter as tk
+from collections import OrderedDict
+from config import VIEW_MAX_AGE, VIEW_WIDGET_BUDGET
+from database import process_commit_count
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+class ViewManager:
+    def __init__(self, content_frame, db, max_age=VIEW_MAX_AGE, widget_budget=VIEW_WIDGET_BUDGET):
+        """
+        Args:
+            content_frame: frame the dashboard shows its views in
+            db: shared Database handed to the views
+                (a commit on any connection since a view was loaded makes it stale)
+            max_age: seconds after which a view is stale regardless of commits
+            widget_budget: widgets hidden views may keep alive before eviction
+        """
+        self.content_frame = content_frame
+        self.db = db
+        self.max_age = max_age
+        self.widget_budget = widget_budget
+        self.entries = OrderedDict()  # key -> entry dict, least recently shown first
+        self.current = None
+
+    def show(self, key, factory, rebuild=False):
+        """
+        Show the view cached under `key`, building it on first use
+
+        Args:
+            factory: callable(parent_frame) that builds the view into parent_frame
+            rebuild: discard any cached copy first (e.g. after an action that
+                     changes what the view shows)
+        """
+        entry = self.entries.get(key)
+        # Clicking the tab that is already showing reloads it
+        stale = entry is not None and (key == self.current or self._is_stale(entry))
+
+        if self.current is not None and self.current != key:
+            self._hide(self.current)
+
+        if entry is not None and (rebuild or stale and not hasattr(entry['view'], 'refresh')):
+            self._destroy(key)
+            entry = None
+
+        if entry is None:
+            frame = tk.Frame(self.content_frame, bg=self.content_frame.cget('bg'))
+            frame.pack(fill=tk.BOTH, expand=True)
+            entry = {'frame': frame, 'factory': factory, 'widgets': 0}
+            self.entries[key] = entry
+            entry['view'] = factory(frame)
+            self._mark_loaded(entry)
+        else:
+            if self.current != key:
+                entry['frame'].pack(fill=tk.BOTH, expand=True)
+            if stale:
+                entry['view'].refresh()
+                self._mark_loaded(entry)
+            if hasattr(entry['view'], 'on_show'):
+                entry['view'].on_show()
+
+        self.entries.move_to_end(key)
+        self.current = key
+        self._evict()
+        return entry['view']
+
+    def _mark_loaded(self, entry):
+        entry['loaded_at'] = time.monotonic()
+        entry['commits'] = process_commit_count()
+
+    def _is_stale(self, entry):
+        return (process_commit_count() != entry['commits'] or
+                time.monotonic() - entry['loaded_at'] > self.max_age)
+
+    def _hide(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        if hasattr(entry['view'], 'on_hide'):
+            entry['view'].on_hide()
+        entry['frame'].pack_forget()
+        entry['widgets'] = count_widgets(entry['frame'])
+
+    def _destroy(self, key):
+        entry = self.entries.pop(key)
+        if key == self.current:
+            self.current = None
+        entry['frame'].destroy()
+
+    def _evict(self):
+        """Destroy least recently shown hidden views while over the widget budget"""
+        hidden = [key for key in self.entries if key != self.current]
+        total = sum(self.entries[key]['widgets'] for key in hidden)
+        for key in hidden:
+            if total <= self.widget_budget:
+                break
+            total -= self.entries[key]['widgets']
+            self._destroy(key)
+
+    def clear(self):
+        """Destroy every cached view (e.g. when another user logs in)"""
+        for key in list(self.entries):
+            self._destroy(key)